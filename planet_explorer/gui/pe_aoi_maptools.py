@@ -39,7 +39,7 @@ from qgis.gui import QgsMapTool, QgsRubberBand
 from qgis.PyQt.QtCore import QPointF, QRect, Qt, pyqtSignal  # QPoint,
 from qgis.PyQt.QtGui import QColor
 
-from ..pe_utils import PLANET_COLOR
+from ..pe_utils import PLANET_COLOR, iface
 
 LOG_LEVEL = os.environ.get("PYTHON_LOG_LEVEL", "WARNING").upper()
 logging.basicConfig(level=LOG_LEVEL)
@@ -123,6 +123,43 @@ class PlanetExtentMapTool(QgsMapTool):
             self.extent = QgsRectangle(ur, ll)
 
 
+class PlanetFootprintsMapTool(PlanetExtentMapTool):
+    """
+    Selects footprints on the map, either with a click on them or by
+    dragging a box around them. The point under the mouse is emitted as it
+    moves, so the footprints there can be highlighted.
+
+    Points and extents are in the canvas CRS. The map tool that was active
+    before is restored once a selection has been made.
+    """
+
+    pointClicked = pyqtSignal(object)
+    pointHovered = pyqtSignal(object)
+
+    def __init__(self, canvas):
+        super().__init__(canvas)
+        self.previous_map_tool = canvas.mapTool()
+
+    def canvasMoveEvent(self, event):
+        if event.buttons() == Qt.NoButton:
+            self.pointHovered.emit(self.toMapCoordinates(event.pos()))
+            return
+        super().canvasMoveEvent(event)
+
+    def canvasReleaseEvent(self, event):
+        if self.dragging:
+            super().canvasReleaseEvent(event)
+        else:
+            if self.rubber_band is not None:
+                self.rubber_band.reset(QgsWkbTypes.PolygonGeometry)
+                self.rubber_band = None
+            self.pointClicked.emit(self.toMapCoordinates(event.pos()))
+        if self.previous_map_tool is not None:
+            self.canvas.setMapTool(self.previous_map_tool)
+        else:
+            iface.actionPan().trigger()
+
+
 # noinspection DuplicatedCode
 class PlanetCircleMapTool(QgsMapTool):
 
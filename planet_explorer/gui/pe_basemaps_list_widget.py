@@ -51,7 +51,7 @@ from ..pe_utils import (
     qgsrectangle_for_canvas_from_4326_bbox_coords,
 )
 from ..planet_api import PlanetClient
-from .pe_thumbnails import download_thumbnail
+from .pe_thumbnails import cancel_thumbnail_downloads, download_thumbnail
 
 ID = "id"
 BBOX = "bbox"
@@ -79,6 +79,7 @@ class BasemapsListWidget(QListWidget):
 
     def clear(self):
         self.widgets = []
+        cancel_thumbnail_downloads(self)
         super().clear()
 
     def populate(self, mosaics):
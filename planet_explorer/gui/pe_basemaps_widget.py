@@ -25,6 +25,8 @@ __revision__ = "$Format:%H$"
 
 import math
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from planet.api.exceptions import InvalidAPIKey
 from planet.api.models import MosaicQuads, Mosaics
@@ -55,6 +57,11 @@ from ..pe_utils import (
     open_link_with_browser,
 )
 from ..planet_api import PlanetClient
+from ..planet_api.p_quad_grid import (
+    confirm_quads,
+    derive_quads,
+    group_mosaics_by_grid,
+)
 from ..planet_api.p_quad_orders import (
     create_quad_order_from_mosaics,
     create_quad_order_from_quads,
@@ -75,6 +82,7 @@ PRODUCT_TYPE = "product_type"
 TIMELAPSE = "timelapse"
 
 QUADS_PER_PAGE = 50
+MAX_QUAD_PAGE_REQUESTS = 4
 MAX_QUADS_TO_DOWNLOAD = 100
 MAX_AREA_TO_DOWNLOAD = 100000
 
@@ -199,6 +207,9 @@ class BasemapsWidget(BASE, WIDGET):
         self.mosaicsList.setAllChecked(checked)
 
     def batch_select_quads_clicked(self, url="all"):
+        if url == "map":
+            self.quadsTree.select_on_map()
+            return
         checked = url == "all"
         self.quadsTree.setAllChecked(checked)
 
@@ -509,7 +520,7 @@ class BasemapsWidget(BASE, WIDGET):
 
         self.widgetProgressFindQuads.setVisible(True)
         self.progressBarInstances.setMaximum(len(selected))
-        self.progressBarQuads.setMaximum(numpages)
+        self.progressBarQuads.setMaximum(numpages * len(selected))
         self.finder = QuadFinder()
         self.finder.setup(self.p_client, selected, geom)
 
@@ -839,7 +850,9 @@ class QuadFinder(QObject):
 
     def find_quads(self):
         self.canceled = False
-        all_quads = []
+        self._lock = threading.Lock()
+        self._mosaics_started = 0
+        self._pages_read = 0
         bbox_rect = self.geom.boundingBox()
         bbox = [
             bbox_rect.xMinimum(),
@@ -847,18 +860,84 @@ class QuadFinder(QObject):
             bbox_rect.xMaximum(),
             bbox_rect.yMaximum(),
         ]
-        for i, mosaic in enumerate(self.mosaics):
-            self.mosaicStarted.emit(i + 1, mosaic.get(NAME))
-            json_quads = []
-            self.pageRead.emit(1)
-            quads = self.client.get_quads_for_mosaic(mosaic, bbox)
-            for j, page in enumerate(quads.iter()):
-                json_quads.extend(page.get().get(MosaicQuads.ITEM_KEY))
-                self.pageRead.emit(j + 2)
-                if self.canceled:
-                    return
-            all_quads.append(json_quads)
+        # Mosaics are paged through concurrently. Pages of a single mosaic are
+        # still read in sequence, so the number of workers bounds the number
+        # of page requests in flight.
+        # Mosaics sharing a quad grid have the same quads, so only the first
+        # mosaic of each grid is listed, and the quads of the other ones are
+        # derived from it when possible. Derived quads are still checked
+        # against a minimal listing of their mosaic, which is much lighter
+        # than the full one. They advance the progress by the pages it would
+        # have taken to list them, as the estimated total counts every
+        # selected mosaic.
+        all_quads = [None] * len(self.mosaics)
+        groups = group_mosaics_by_grid(self.mosaics)
+        workers = max(1, min(MAX_QUAD_PAGE_REQUESTS, len(self.mosaics)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            references = [
+                executor.submit(
+                    self._find_quads_for_mosaic, self.mosaics[group[0]], bbox
+                )
+                for group in groups
+            ]
+            listed = {}
+            for group, reference in zip(groups, references):
+                reference_mosaic = self.mosaics[group[0]]
+                reference_quads = reference.result()
+                all_quads[group[0]] = reference_quads
+                for i in group[1:]:
+                    mosaic = self.mosaics[i]
+                    quads = None
+                    if not self.canceled:
+                        quads = derive_quads(
+                            reference_mosaic, reference_quads, mosaic, bbox
+                        )
+                    if quads is None:
+                        listed[i] = executor.submit(
+                            self._find_quads_for_mosaic, mosaic, bbox
+                        )
+                    else:
+                        listed[i] = executor.submit(
+                            self._confirm_quads_for_mosaic, mosaic, quads, bbox
+                        )
+            for i, future in listed.items():
+                all_quads[i] = future.result()
+        if self.canceled:
+            return
         self.finished.emit(all_quads)
 
+    def _mosaic_started(self, mosaic):
+        with self._lock:
+            self._mosaics_started += 1
+            started = self._mosaics_started
+        self.mosaicStarted.emit(started, mosaic.get(NAME))
+
+    def _add_pages_read(self, count):
+        with self._lock:
+            self._pages_read += count
+            pages_read = self._pages_read
+        self.pageRead.emit(pages_read)
+
+    def _find_quads_for_mosaic(self, mosaic, bbox):
+        json_quads = []
+        if self.canceled:
+            return json_quads
+        self._mosaic_started(mosaic)
+        quads = self.client.get_quads_for_mosaic(mosaic, bbox)
+        for page in quads.iter():
+            json_quads.extend(page.get().get(MosaicQuads.ITEM_KEY))
+            self._add_pages_read(1)
+            if self.canceled:
+                break
+        return json_quads
+
+    def _confirm_quads_for_mosaic(self, mosaic, quads, bbox):
+        if self.canceled:
+            return []
+        self._mosaic_started(mosaic)
+        confirmed = confirm_quads(self.client, mosaic, quads, bbox)
+        self._add_pages_read(max(1, math.ceil(len(quads) / QUADS_PER_PAGE)))
+        return confirmed
+
     def cancel(self):
         self.canceled = True
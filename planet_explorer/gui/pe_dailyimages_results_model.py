@@ -0,0 +1,912 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+    pe_dailyimages_results_model.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 Planet Inc, https://planet.com
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+__author__ = "Planet Federal"
+__date__ = "October 2026"
+__copyright__ = "(C) 2026 Planet Inc, https://planet.com"
+
+# This will get replaced with a git SHA1 when you do a git archive
+__revision__ = "$Format:%H$"
+
+import bisect
+import logging
+import os
+from functools import partial
+
+from qgis.core import QgsApplication, QgsGeometry
+from qgis.PyQt.QtCore import (
+    QAbstractItemModel,
+    QEvent,
+    QModelIndex,
+    QObject,
+    QPersistentModelIndex,
+    QRect,
+    QRectF,
+    QSize,
+    Qt,
+    QTimer,
+    pyqtSignal,
+)
+from qgis.PyQt.QtGui import QColor, QIcon, QPainter, QPen, QPixmap, QTextDocument
+from qgis.PyQt.QtWidgets import (
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionButton,
+    QToolTip,
+)
+
+from ..gui.pe_results_configuration_dialog import PlanetNodeMetadata
+from ..pe_utils import (
+    area_coverage_for_image,
+    mercator_bboxes,
+    qgsgeometry_from_geojson,
+)
+from ..planet_api.p_client import ITEM_ASSET_DL_REGEX, PlanetClient
+from ..planet_api.p_scene_store import SceneStore
+from .pe_thumbnails import (
+    CompoundThumbnailTask,
+    compound_thumbnail_key,
+    download_thumbnail,
+    memoize_compound_thumbnail,
+    memoized_compound_thumbnail,
+)
+
+plugin_path = os.path.split(os.path.dirname(__file__))[0]
+
+
+def iconPath(f):
+    return os.path.join(plugin_path, "resources", f)
+
+
+CHILD_COUNT_THRESHOLD_FOR_PREVIEW = 100
+
+INSTRUMENT = "instrument"
+PROPERTIES = "properties"
+PERMISSIONS = "_permissions"
+LINKS = "_links"
+THUMBNAIL = "thumbnail"
+
+SUBTEXT_STYLE = "color: rgb(100,100,100);"
+SUBTEXT_STYLE_WITH_NEW_CHILDREN = "color: rgb(157,0,165);"
+
+ADD_PREVIEW_ICON = QIcon(iconPath("mActionAddXyzLayer.svg"))
+ZOOMTO_ICON = QIcon(":/plugins/planet_explorer/zoom-target.svg")
+LOCK_ICON = QIcon(":/plugins/planet_explorer/lock-light.svg")
+PLACEHOLDER_THUMB = ":/plugins/planet_explorer/thumb-placeholder-128.svg"
+HOVER_COLOR = QColor(0, 157, 165)
+
+NO_ACCESS_TOOLTIP = "Contact sales to purchase access"
+NO_ACCESS_INFO_TOOLTIP = (
+    "Contact sales to purchase access.\nUse the link in the ⓘ menu."
+)
+TOO_MANY_IMAGES_TOOLTIP = "Too many images to preview"
+ADD_PREVIEW_TOOLTIP = "Add preview layer to map"
+ZOOMTO_TOOLTIP = "Zoom to extent"
+
+# Milliseconds without new thumbnails before compound thumbnails are composed
+COMPOUND_THUMBNAIL_DELAY = 200
+
+ROW_HEIGHT = 56
+THUMBNAIL_SIZE = 48
+CHECKBOX_SIZE = 16
+LOCK_SIZE = 16
+ACTION_ICON_SIZE = 18
+SPACING = 6
+
+LOG_LEVEL = os.environ.get("PYTHON_LOG_LEVEL", "WARNING").upper()
+logging.basicConfig(level=LOG_LEVEL)
+log = logging.getLogger(__name__)
+
+
+def item_type_name(item_type):
+    return PlanetClient.getInstance().item_types_names()[item_type]
+
+
+class ResultsNode:
+    """
+    Base class for the nodes of the daily imagery results tree. Nodes are
+    plain Python objects, so holding tens of thousands of them is cheap, and
+    they are only drawn when their row is visible.
+    """
+
+    __slots__ = (
+        "parent",
+        "row",
+        "children",
+        "thumbnail",
+        "thumbnail_key",
+        "thumbnails_requested",
+        "has_new",
+        "downloadable",
+        "check_state",
+        "_geom",
+    )
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.row = 0
+        self.children = []
+        self.thumbnail = None
+        self.thumbnail_key = None
+        self.thumbnails_requested = False
+        self.has_new = True
+        self.downloadable = False
+        self.check_state = Qt.Unchecked
+        self._geom = None
+
+    def scenes(self):
+        for child in self.children:
+            yield from child.scenes()
+
+    def images(self):
+        return [scene.image for scene in self.scenes()]
+
+    def geom(self):
+        if self._geom is None:
+            self._geom = QgsGeometry.collectGeometry(
+                [child.geom() for child in self.children]
+            )
+        return self._geom
+
+    def update_for_children(self):
+        """Recomputes the values aggregated from the children of the node"""
+        self._geom = None
+        self.downloadable = any(child.downloadable for child in self.children)
+
+    def update_check_state(self):
+        states = {child.check_state for child in self.children}
+        if states == {Qt.Checked}:
+            self.check_state = Qt.Checked
+        elif states <= {Qt.Unchecked}:
+            self.check_state = Qt.Unchecked
+        else:
+            self.check_state = Qt.PartiallyChecked
+
+    def can_preview(self):
+        return self.downloadable
+
+    def preview_tooltip(self):
+        return ADD_PREVIEW_TOOLTIP if self.downloadable else NO_ACCESS_TOOLTIP
+
+    def tooltip(self):
+        return ""
+
+
+class DateNode(ResultsNode):
+
+    __slots__ = ("date", "itemtype", "label", "scene_count", "satellites")
+
+    def __init__(self, parent, store, record):
+        super().__init__(parent)
+        datetime = store.datetime(record)
+        self.date = datetime.date()
+        self.itemtype = store.item_type_name(record)
+        self.label = datetime.strftime("%b %d, %Y")
+        self.scene_count = 0
+        # satellite id -> SatelliteNode
+        self.satellites = {}
+
+    def update_for_children(self):
+        super().update_for_children()
+        self.scene_count = sum(len(child.children) for child in self.children)
+
+    def text(self, metadata_to_show, aoi):
+        count_style = (
+            SUBTEXT_STYLE if not self.has_new else SUBTEXT_STYLE_WITH_NEW_CHILDREN
+        )
+        return f"""{self.label}<br>
+                    <b>{item_type_name(self.itemtype)}</b><br>
+                    <span style="{count_style}">{self.scene_count} images</span>"""
+
+    def can_preview(self):
+        return (
+            self.downloadable and self.scene_count <= CHILD_COUNT_THRESHOLD_FOR_PREVIEW
+        )
+
+    def preview_tooltip(self):
+        if not self.downloadable:
+            return NO_ACCESS_INFO_TOOLTIP
+        elif self.scene_count > CHILD_COUNT_THRESHOLD_FOR_PREVIEW:
+            return TOO_MANY_IMAGES_TOOLTIP
+        return ADD_PREVIEW_TOOLTIP
+
+    def tooltip(self):
+        return "" if self.downloadable else NO_ACCESS_INFO_TOOLTIP
+
+    def name(self):
+        return f"{self.label} | {item_type_name(self.itemtype)}"
+
+
+class SatelliteNode(ResultsNode):
+
+    __slots__ = ("satellite", "instrument")
+
+    def __init__(self, parent, store, record):
+        super().__init__(parent)
+        self.satellite = store.satellite_name(record)
+        self.instrument = store.properties(record).get(INSTRUMENT, "")
+
+    def text(self, metadata_to_show, aoi):
+        count_style = (
+            SUBTEXT_STYLE if not self.has_new else SUBTEXT_STYLE_WITH_NEW_CHILDREN
+        )
+        size = len(self.children)
+        return f"""<span style="{SUBTEXT_STYLE}"> Satellite {self.satellite} {self.instrument} </span>
+                    <span style="{count_style}">({size} images)</span>"""  # noqa: E501
+
+    def can_preview(self):
+        return (
+            self.downloadable
+            and len(self.children) <= CHILD_COUNT_THRESHOLD_FOR_PREVIEW
+        )
+
+    def preview_tooltip(self):
+        if not self.downloadable:
+            return NO_ACCESS_TOOLTIP
+        elif len(self.children) > CHILD_COUNT_THRESHOLD_FOR_PREVIEW:
+            return TOO_MANY_IMAGES_TOOLTIP
+        return ADD_PREVIEW_TOOLTIP
+
+    def name(self):
+        return f"Satellite {self.satellite}"
+
+
+class SceneNode(ResultsNode):
+    """
+    Scene of the results tree. Its metadata is not held by the node, but by
+    a record of the SceneStore of the model. The text of the row is formatted
+    once, and again only when the metadata to show or the AOI change.
+    """
+
+    __slots__ = ("store", "record", "_text")
+
+    def __init__(self, parent, store, record):
+        super().__init__(parent)
+        self.store = store
+        self.record = record
+        self.downloadable = bool(store.downloadable[record])
+        # ((metadata to show, aoi), text) of the last formatted text
+        self._text = None
+
+    @property
+    def image(self):
+        return self.store.image(self.record)
+
+    @property
+    def datetime(self):
+        return self.store.datetime(self.record)
+
+    def __lt__(self, other):
+        return self.store.acquired[self.record] < other.store.acquired[other.record]
+
+    def scenes(self):
+        yield self
+
+    def geom(self):
+        if self._geom is None:
+            self._geom = qgsgeometry_from_geojson(
+                self.store.geometry(self.record), self.store.geometry_key(self.record)
+            )
+        return self._geom
+
+    def update_for_children(self):
+        pass
+
+    def update_check_state(self):
+        pass
+
+    def thumbnail_url(self):
+        api_key = PlanetClient.getInstance().api_key()
+        link = self.store.metadata(self.record)[LINKS][THUMBNAIL]
+        return f"{link}?api_key={api_key}"
+
+    def text(self, metadata_to_show, aoi):
+        key = (tuple(metadata_to_show), aoi)
+        if self._text is None or self._text[0] != key:
+            self._text = (key, self._format_text(metadata_to_show, aoi))
+        return self._text[1]
+
+    def _format_text(self, metadata_to_show, aoi):
+        image = self.store.metadata(self.record)
+        properties = image[PROPERTIES]
+        datetime = self.datetime
+        metadata = ""
+        for i, value in enumerate(metadata_to_show):
+            spacer = "<br>" if i == 1 else " "
+            if value == PlanetNodeMetadata.AREA_COVER:
+                area_coverage = area_coverage_for_image(image, aoi, self.geom())
+                if area_coverage is not None:
+                    metadata += f"{value.value}:{area_coverage:.0f}{spacer}"
+                else:
+                    metadata += f"{value.value}:--{spacer}"
+            else:
+                metadata += f'{value.value}:{properties.get(value.value, "--")}{spacer}'
+        date = datetime.strftime("%b %d, %Y")
+        time = datetime.strftime("%H:%M:%S")
+        item_type = self.store.item_type_name(self.record)
+        return f"""{date}<span style="color: rgb(100,100,100);"> {time} UTC</span><br>
+                        <b>{item_type_name(item_type)}</b><br>
+                        <span style="{SUBTEXT_STYLE}">{metadata}</span>
+                    """
+
+    def name(self):
+        datetime = self.datetime
+        date = datetime.strftime("%b %d, %Y")
+        time = datetime.strftime("%H:%M:%S")
+        item_type = self.store.item_type_name(self.record)
+        return f"{date} {time} | {item_type_name(item_type)}"
+
+
+class DailyImagesResultsModel(QAbstractItemModel):
+    """
+    Model for daily imagery search results, grouped by date and item type,
+    then by satellite. Scenes are kept sorted by acquisition time inside
+    each satellite group.
+
+    The number of checked scenes is updated as their check state changes, and
+    ``checkStateChanged`` is emitted once for all the changes made in the
+    same event loop iteration, however many scenes they affect.
+    """
+
+    checkStateChanged = pyqtSignal()
+
+    def __init__(self, metadata_to_show, parent=None):
+        super().__init__(parent)
+        self.root = ResultsNode(None)
+        self.store = SceneStore()
+        self.metadata_to_show = metadata_to_show
+        # Prepared AOI of the search request, for the area coverage
+        self.aoi = None
+        # (date, item type) -> DateNode
+        self._dates = {}
+        # SceneNode of each record of the store
+        self._scenes = []
+        # Groups highlighted as having new scenes since the last page
+        self._new_groups = []
+        self._checked_count = 0
+        self._check_state_change_pending = False
+        # Groups waiting for their compound thumbnail to be composed
+        self._pending_thumbnails = {}
+        # Compound thumbnail tasks running -> {thumbnail key: [groups]}
+        self._thumbnail_tasks = {}
+        self._thumbnail_timer = QTimer(self)
+        self._thumbnail_timer.setSingleShot(True)
+        self._thumbnail_timer.setInterval(COMPOUND_THUMBNAIL_DELAY)
+        self._thumbnail_timer.timeout.connect(self._compose_thumbnails)
+
+    def node(self, index):
+        if index.isValid():
+            return index.internalPointer()
+        return self.root
+
+    def index_for_node(self, node):
+        if node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        return self.createIndex(row, column, self.node(parent).children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self.index_for_node(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.internalPointer().downloadable:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            return node.text(self.metadata_to_show, self.aoi)
+        elif role == Qt.CheckStateRole:
+            return node.check_state
+        elif role == Qt.DecorationRole:
+            return node.thumbnail
+        elif role == Qt.ToolTipRole:
+            return node.tooltip()
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        node = index.internalPointer()
+        if not node.downloadable:
+            return False
+        # Clicking a partially checked group unchecks all of its scenes
+        checked = value == Qt.Checked and node.check_state != Qt.PartiallyChecked
+        self._set_checked(node, checked)
+        self._emit_changed(node)
+        parent = node.parent
+        while parent is not self.root:
+            parent.update_check_state()
+            self._emit_changed(parent)
+            parent = parent.parent
+        self._check_state_changed()
+        return True
+
+    def _check_state_changed(self):
+        if not self._check_state_change_pending:
+            self._check_state_change_pending = True
+            QTimer.singleShot(0, self._emit_check_state_changed)
+
+    def _emit_check_state_changed(self):
+        self._check_state_change_pending = False
+        self.checkStateChanged.emit()
+
+    def _set_checked(self, node, checked):
+        if isinstance(node, SceneNode):
+            if node.downloadable and self.store.checked[node.record] != checked:
+                node.check_state = Qt.Checked if checked else Qt.Unchecked
+                self.store.checked[node.record] = checked
+                self._checked_count += 1 if checked else -1
+            return
+        for child in node.children:
+            self._set_checked(child, checked)
+        if node.children:
+            first = self.index_for_node(node.children[0])
+            last = self.index_for_node(node.children[-1])
+            self.dataChanged.emit(first, last, [Qt.CheckStateRole])
+        node.update_check_state()
+
+    def _emit_changed(self, node, roles=None):
+        index = self.index_for_node(node)
+        self.dataChanged.emit(index, index, roles or [])
+
+    def clear(self):
+        self.beginResetModel()
+        self.root = ResultsNode(None)
+        self.store.clear()
+        self._dates = {}
+        self._scenes = []
+        self._new_groups = []
+        self._pending_thumbnails = {}
+        self._thumbnail_tasks = {}
+        self._thumbnail_timer.stop()
+        self.endResetModel()
+        if self._checked_count:
+            self._checked_count = 0
+            self._check_state_changed()
+
+    def set_aoi(self, aoi):
+        self.aoi = aoi
+
+    def set_metadata_to_show(self, metadata_to_show):
+        self.metadata_to_show = metadata_to_show
+        self._emit_all_changed(self.root)
+
+    def _emit_all_changed(self, node):
+        if node.children:
+            first = self.index_for_node(node.children[0])
+            last = self.index_for_node(node.children[-1])
+            self.dataChanged.emit(first, last, [Qt.DisplayRole])
+            for child in node.children:
+                self._emit_all_changed(child)
+
+    def _satellite_node(self, record, date):
+        store = self.store
+        key = (date, int(store.item_type[record]))
+        date_node = self._dates.get(key)
+        if date_node is None:
+            date_node = self._append(self.root, DateNode(self.root, store, record))
+            self._dates[key] = date_node
+        satellite = int(store.satellite[record])
+        satellite_node = date_node.satellites.get(satellite)
+        if satellite_node is None:
+            satellite_node = self._append(
+                date_node, SatelliteNode(date_node, store, record)
+            )
+            date_node.satellites[satellite] = satellite_node
+        return satellite_node
+
+    def _append(self, parent, node):
+        row = len(parent.children)
+        self.beginInsertRows(self.index_for_node(parent), row, row)
+        node.row = row
+        parent.children.append(node)
+        self.endInsertRows()
+        return node
+
+    def _insert_scene(self, satellite_node, scene):
+        children = satellite_node.children
+        row = bisect.bisect_right(children, scene)
+        self.beginInsertRows(self.index_for_node(satellite_node), row, row)
+        children.insert(row, scene)
+        for i in range(row, len(children)):
+            children[i].row = i
+        self.endInsertRows()
+
+    def add_images(self, images):
+        """
+        Adds a page of search results to the tree. Groups that get new scenes
+        are highlighted until the next page is added. Only those groups have
+        their counts, extent and thumbnail recomputed.
+
+        The metadata of the scenes is moved to the SceneStore of the model,
+        and the nodes only reference their records in it.
+        """
+        for node in self._new_groups:
+            node.has_new = False
+            self._emit_changed(node, [Qt.DisplayRole])
+        downloadable = [
+            any(ITEM_ASSET_DL_REGEX.match(s) is not None for s in image[PERMISSIONS])
+            for image in images
+        ]
+        records = self.store.add(images, downloadable)
+        # Records are appended at the end of the store
+        first = records.start
+        dates = self.store.acquired[first:].astype("M8[D]")
+        changed = {}
+        for record, date in zip(records, dates.tolist()):
+            satellite_node = self._satellite_node(record, date)
+            scene = SceneNode(satellite_node, self.store, record)
+            self._insert_scene(satellite_node, scene)
+            self._scenes.append(scene)
+            changed[satellite_node] = None
+        date_nodes = {satellite_node.parent: None for satellite_node in changed}
+        # Satellites are updated before dates, which aggregate their values
+        self._new_groups = list(changed) + list(date_nodes)
+        for node in self._new_groups:
+            node.has_new = True
+            self._update_group(node)
+
+    def _update_group(self, node):
+        node.update_for_children()
+        node.update_check_state()
+        node.thumbnails_requested = False
+        self.update_compound_thumbnail(node)
+        self._emit_changed(node)
+
+    def scene(self, record):
+        return self._scenes[record]
+
+    def records_intersecting(self, geometry):
+        """
+        Returns the records of the scenes whose footprint intersects a
+        geometry. The spatial index of the store gives the scenes whose
+        extent intersects that of the geometry, and only their footprints are
+        tested against it.
+
+        :param geometry: Geometry in EPSG:4326, such as an AOI or a point
+        :type geometry: QgsGeometry
+        :rtype: list
+        """
+        rect = geometry.boundingBox()
+        candidates = self.store.index().intersecting(
+            rect.xMinimum(), rect.yMinimum(), rect.xMaximum(), rect.yMaximum()
+        )
+        if not len(candidates):
+            return []
+        engine = QgsGeometry.createGeometryEngine(geometry.constGet())
+        engine.prepareGeometry()
+        return [
+            record
+            for record in candidates.tolist()
+            if engine.intersects(self._scenes[record].geom().constGet())
+        ]
+
+    def records_at(self, point):
+        """Returns the records of the scenes whose footprint contains a point"""
+        return self.records_intersecting(QgsGeometry.fromPointXY(point))
+
+    def records_within(self, rect):
+        """
+        Returns the records of the scenes whose footprint lies inside an
+        extent in EPSG:4326
+
+        :type rect: QgsRectangle
+        :rtype: list
+        """
+        return (
+            self.store.index()
+            .within(rect.xMinimum(), rect.yMinimum(), rect.xMaximum(), rect.yMaximum())
+            .tolist()
+        )
+
+    def set_records_checked(self, records, checked=True):
+        """
+        Checks or unchecks many scenes at once, as when selecting them on the
+        map. The groups containing them have their state updated once.
+        """
+        groups = {}
+        for record in records:
+            scene = self._scenes[record]
+            self._set_checked(scene, checked)
+            self._emit_changed(scene, [Qt.CheckStateRole])
+            groups[scene.parent] = None
+        dates = {}
+        for group in groups:
+            group.update_check_state()
+            self._emit_changed(group, [Qt.CheckStateRole])
+            dates[group.parent] = None
+        for date in dates:
+            date.update_check_state()
+            self._emit_changed(date, [Qt.CheckStateRole])
+        self._check_state_changed()
+
+    def selected_images(self):
+        return self.store.images(self.store.checked_records())
+
+    def selected_count(self):
+        return self._checked_count
+
+    def request_thumbnails(self, index, view):
+        """
+        Requests the thumbnails needed to draw a row: the thumbnail of the
+        scene itself, or those of all the scenes in a group, for its compound
+        thumbnail
+        """
+        node = self.node(index)
+        if node.thumbnails_requested:
+            return
+        node.thumbnails_requested = True
+        for scene in node.scenes():
+            if not scene.thumbnails_requested:
+                scene.thumbnails_requested = True
+                loader = SceneThumbnailLoader(self, scene, view, index)
+                download_thumbnail(scene.thumbnail_url(), loader)
+
+    def set_thumbnail(self, scene, img):
+        scene.thumbnail = img
+        self._emit_changed(scene, [Qt.DecorationRole])
+        parent = scene.parent
+        while parent is not self.root:
+            self.update_compound_thumbnail(parent)
+            parent = parent.parent
+
+    def update_compound_thumbnail(self, node):
+        """
+        Schedules the compound thumbnail of a group to be composed. Groups are
+        composed together, once no thumbnail has arrived for
+        COMPOUND_THUMBNAIL_DELAY milliseconds.
+        """
+        self._pending_thumbnails[node] = None
+        self._thumbnail_timer.start()
+
+    def _compose_thumbnails(self):
+        pending, self._pending_thumbnails = self._pending_thumbnails, {}
+        jobs = {}
+        groups = {}
+        for node in pending:
+            scenes = list(node.scenes())
+            if not scenes or any(scene.thumbnail is None for scene in scenes):
+                # Scheduled again when the missing thumbnails arrive
+                continue
+            records = [scene.record for scene in scenes]
+            key = compound_thumbnail_key([self.store.ids[r] for r in records])
+            node.thumbnail_key = key
+            image = memoized_compound_thumbnail(key)
+            if image is not None:
+                self._set_compound_thumbnail(node, key, image)
+                continue
+            groups.setdefault(key, []).append(node)
+            if key not in jobs:
+                bboxes = mercator_bboxes(self.store.bboxes[records])
+                jobs[key] = (bboxes, [scene.thumbnail for scene in scenes])
+        if jobs:
+            task = CompoundThumbnailTask(jobs)
+            self._thumbnail_tasks[task] = groups
+            task.taskCompleted.connect(partial(self._thumbnails_composed, task))
+            task.taskTerminated.connect(partial(self._thumbnail_tasks.pop, task, None))
+            QgsApplication.taskManager().addTask(task)
+
+    def _thumbnails_composed(self, task):
+        # Tasks are forgotten when the results are cleared
+        groups = self._thumbnail_tasks.pop(task, None)
+        if groups is None:
+            return
+        for key, image in task.images.items():
+            memoize_compound_thumbnail(key, image)
+            for node in groups[key]:
+                self._set_compound_thumbnail(node, key, image)
+
+    def _set_compound_thumbnail(self, node, key, image):
+        # A group may have got new scenes since its thumbnail was requested
+        if node.thumbnail_key == key:
+            node.thumbnail = image
+            self._emit_changed(node, [Qt.DecorationRole])
+
+
+class SceneThumbnailLoader(QObject):
+    """
+    Receives the thumbnail of a scene on behalf of the results view, and
+    tells the thumbnail manager whether the row it is drawn in is visible.
+    """
+
+    def __init__(self, model, scene, view, index):
+        super().__init__(view)
+        self.model = model
+        self.scene = scene
+        self.view = view
+        self.index = QPersistentModelIndex(index)
+
+    def thumbnail_visible(self):
+        if not self.index.isValid() or not self.view.isVisible():
+            return False
+        rect = self.view.visualRect(QModelIndex(self.index))
+        return rect.isValid() and rect.intersects(self.view.viewport().rect())
+
+    def set_thumbnail(self, img):
+        # The index is no longer valid if the results were cleared meanwhile
+        if self.index.isValid():
+            self.model.set_thumbnail(self.scene, img)
+        self.deleteLater()
+
+
+class DailyImagesResultsDelegate(QStyledItemDelegate):
+    """
+    Paints the rows of the daily imagery results tree: checkbox, lock icon
+    for scenes that can't be downloaded, thumbnail, description and the
+    zoom to and add preview actions.
+    """
+
+    zoomToRequested = pyqtSignal(QModelIndex)
+    previewRequested = pyqtSignal(QModelIndex)
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.placeholder = (
+            QPixmap(PLACEHOLDER_THUMB, "SVG")
+            .scaled(
+                THUMBNAIL_SIZE,
+                THUMBNAIL_SIZE,
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation,
+            )
+            .toImage()
+        )
+        self.document = QTextDocument()
+
+    def _layout(self, rect, node):
+        rects = {}
+        x = rect.left() + 4
+        center = rect.center().y()
+
+        def square(size):
+            return QRect(x, center - size // 2, size, size)
+
+        rects["checkbox"] = square(CHECKBOX_SIZE)
+        x += CHECKBOX_SIZE + SPACING
+        if not node.downloadable:
+            rects["lock"] = square(LOCK_SIZE)
+            x += LOCK_SIZE + SPACING
+        rects["thumbnail"] = square(THUMBNAIL_SIZE)
+        x += THUMBNAIL_SIZE + SPACING
+        right = rect.right() - 10
+        rects["preview"] = QRect(
+            right - ACTION_ICON_SIZE,
+            center - ACTION_ICON_SIZE // 2,
+            ACTION_ICON_SIZE,
+            ACTION_ICON_SIZE,
+        )
+        right -= ACTION_ICON_SIZE + SPACING
+        rects["zoom"] = QRect(
+            right - ACTION_ICON_SIZE,
+            center - ACTION_ICON_SIZE // 2,
+            ACTION_ICON_SIZE,
+            ACTION_ICON_SIZE,
+        )
+        right -= ACTION_ICON_SIZE + SPACING
+        rects["text"] = QRect(x, rect.top(), max(0, right - x), rect.height())
+        return rects
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        model = index.model()
+        node = model.node(index)
+        model.request_thumbnails(index, self.view)
+        style = self.view.style()
+        painter.save()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, self.view)
+        if option.state & QStyle.State_MouseOver:
+            painter.setPen(QPen(HOVER_COLOR, 2))
+            painter.drawRect(option.rect.adjusted(1, 1, -1, -1))
+
+        rects = self._layout(option.rect, node)
+        checkbox = QStyleOptionButton()
+        checkbox.rect = rects["checkbox"]
+        checkbox.state = {
+            Qt.Checked: QStyle.State_On,
+            Qt.PartiallyChecked: QStyle.State_NoChange,
+        }.get(node.check_state, QStyle.State_Off)
+        if node.downloadable:
+            checkbox.state |= QStyle.State_Enabled
+        style.drawPrimitive(QStyle.PE_IndicatorCheckBox, checkbox, painter, self.view)
+        if "lock" in rects:
+            LOCK_ICON.paint(painter, rects["lock"])
+
+        thumbnail = node.thumbnail
+        if thumbnail is None or thumbnail.isNull():
+            thumbnail = self.placeholder
+        size = thumbnail.size().scaled(
+            THUMBNAIL_SIZE, THUMBNAIL_SIZE, Qt.KeepAspectRatio
+        )
+        target = QRect(0, 0, size.width(), size.height())
+        target.moveCenter(rects["thumbnail"].center())
+        painter.drawImage(target, thumbnail)
+
+        text_rect = rects["text"]
+        self.document.setHtml(index.data(Qt.DisplayRole))
+        self.document.setTextWidth(text_rect.width())
+        top = text_rect.top() + (text_rect.height() - self.document.size().height()) / 2
+        painter.translate(text_rect.left(), top)
+        self.document.drawContents(
+            painter, QRectF(0, 0, text_rect.width(), text_rect.height())
+        )
+        painter.translate(-text_rect.left(), -top)
+
+        ZOOMTO_ICON.paint(painter, rects["zoom"])
+        mode = QIcon.Normal if node.can_preview() else QIcon.Disabled
+        ADD_PREVIEW_ICON.paint(painter, rects["preview"], Qt.AlignCenter, mode)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseButtonRelease, QEvent.MouseButtonPress):
+            return False
+        if event.button() != Qt.LeftButton:
+            return False
+        node = model.node(index)
+        rects = self._layout(option.rect, node)
+        pos = event.pos()
+        if rects["checkbox"].contains(pos):
+            if event.type() == QEvent.MouseButtonRelease:
+                state = Qt.Unchecked if node.check_state == Qt.Checked else Qt.Checked
+                model.setData(index, state, Qt.CheckStateRole)
+            return True
+        elif rects["zoom"].contains(pos):
+            if event.type() == QEvent.MouseButtonRelease:
+                self.zoomToRequested.emit(index)
+            return True
+        elif rects["preview"].contains(pos) and node.can_preview():
+            if event.type() == QEvent.MouseButtonRelease:
+                self.previewRequested.emit(index)
+            return True
+        return False
+
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QEvent.ToolTip and index.isValid():
+            node = index.model().node(index)
+            rects = self._layout(option.rect, node)
+            tooltip = None
+            if rects["zoom"].contains(event.pos()):
+                tooltip = ZOOMTO_TOOLTIP
+            elif rects["preview"].contains(event.pos()):
+                tooltip = node.preview_tooltip()
+            if tooltip is not None:
+                QToolTip.showText(event.globalPos(), tooltip, view)
+                return True
+        return super().helpEvent(event, view, option, index)
@@ -23,30 +23,22 @@ __revision__ = "$Format:%H$"
 
 import logging
 import os
+from collections import deque
+from functools import partial
 
-import iso8601
 from qgis.core import (
+    Qgis,
     QgsApplication,
-    QgsCoordinateReferenceSystem,
-    QgsCoordinateTransform,
+    QgsCsException,
     QgsGeometry,
-    QgsProject,
+    QgsMessageLog,
     QgsRectangle,
     QgsWkbTypes,
 )
 from qgis.gui import QgsRubberBand
 from qgis.PyQt import uic
-from qgis.PyQt.QtCore import QSize, Qt, pyqtSignal, pyqtSlot
-from qgis.PyQt.QtGui import QColor, QIcon, QPixmap
-from qgis.PyQt.QtWidgets import (
-    QCheckBox,
-    QFrame,
-    QHBoxLayout,
-    QLabel,
-    QListWidgetItem,
-    QTreeWidgetItem,
-    QTreeWidgetItemIterator,
-)
+from qgis.PyQt.QtCore import QEvent, Qt, pyqtSignal, pyqtSlot
+from qgis.PyQt.QtGui import QColor, QIcon
 
 from ..gui.pe_results_configuration_dialog import (
     PlanetNodeMetadata,
@@ -60,16 +52,35 @@ from ..pe_analytics import (
 )
 
 from ..pe_utils import (
+    EPSG_4326,
     PLANET_COLOR,
+    QGIS_LOG_SECTION_NAME,
     SEARCH_AOI_COLOR,
-    area_coverage_for_image,
+    area_coverage_mask,
     create_preview_group,
     iface,
-    qgsgeometry_from_geojson,
+    request_aoi,
+    saved_search_history,
+    search_prefetch_pages,
+    search_result_cache,
+    transform_from_project,
+    transform_to_project,
+)
+from ..planet_api.p_client import PlanetClient
+from ..planet_api.p_search_cache import merge_images, sort_images
+from ..planet_api.p_search_tasks import (
+    SearchDeltaTask,
+    SearchPageTask,
+    SearchStatsTask,
+)
+from .pe_aoi_maptools import PlanetFootprintsMapTool
+from .pe_dailyimages_results_model import (
+    DailyImagesResultsDelegate,
+    DailyImagesResultsModel,
+    SceneThumbnailLoader,
 )
-from ..planet_api.p_client import PlanetClient, ITEM_ASSET_DL_REGEX
 from .pe_gui_utils import waitcursor
-from .pe_thumbnails import createCompoundThumbnail, download_thumbnail
+from .pe_thumbnails import cancel_thumbnail_downloads
 
 plugin_path = os.path.split(os.path.dirname(__file__))[0]
 
@@ -79,26 +90,12 @@ def iconPath(f):
 
 
 TOP_ITEMS_BATCH = 250
-CHILD_COUNT_THRESHOLD_FOR_PREVIEW = 100
-
-ID = "id"
-SATELLITE_ID = "satellite_id"
-INSTRUMENT = "instrument"
-PROPERTIES = "properties"
-ASSETS = "assets"
-GEOMETRY = "geometry"
-ITEM_TYPE = "item_type"
-PERMISSIONS = "_permissions"
-
-SUBTEXT_STYLE = "color: rgb(100,100,100);"
-SUBTEXT_STYLE_WITH_NEW_CHILDREN = "color: rgb(157,0,165);"
+MAX_PREFETCHED_IMAGES = 4 * TOP_ITEMS_BATCH
 
 ADD_PREVIEW_ICON = QIcon(iconPath("mActionAddXyzLayer.svg"))
 SAVE_ICON = QgsApplication.getThemeIcon("/mActionFileSave.svg")
-ZOOMTO_ICON = QIcon(":/plugins/planet_explorer/zoom-target.svg")
 SORT_ICON = QIcon(iconPath("sort.svg"))
-LOCK_ICON = QIcon(":/plugins/planet_explorer/lock-light.svg")
-PLACEHOLDER_THUMB = ":/plugins/planet_explorer/thumb-placeholder-128.svg"
+SELECT_ON_MAP_ICON = QgsApplication.getThemeIcon("/mActionSelectRectangle.svg")
 
 LOG_LEVEL = os.environ.get("PYTHON_LOG_LEVEL", "WARNING").upper()
 logging.basicConfig(level=LOG_LEVEL)
@@ -125,7 +122,7 @@ class DailyImagesSearchResultsWidget(RESULTS_BASE, RESULTS_WIDGET):
 
         self._p_client = PlanetClient.getInstance()
 
-        self._has_more = True
+        self._has_more = False
 
         self._metadata_to_show = [
             PlanetNodeMetadata.CLOUD_PERCENTAGE,
@@ -136,21 +133,52 @@ class DailyImagesSearchResultsWidget(RESULTS_BASE, RESULTS_WIDGET):
         self._total_count = 0
 
         self._request = None
+        self._request_aoi = None
         self._local_filters = None
-        self._response_iterator = None
+        self._pages = None
+        self._task = None
+        self._stats_task = None
+        self._sort = None
+        self._saved_search = None
+        # Number of items read for the current search
+        self._search_count = 0
+        # Pages of results read in advance, not shown yet
+        self._prefetched = deque()
+        self._page_requested = False
 
         self.btnSaveSearch.setIcon(SAVE_ICON)
         self.btnSort.setIcon(SORT_ICON)
         self.btnAddPreview.setIcon(ADD_PREVIEW_ICON)
         self.btnAddPreview.setEnabled(False)
+        self.btnSelectOnMap.setIcon(SELECT_ON_MAP_ICON)
 
         self.btnSaveSearch.clicked.connect(self._save_search)
         self.btnAddPreview.clicked.connect(self._add_preview_clicked)
         self.btnSort.clicked.connect(self._sort_order_changed)
         self.btnSettings.clicked.connect(self._open_settings)
+        self.btnSelectOnMap.clicked.connect(self.select_on_map)
         self.lblImageCount.setOpenExternalLinks(False)
         self.lblImageCount.linkActivated.connect(self.load_more_link_clicked)
 
+        self._model = DailyImagesResultsModel(self._metadata_to_show, self)
+        self._model.checkStateChanged.connect(self.checked_count_changed)
+        self.tree.setModel(self._model)
+        self._delegate = DailyImagesResultsDelegate(self.tree)
+        self._delegate.zoomToRequested.connect(self.zoom_to_index)
+        self._delegate.previewRequested.connect(self.add_preview_for_index)
+        self.tree.setItemDelegate(self._delegate)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setMouseTracking(True)
+        self.tree.viewport().setAttribute(Qt.WA_Hover)
+        self.tree.viewport().installEventFilter(self)
+        self.tree.entered.connect(self._show_footprint)
+        self.tree.verticalScrollBar().valueChanged.connect(self._scrolled)
+
+        self._footprint = QgsRubberBand(iface.mapCanvas(), QgsWkbTypes.PolygonGeometry)
+        self._footprint.setStrokeColor(PLANET_COLOR)
+        self._footprint.setWidth(2)
+        self._map_tool = None
+
         self._aoi_box = None
         self._setup_request_aoi_box()
 
@@ -193,13 +221,87 @@ class DailyImagesSearchResultsWidget(RESULTS_BASE, RESULTS_WIDGET):
         create_preview_group("Selected images", imgs)
 
     def update_image_items(self):
-        it = QTreeWidgetItemIterator(self.tree)
-        while it.value():
-            item = it.value()
-            if isinstance(item, SceneItem):
-                w = self.tree.itemWidget(item, 0)
-                w.set_metadata_to_show(self._metadata_to_show)
-            it += 1
+        self._model.set_metadata_to_show(self._metadata_to_show)
+
+    def _geom_in_project_crs(self, geom):
+        transform = transform_to_project(EPSG_4326)
+        geom = QgsGeometry(geom)
+        geom.transform(transform)
+        return geom
+
+    def _show_footprint(self, index):
+        geom = self._model.node(index).geom()
+        self._footprint.setToGeometry(self._geom_in_project_crs(geom))
+
+    def _hide_footprint(self):
+        self._footprint.reset(QgsWkbTypes.PolygonGeometry)
+
+    def select_on_map(self):
+        """
+        Lets the user check scenes on the map: clicking toggles the scenes
+        under the mouse, and dragging a box checks the scenes inside it. The
+        footprint under the mouse is shown meanwhile.
+        """
+        canvas = iface.mapCanvas()
+        self._map_tool = PlanetFootprintsMapTool(canvas)
+        self._map_tool.pointHovered.connect(self._show_footprint_at)
+        self._map_tool.pointClicked.connect(self.toggle_checked_at)
+        self._map_tool.extentSelected.connect(self.check_in_extent)
+        self._map_tool.deactivated.connect(self._hide_footprint)
+        canvas.setMapTool(self._map_tool)
+
+    def _records_at(self, point):
+        try:
+            point = transform_from_project(EPSG_4326).transform(point)
+        except QgsCsException:
+            return []
+        return self._model.records_at(point)
+
+    def _show_footprint_at(self, point):
+        records = self._records_at(point)
+        if records:
+            geom = self._model.scene(records[-1]).geom()
+            self._footprint.setToGeometry(self._geom_in_project_crs(geom))
+        else:
+            self._hide_footprint()
+
+    def toggle_checked_at(self, point):
+        """
+        Toggles the scenes whose footprint contains a point in the project
+        CRS. They are all unchecked if they all were checked, and checked
+        otherwise. Scenes that can't be downloaded are left unchecked.
+        """
+        store = self._model.store
+        records = [r for r in self._records_at(point) if store.downloadable[r]]
+        if records:
+            checked = not store.checked[records].all()
+            self._model.set_records_checked(records, checked)
+
+    def check_in_extent(self, rect):
+        """Checks the scenes whose footprint lies inside an extent in the project CRS"""
+        try:
+            rect = transform_from_project(EPSG_4326).transformBoundingBox(rect)
+        except QgsCsException:
+            return
+        self._model.set_records_checked(self._model.records_within(rect))
+
+    def eventFilter(self, obj, event):
+        if obj is self.tree.viewport() and event.type() == QEvent.Leave:
+            self._hide_footprint()
+        return super().eventFilter(obj, event)
+
+    def zoom_to_index(self, index):
+        geom = self._geom_in_project_crs(self._model.node(index).geom())
+        rect = QgsRectangle(geom.boundingBox())
+        rect.scale(1.05)
+        iface.mapCanvas().setExtent(rect)
+        iface.mapCanvas().refresh()
+
+    @waitcursor
+    def add_preview_for_index(self, index):
+        node = self._model.node(index)
+        send_analytics_for_preview(node.images())
+        create_preview_group(node.name(), node.images())
 
     def _save_search(self, dlg=None):
         dlg = dlg if dlg else SaveSearchDialog(self._request)
@@ -221,162 +323,290 @@ class DailyImagesSearchResultsWidget(RESULTS_BASE, RESULTS_WIDGET):
     def load_more_link_clicked(self):
         self.load_more()
 
-    @waitcursor
-    def update_request(self, request, local_filters):
+    def update_request(
+        self, request, local_filters, saved_search=None, incremental=False
+    ):
+        """
+        Starts a new search. The search runs in a background task, and a
+        search still running is canceled and its results discarded.
+
+        For a saved search, its complete results are stored when available.
+        In incremental mode, only the items published since they were stored
+        are searched for, and merged into them.
+        """
         self._image_count = 0
+        self._total_count = 0
+        self._has_more = False
+        self._prefetched.clear()
+        self._pages = None
+        self._search_count = 0
         self._request = request
+        self._sort = " ".join(self.sort_order())
+        self._saved_search = saved_search
         self._local_filters = local_filters
-        self.tree.clear()
-        stats_request = {"interval": "year"}
-        stats_request.update(self._request)
-        resp = self._p_client.stats(stats_request).get()
-        self._total_count = sum([b["count"] for b in resp["buckets"]])
-        if self._total_count:
-            response = self._p_client.quick_search(
+        self._clear_results()
+        self._request_aoi = request_aoi(request)
+        self._model.set_aoi(self._request_aoi)
+        self._set_widgets_visibility(True)
+        self._page_requested = True
+        if incremental and saved_search is not None:
+            stored = saved_search_history().get(saved_search["id"], request)
+            if stored is not None:
+                images, published = stored
+                task = SearchDeltaTask(self._p_client, request, published)
+                self._start_task(
+                    task, partial(self._delta_task_completed, task, images)
+                )
+                return
+        cached = search_result_cache().get(request, self._sort)
+        if cached is not None:
+            self._show_cached_results(*cached)
+            return
+        self._start_stats_task(SearchStatsTask(self._p_client, request))
+        self._start_task(self._next_page_task())
+
+    def _show_cached_results(self, images, complete):
+        self._cancel_task()
+        self._cancel_stats_task()
+        self._search_count = len(images)
+        self._has_more = not complete
+        for start in range(0, len(images), TOP_ITEMS_BATCH):
+            end = start + TOP_ITEMS_BATCH
+            self._prefetched.append(images[start:end])
+        if complete:
+            self._total_count = len(images)
+            self._set_widgets_visibility(bool(images))
+            self._store_saved_search_results(images)
+        else:
+            self._start_stats_task(SearchStatsTask(self._p_client, self._request))
+        if self._prefetched:
+            self._show_next_page()
+        else:
+            self._page_requested = False
+            self._prefetch()
+            self.item_count_changed()
+
+    def _next_page_task(self):
+        if self._pages is None:
+            # New search, or one whose first results came from the cache
+            return SearchPageTask(
+                self._p_client,
                 self._request,
+                sort=self._sort,
                 page_size=TOP_ITEMS_BATCH,
-                sort=" ".join(self.sort_order()),
+                skip=self._search_count,
             )
-            self._response_iterator = response.iter()
-            self.load_more()
-            self._set_widgets_visibility(True)
-        else:
+        return SearchPageTask(self._p_client, self._request, pages=self._pages)
+
+    def _start_task(self, task, completed=None):
+        self._cancel_task()
+        self._task = task
+        task.taskCompleted.connect(completed or partial(self._task_completed, task))
+        task.taskTerminated.connect(partial(self._task_terminated, task))
+        QgsApplication.taskManager().addTask(task)
+        self.item_count_changed()
+
+    def _cancel_task(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _start_stats_task(self, task):
+        self._cancel_stats_task()
+        self._stats_task = task
+        task.taskCompleted.connect(partial(self._stats_task_completed, task))
+        task.taskTerminated.connect(partial(self._stats_task_terminated, task))
+        QgsApplication.taskManager().addTask(task)
+
+    def _cancel_stats_task(self):
+        if self._stats_task is not None:
+            self._stats_task.cancel()
+            self._stats_task = None
+
+    def _stats_task_completed(self, task):
+        if task is not self._stats_task:
+            return
+        self._stats_task = None
+        self._total_count = task.total_count
+        if not self._total_count:
+            self._set_widgets_visibility(False)
+        self.item_count_changed()
+
+    def _stats_task_terminated(self, task):
+        if task is not self._stats_task:
+            return
+        # The count is only informative, results are shown without it
+        self._stats_task = None
+        if task.exception is not None:
+            log.debug(f"Could not count search results:\n{task.exception}")
+
+    def is_searching(self):
+        """Tells whether results the user asked for are still being loaded"""
+        return self._page_requested
+
+    def _task_completed(self, task):
+        if task is not self._task:
+            # Results of a search that has been replaced by a newer one
+            return
+        self._task = None
+        if self._image_count == 0 and not task.images and not task.has_more:
             self._set_widgets_visibility(False)
+        self._pages = task.pages
+        self._has_more = task.has_more
+        self._prefetched.append(task.images)
+        self._cache_results(task.images)
+        if self._page_requested:
+            self._show_next_page()
+        else:
+            self._prefetch()
+            self.item_count_changed()
+
+    def _delta_task_completed(self, task, images):
+        if task is not self._task:
+            return
+        self._task = None
+        if task.images is None:
+            # Too many new items, the whole search is run again instead
+            self._start_stats_task(SearchStatsTask(self._p_client, self._request))
+            self._start_task(self._next_page_task())
+            return
+        images = merge_images(images, task.images)
+        saved_search_history().put(
+            self._saved_search, self._request, images, task.published
+        )
+        images = sort_images(images, self._sort)
+        search_result_cache().put(self._request, self._sort, images, complete=True)
+        iface.messageBar().pushMessage(
+            "Planet Explorer",
+            f"{len(task.images)} new images since the last run of this search",
+            level=Qgis.Info,
+            duration=5,
+        )
+        self._show_cached_results(images, True)
+
+    def _cache_results(self, images):
+        cache = search_result_cache()
+        self._search_count += len(images)
+        cache.append(self._request, self._sort, images, complete=not self._has_more)
+        if not self._has_more and self._saved_search is not None:
+            cached = cache.get(self._request, self._sort)
+            if cached is not None and cached[1]:
+                self._store_saved_search_results(cached[0])
+
+    def _store_saved_search_results(self, images):
+        if self._saved_search is not None:
+            saved_search_history().put(self._saved_search, self._request, images)
+
+    def _show_next_page(self):
+        self._page_requested = False
+        images = self._prefetched.popleft()
+        mask = self._area_coverage_mask(images)
+        images = [image for image, passes in zip(images, mask) if passes]
+        self._model.add_images(images)
+        self._image_count += len(images)
+        self._prefetch()
+        self.item_count_changed()
+
+    def _prefetch(self):
+        """
+        Reads the next pages of results in the background, up to the
+        configured number of pages and MAX_PREFETCHED_IMAGES images
+        """
+        if self._task is not None or not self._has_more:
+            return
+        prefetched_images = sum(len(images) for images in self._prefetched)
+        if (
+            len(self._prefetched) < search_prefetch_pages()
+            and prefetched_images < MAX_PREFETCHED_IMAGES
+        ):
+            self._start_task(self._next_page_task())
+
+    def _task_terminated(self, task):
+        if task is not self._task:
+            return
+        self._task = None
+        self._page_requested = False
+        self.item_count_changed()
+        if task.exception is not None:
+            QgsMessageLog.logMessage(
+                f"Search could not be completed.\n{task.exception}",
+                QGIS_LOG_SECTION_NAME,
+                Qgis.Warning,
+            )
+            iface.messageBar().pushMessage(
+                "Planet Explorer",
+                "Search could not be completed. See log for details",
+                level=Qgis.Warning,
+                duration=5,
+            )
+
+    def _clear_results(self):
+        cancel_thumbnail_downloads(self.tree)
+        for loader in self.tree.findChildren(SceneThumbnailLoader):
+            loader.deleteLater()
+        self._hide_footprint()
+        self._model.clear()
 
-    @waitcursor
     def load_more(self):
-        page = next(self._response_iterator, None)
-        if page is not None:
-            for i in range(self.tree.topLevelItemCount()):
-                date_item = self.tree.topLevelItem(i)
-                date_widget = self.tree.itemWidget(date_item, 0)
-                date_widget.has_new = False
-                for j in range(date_item.childCount()):
-                    satellite_item = date_item.child(j)
-                    satellite_widget = self.tree.itemWidget(satellite_item, 0)
-                    satellite_widget.has_new = False
-
-            links = page.get()[page.LINKS_KEY]
-            next_ = links.get(page.NEXT_KEY, None)
-            self._has_more = next_ is not None
-            images = page.get().get(page.ITEM_KEY)
-            for i, image in enumerate(images):
-                if self._passes_area_coverage_filter(image):
-                    sort_criteria = "acquired"
-                    date_item, satellite_item = self._find_items_for_satellite(image)
-                    date_widget = self.tree.itemWidget(date_item, 0)
-                    satellite_widget = self.tree.itemWidget(satellite_item, 0)
-                    item = SceneItem(image, sort_criteria)
-                    widget = SceneItemWidget(
-                        image,
-                        sort_criteria,
-                        self._metadata_to_show,
-                        item,
-                        self._request,
-                    )
-                    widget.checkedStateChanged.connect(self.checked_count_changed)
-                    widget.thumbnailChanged.connect(satellite_widget.update_thumbnail)
-                    item.setSizeHint(0, widget.sizeHint())
-                    satellite_item.addChild(item)
-                    self.tree.setItemWidget(item, 0, widget)
-                    date_widget.update_for_children()
-                    self._image_count += 1
-
-            for i in range(self.tree.topLevelItemCount()):
-                date_item = self.tree.topLevelItem(i)
-                date_widget = self.tree.itemWidget(date_item, 0)
-                for j in range(date_item.childCount()):
-                    satellite_item = date_item.child(j)
-                    satellite_widget = self.tree.itemWidget(satellite_item, 0)
-                    satellite_widget.update_for_children()
-                    satellite_widget.update_thumbnail()
-                    satellite_item.sortChildren(0, Qt.AscendingOrder)
-                date_widget.update_for_children()
-                date_widget.update_thumbnail()
-            self.item_count_changed()
-        else:
-            self._has_more = False
+        if self._page_requested:
+            return
+        if self._prefetched:
+            self._show_next_page()
+        elif self._has_more:
+            # Shown as soon as the page being read, if any, is available
+            self._page_requested = True
+            if self._task is None:
+                self._start_task(self._next_page_task())
             self.item_count_changed()
 
+    def _scrolled(self, value):
+        if value == self.tree.verticalScrollBar().maximum() and value > 0:
+            self.load_more()
+
     def _local_filter(self, name):
         for f in self._local_filters:
             if f.get("field_name") == name:
                 return f
 
-    def _passes_area_coverage_filter(self, image):
-        area_coverage = area_coverage_for_image(image, self._request)
-        if area_coverage is None:
-            return True  # an ID filter is begin used, so it makes no sense to
-            # check for are acoverage
+    def _area_coverage_mask(self, images):
+        # If an ID filter is being used there is no AOI, and all images pass
         filt = self._local_filter("area_coverage")
         if filt:
             minvalue = filt["config"].get("gte", 0)
             maxvalue = filt["config"].get("lte", 100)
-            return area_coverage >= minvalue and area_coverage <= maxvalue
-        return True
-
-    def _find_item_for_date(self, image):
-        sort_criteria = "acquired"
-        date = iso8601.parse_date(image[PROPERTIES][sort_criteria]).date()
-        itemtype = image[PROPERTIES][ITEM_TYPE]
-        count = self.tree.topLevelItemCount()
-        for i in range(count):
-            child = self.tree.topLevelItem(i)
-            if child.date == date and child.itemtype == itemtype:
-                return child
-        date_item = DateItem(image, sort_criteria)
-        widget = DateItemWidget(image, sort_criteria, date_item)
-        widget.checkedStateChanged.connect(self.checked_count_changed)
-        date_item.setSizeHint(0, widget.sizeHint())
-        self.tree.addTopLevelItem(date_item)
-        self.tree.setItemWidget(date_item, 0, widget)
-        return date_item
-
-    def _find_items_for_satellite(self, image):
-        date_item = self._find_item_for_date(image)
-        date_widget = self.tree.itemWidget(date_item, 0)
-        satellite = image[PROPERTIES][SATELLITE_ID]
-        instrument = image[PROPERTIES].get(INSTRUMENT, "")
-        count = date_item.childCount()
-        for i in range(count):
-            child = date_item.child(i)
-            if child.satellite == satellite:
-                return date_item, child
-        satellite_item = SatelliteItem(satellite)
-        widget = SatelliteItemWidget(satellite, instrument, satellite_item)
-        widget.thumbnailChanged.connect(date_widget.update_thumbnail)
-        widget.checkedStateChanged.connect(self.checked_count_changed)
-        satellite_item.setSizeHint(0, widget.sizeHint())
-        date_item.addChild(satellite_item)
-        self.tree.setItemWidget(satellite_item, 0, widget)
-        return date_item, satellite_item
+            return area_coverage_mask(images, self._request_aoi, minvalue, maxvalue)
+        return [True] * len(images)
 
     def selected_images(self):
-        selected = []
-        it = QTreeWidgetItemIterator(self.tree)
-        while it.value():
-            item = it.value()
-            if isinstance(item, SceneItem):
-                w = self.tree.itemWidget(item, 0)
-                w.set_metadata_to_show(self._metadata_to_show)
-                if w.is_selected():
-                    selected.append(w.image)
-            it += 1
-        return selected
+        return self._model.selected_images()
 
     def checked_count_changed(self):
-        numimages = len(self.selected_images())
+        numimages = self._model.selected_count()
         self.btnAddPreview.setEnabled(numimages)
         self.checkedCountChanged.emit(numimages)
 
     def item_count_changed(self):
-        if self._image_count < self._total_count:
+        if self._page_requested:
+            if self._image_count:
+                self.lblImageCount.setText(
+                    f"{self._image_count}{self._total_count_text()} images."
+                    " Loading more..."
+                )
+            else:
+                self.lblImageCount.setText("Searching...")
+        elif self._has_more or self._prefetched:
             self.lblImageCount.setText(
-                f"{self._image_count} images. <a href='#'>Load more</a>"
+                f"{self._image_count}{self._total_count_text()} images."
+                " <a href='#'>Load more</a>"
             )
         else:
             self.lblImageCount.setText(f"{self._image_count} images")
 
+    def _total_count_text(self):
+        if self._total_count:
+            return f" of {self._total_count}"
+        return ""
+
     def _setup_request_aoi_box(self):
         self._aoi_box = QgsRubberBand(iface.mapCanvas(), QgsWkbTypes.PolygonGeometry)
         self._aoi_box.setFillColor(QColor(0, 0, 0, 0))
@@ -390,8 +620,14 @@ class DailyImagesSearchResultsWidget(RESULTS_BASE, RESULTS_WIDGET):
             self._aoi_box.reset(QgsWkbTypes.PolygonGeometry)
 
     def clean_up(self):
+        self._cancel_task()
+        self._cancel_stats_task()
+        self._prefetched.clear()
+        self._search_count = 0
+        self._page_requested = False
+        self._has_more = False
         self.clear_aoi_box()
-        self.tree.clear()
+        self._clear_results()
         self.lblImageCount.setText("")
         self._set_widgets_visibility(False)
         self.labelNoResults.setText(
@@ -406,405 +642,3 @@ class DailyImagesSearchResultsWidget(RESULTS_BASE, RESULTS_WIDGET):
 
     def request_query(self):
         return self._request
-
-
-class ItemWidgetBase(QFrame):
-
-    checkedStateChanged = pyqtSignal()
-    thumbnailChanged = pyqtSignal()
-
-    def __init__(self, item):
-        QFrame.__init__(self)
-        self.item = item
-        self.is_updating_checkbox = False
-        self.setMouseTracking(True)
-        self.setStyleSheet("ItemWidgetBase{border: 2px solid transparent;}")
-
-    def _setup_ui(self, text, thumbnailurl):
-
-        self.lockLabel = QLabel()
-        iconSize = QSize(16, 16)
-        self.lockLabel.setPixmap(LOCK_ICON.pixmap(iconSize))
-        self.checkBox = QCheckBox("")
-        self.checkBox.clicked.connect(self.check_box_state_changed)
-        self.nameLabel = QLabel(text)
-        self.iconLabel = QLabel()
-        self.labelZoomTo = QLabel()
-        self.labelZoomTo.setPixmap(ZOOMTO_ICON.pixmap(QSize(18, 18)))
-        self.labelZoomTo.setToolTip("Zoom to extent")
-        self.labelZoomTo.mousePressEvent = self.zoom_to_extent
-        self.labelAddPreview = QLabel()
-        self.labelAddPreview.setPixmap(ADD_PREVIEW_ICON.pixmap(QSize(18, 18)))
-        self.labelAddPreview.setToolTip("Add preview layer to map")
-        self.labelAddPreview.mousePressEvent = self._add_preview_clicked
-
-        layout = QHBoxLayout()
-        layout.setMargin(0)
-        layout.addWidget(self.checkBox)
-        layout.addWidget(self.lockLabel)
-        pixmap = QPixmap(PLACEHOLDER_THUMB, "SVG")
-        self.thumbnail = None
-        thumb = pixmap.scaled(48, 48, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        self.iconLabel.setPixmap(thumb)
-        self.iconLabel.setFixedSize(48, 48)
-        layout.addWidget(self.iconLabel)
-        if thumbnailurl is not None:
-            download_thumbnail(thumbnailurl, self)
-        layout.addWidget(self.nameLabel)
-        layout.addStretch()
-        layout.addWidget(self.labelZoomTo)
-        layout.addWidget(self.labelAddPreview)
-        layout.addSpacing(10)
-        self.setLayout(layout)
-
-        self.footprint = QgsRubberBand(iface.mapCanvas(), QgsWkbTypes.PolygonGeometry)
-        self.footprint.setStrokeColor(PLANET_COLOR)
-        self.footprint.setWidth(2)
-
-    def set_thumbnail(self, img):
-        self.thumbnail = QPixmap(img)
-        thumb = self.thumbnail.scaled(
-            48, 48, Qt.KeepAspectRatio, Qt.SmoothTransformation
-        )
-        self.iconLabel.setPixmap(thumb)
-        self.thumbnailChanged.emit()
-
-    def is_selected(self):
-        return self.checkBox.checkState() == Qt.Checked
-
-    def _geom_bbox_in_project_crs(self):
-        transform = QgsCoordinateTransform(
-            QgsCoordinateReferenceSystem("EPSG:4326"),
-            QgsProject.instance().crs(),
-            QgsProject.instance(),
-        )
-        return transform.transformBoundingBox(self.geom.boundingBox())
-
-    def _geom_in_project_crs(self):
-        transform = QgsCoordinateTransform(
-            QgsCoordinateReferenceSystem("EPSG:4326"),
-            QgsProject.instance().crs(),
-            QgsProject.instance(),
-        )
-        geom = QgsGeometry(self.geom)
-        geom.transform(transform)
-        return geom
-
-    def show_footprint(self):
-        self.footprint.setToGeometry(self._geom_in_project_crs())
-
-    def hide_footprint(self):
-        self.footprint.reset(QgsWkbTypes.PolygonGeometry)
-
-    def enterEvent(self, event):
-        self.setStyleSheet("ItemWidgetBase{border: 2px solid rgb(0, 157, 165);}")
-        self.show_footprint()
-
-    def leaveEvent(self, event):
-        self.setStyleSheet("ItemWidgetBase{border: 2px solid transparent;}")
-        self.hide_footprint()
-
-    def zoom_to_extent(self, evt):
-        rect = QgsRectangle(self._geom_bbox_in_project_crs())
-        rect.scale(1.05)
-        iface.mapCanvas().setExtent(rect)
-        iface.mapCanvas().refresh()
-
-    def _add_preview_clicked(self, evt):
-        self.add_preview()
-
-    @waitcursor
-    def add_preview(self):
-        send_analytics_for_preview(self.item.images())
-        create_preview_group(self.name(), self.item.images())
-
-    def check_box_state_changed(self):
-        self.update_children_items()
-        self.update_parent_item()
-        self.checkedStateChanged.emit()
-
-    def update_parent_item(self):
-        parent = self.item.parent()
-        if parent is not None:
-            w = parent.treeWidget().itemWidget(parent, 0)
-            w.update_checkbox()
-
-    def update_children_items(self):
-        total = self.item.childCount()
-        if self.checkBox.isTristate():
-            self.checkBox.setTristate(False)
-            self.checkBox.setChecked(False)
-        for i in range(total):
-            w = self.item.treeWidget().itemWidget(self.item.child(i), 0)
-            w.set_checked(self.checkBox.isChecked())
-
-    def update_checkbox(self):
-        selected = 0
-        total = self.item.childCount()
-        for i in range(total):
-            w = self.item.treeWidget().itemWidget(self.item.child(i), 0)
-            if w.is_selected():
-                selected += 1
-        if selected == total:
-            self.checkBox.setTristate(False)
-            self.checkBox.setCheckState(Qt.Checked)
-        elif selected == 0:
-            self.checkBox.setTristate(False)
-            self.checkBox.setCheckState(Qt.Unchecked)
-        else:
-            self.checkBox.setTristate(True)
-            self.checkBox.setCheckState(Qt.PartiallyChecked)
-
-    def set_checked(self, checked):
-        self.checkBox.setChecked(checked)
-        self.update_children_items()
-
-    def update_thumbnail(self):
-        thumbnails = self.scene_thumbnails()
-        if thumbnails and None not in thumbnails:
-            bboxes = [img[GEOMETRY] for img in self.item.images()]
-            pixmap = createCompoundThumbnail(bboxes, thumbnails)
-            thumb = pixmap.scaled(48, 48, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.iconLabel.setPixmap(thumb)
-            self.thumbnailChanged.emit()
-
-    def scene_thumbnails(self):
-        thumbnails = []
-        try:
-            for i in range(self.item.childCount()):
-                w = self.item.treeWidget().itemWidget(self.item.child(i), 0)
-                thumbnails.extend(w.scene_thumbnails())
-        except RuntimeError:
-            # item might not exist anymore. In this case, we just return
-            # an empty list
-            pass
-        return thumbnails
-
-
-class DateItem(QTreeWidgetItem):
-    def __init__(self, image, sort_criteria):
-        QListWidgetItem.__init__(self)
-        properties = image[PROPERTIES]
-        self.date = iso8601.parse_date(properties[sort_criteria]).date()
-        self.itemtype = properties[ITEM_TYPE]
-
-    def images(self):
-        images = []
-        for i in range(self.childCount()):
-            item = self.child(i)
-            images.extend(item.images())
-        return images
-
-
-class DateItemWidget(ItemWidgetBase):
-    def __init__(self, image, sort_criteria, item):
-        ItemWidgetBase.__init__(self, item)
-        self.has_new = True
-        self.image = image
-        self.properties = image[PROPERTIES]
-        datetime = iso8601.parse_date(self.properties[sort_criteria])
-        self.date = datetime.strftime("%b %d, %Y")
-
-        self._setup_ui("", None)
-        self.update_for_children()
-
-    def update_for_children(self):
-        size = 0
-        for i in range(self.item.childCount()):
-            child = self.item.child(i)
-            size += child.childCount()
-        count_style = (
-            SUBTEXT_STYLE if not self.has_new else SUBTEXT_STYLE_WITH_NEW_CHILDREN
-        )
-        self.children_count = size
-        text = f"""{self.date}<br>
-                    <b>{PlanetClient.getInstance().item_types_names()[self.properties[ITEM_TYPE]]}</b><br>
-                    <span style="{count_style}">{size} images</span>"""
-        self.nameLabel.setText(text)
-
-        geoms = []
-        self.downloadable = False
-        for i in range(self.item.childCount()):
-            child = self.item.child(i)
-            w = self.item.treeWidget().itemWidget(child, 0)
-            geoms.append(w.geom)
-            if w.downloadable:
-                self.downloadable = True
-        self.geom = QgsGeometry.collectGeometry(geoms)
-        self.lockLabel.setVisible(not self.downloadable)
-        self.checkBox.setEnabled(self.downloadable)
-        self.labelAddPreview.setEnabled(self.downloadable)
-
-        nscenes = 0
-        for i in range(self.item.childCount()):
-            nscenes += self.item.child(i).childCount()
-
-        self.setToolTip("")
-        if not self.downloadable:
-            self.labelAddPreview.setToolTip(
-                "Contact sales to purchase access.\nUse the link in the ⓘ menu."
-            )
-            self.setToolTip(
-                "Contact sales to purchase access.\nUse the link in the ⓘ menu."
-            )
-        elif nscenes > CHILD_COUNT_THRESHOLD_FOR_PREVIEW:
-            self.labelAddPreview.setToolTip("Too many images to preview")
-            self.labelAddPreview.setEnabled(False)
-        else:
-            self.labelAddPreview.setToolTip("Add preview layer to map")
-
-        # self._update_thumbnail()
-
-    def name(self):
-        item_types_names = PlanetClient.getInstance().item_types_names()
-        return f"{self.date} | {item_types_names[self.properties[ITEM_TYPE]]}"
-
-
-class SatelliteItem(QTreeWidgetItem):
-    def __init__(self, satellite):
-        QListWidgetItem.__init__(self)
-        self.satellite = satellite
-
-    def images(self):
-        images = []
-        for i in range(self.childCount()):
-            item = self.child(i)
-            images.extend(item.images())
-        return images
-
-
-class SatelliteItemWidget(ItemWidgetBase):
-    def __init__(self, satellite, instrument, item):
-        ItemWidgetBase.__init__(self, item)
-        self.has_new = True
-        self.satellite = satellite
-        self.instrument = instrument
-        self._setup_ui("", None)
-        self.update_for_children()
-
-    def update_for_children(self):
-        size = self.item.childCount()
-        count_style = (
-            SUBTEXT_STYLE if not self.has_new else SUBTEXT_STYLE_WITH_NEW_CHILDREN
-        )
-        self.children_count = size
-        text = f"""<span style="{SUBTEXT_STYLE}"> Satellite {self.satellite} {self.instrument} </span>
-                    <span style="{count_style}">({size} images)</span>"""
-        self.nameLabel.setText(text)
-
-        geoms = []
-        self.ids = []
-        self.downloadable = False
-        for i in range(size):
-            child = self.item.child(i)
-            w = self.item.treeWidget().itemWidget(child, 0)
-            geoms.append(w.geom)
-            if w.downloadable:
-                self.downloadable = True
-            self.ids.append(child.image[ID])
-        self.geom = QgsGeometry.collectGeometry(geoms)
-        self.lockLabel.setVisible(not self.downloadable)
-        self.checkBox.setEnabled(self.downloadable)
-        self.labelAddPreview.setEnabled(self.downloadable)
-
-        if not self.downloadable:
-            self.labelAddPreview.setToolTip("Contact sales to purchase access")
-            self.labelAddPreview.setEnabled(False)
-        elif self.item.childCount() > CHILD_COUNT_THRESHOLD_FOR_PREVIEW:
-            self.labelAddPreview.setToolTip("Too many images to preview")
-            self.labelAddPreview.setEnabled(False)
-        else:
-            self.labelAddPreview.setToolTip("Add preview layer to map")
-
-    def name(self):
-        return f"Satellite {self.satellite}"
-
-
-class SceneItem(QTreeWidgetItem):
-    def __init__(self, image, sort_criteria):
-        QListWidgetItem.__init__(self)
-        self.image = image
-        self.date = iso8601.parse_date(image[PROPERTIES][sort_criteria])
-
-    def __lt__(self, other):
-        if not isinstance(other, SceneItem):
-            return super(SceneItem, self).__lt__(other)
-
-        return self.date < other.date
-
-    def images(self):
-        return [self.image]
-
-
-class SceneItemWidget(ItemWidgetBase):
-    def __init__(self, image, sort_criteria, metadata_to_show, item, request):
-        ItemWidgetBase.__init__(self, item)
-        self.image = image
-        self.request = request
-        self.metadata_to_show = metadata_to_show
-        self.properties = image[PROPERTIES]
-
-        datetime = iso8601.parse_date(self.properties[sort_criteria])
-        self.time = datetime.strftime("%H:%M:%S")
-        self.date = datetime.strftime("%b %d, %Y")
-
-        text = self._get_text()
-        url = f"{image['_links']['thumbnail']}?api_key={PlanetClient.getInstance().api_key()}"
-
-        self._setup_ui(text, url)
-
-        permissions = image[PERMISSIONS]
-        if len(permissions) == 0:
-            self.downloadable = False
-        else:
-            matches = [ITEM_ASSET_DL_REGEX.match(s) is not None for s in permissions]
-            self.downloadable = any(matches)
-
-        self.lockLabel.setVisible(not self.downloadable)
-        self.checkBox.setEnabled(self.downloadable)
-        self.geom = qgsgeometry_from_geojson(image[GEOMETRY])
-
-        if not self.downloadable:
-            self.labelAddPreview.setToolTip("Contact sales to purchase access")
-            self.labelAddPreview.setEnabled(False)
-
-    def set_metadata_to_show(self, metadata_to_show):
-        self.metadata_to_show = metadata_to_show
-        self.update_text()
-
-    def update_text(self):
-        self.nameLabel.setText(self._get_text())
-
-    def _get_text(self):
-        metadata = ""
-        for i, value in enumerate(self.metadata_to_show):
-            spacer = "<br>" if i == 1 else " "
-            if value == PlanetNodeMetadata.AREA_COVER:
-                area_coverage = area_coverage_for_image(self.image, self.request)
-                if area_coverage is not None:
-                    metadata += f"{value.value}:{area_coverage:.0f}{spacer}"
-                else:
-                    metadata += f"{value.value}:--{spacer}"
-            else:
-                metadata += (
-                    f'{value.value}:{self.properties.get(value.value, "--")}{spacer}'
-                )
-        text = f"""{self.date}<span style="color: rgb(100,100,100);"> {self.time} UTC</span><br>
-                        <b>{PlanetClient.getInstance().item_types_names()[self.properties[ITEM_TYPE]]}</b><br>
-                        <span style="{SUBTEXT_STYLE}">{metadata}</span>
-                    """
-
-        return text
-
-    def name(self):
-        return (
-            f"{self.date} {self.time} |"
-            f" {PlanetClient.getInstance().item_types_names()[self.properties[ITEM_TYPE]]}"
-        )
-
-    def scene_thumbnails(self):
-        return [self.thumbnail]
-
-    def set_checked(self, checked):
-        if self.downloadable:
-            self.checkBox.setChecked(checked)
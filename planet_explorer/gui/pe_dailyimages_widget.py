@@ -40,6 +40,7 @@ from ..pe_analytics import (
 
 from ..pe_utils import add_menu_section_action
 from ..planet_api import PlanetClient
+from ..planet_api.p_search_cache import request_key
 from .pe_dailyimages_search_results_widget import DailyImagesSearchResultsWidget
 from .pe_filters import PlanetDailyFilter, PlanetAOIFilter, filters_from_request
 from .pe_orders import PlanetOrdersDialog
@@ -107,6 +108,10 @@ class DailyImagesWidget(BASE, WIDGET):
         self._request = None
         self.legacy_request = None
         self.current_saved_search = None
+        # Key of the request the filters of the current saved search make up
+        self._saved_search_key = None
+        self._loading_saved_search = False
+        self._incremental_search = False
 
         self.btnOrder.clicked.connect(self.order_checked)
         self._setup_actions_button()
@@ -129,7 +134,17 @@ class DailyImagesWidget(BASE, WIDGET):
                 if "item_types" in saved_search_request:
                     request["item_types"] = saved_search_request["item_types"]
                 self.current_saved_search = saved_search_request
-            self.set_filters_from_request(request)
+                self._incremental_search = dlg.incremental
+            self._loading_saved_search = True
+            try:
+                self.set_filters_from_request(request)
+            finally:
+                self._loading_saved_search = False
+            if self.current_saved_search is not None:
+                self._collect_sources_filters()
+                self._saved_search_key = request_key(
+                    build_search_request(self._filters, self._sources)
+                )
             self.perform_search()
             self._aoi_filter.zoom_to_aoi()
 
@@ -257,7 +272,20 @@ class DailyImagesWidget(BASE, WIDGET):
 
         self._request = search_request
 
-        self.searchResultsWidget.update_request(search_request, self.local_filters)
+        # Results stored for a saved search are only used and updated while
+        # its filters are left as they were loaded
+        saved_search = None
+        if (
+            self.current_saved_search is not None
+            and self.current_saved_search.get("id") is not None
+            and request_key(search_request) == self._saved_search_key
+        ):
+            saved_search = self.current_saved_search
+        # Only the run right after loading a saved search is incremental
+        incremental, self._incremental_search = self._incremental_search, False
+        self.searchResultsWidget.update_request(
+            search_request, self.local_filters, saved_search, incremental
+        )
 
     def _setup_aoi_filter(self):
         self._aoi_filter = PlanetAOIFilter(
@@ -314,6 +342,9 @@ class DailyImagesWidget(BASE, WIDGET):
         self._daily_filters_widget.hide_legacy_search_elements()
         self.frameWarningLegacySearch.setVisible(False)
         self.legacy_request = None
+        if not self._loading_saved_search:
+            self.current_saved_search = None
+            self._saved_search_key = None
         log.debug("Filters have changed")
 
     @pyqtSlot(dict)
@@ -40,7 +40,6 @@ from qgis.core import (
     Qgis,
     QgsApplication,
     QgsCoordinateReferenceSystem,
-    QgsCoordinateTransform,
     QgsCsException,
     QgsDistanceArea,
     QgsGeometry,
@@ -71,8 +70,12 @@ from qgis.PyQt.QtWidgets import (
 )
 
 from ..pe_utils import (
+    EPSG_4326,
     MAIN_AOI_COLOR,
+    coordinate_transform,
     qgsgeometry_from_geojson,
+    transform_from_project,
+    transform_to_project,
     zoom_canvas_to_aoi,
     iface,
 )
@@ -603,6 +606,7 @@ class PlanetAOIFilter(AOI_FILTER_BASE, AOI_FILTER_WIDGET, PlanetFilterMixin):
         """
         multipart_polygon = None
         for layer in layers:
+            transform = coordinate_transform(layer.crs(), EPSG_4326)
             features = layer.getFeatures()
             # Creates the multipart polygon which will be used for the searches
             for feature in features:
@@ -615,12 +619,6 @@ class PlanetAOIFilter(AOI_FILTER_BASE, AOI_FILTER_WIDGET, PlanetFilterMixin):
                 elif not geom.isGeosValid():
                     continue
 
-                transform = QgsCoordinateTransform(
-                    layer.crs(),
-                    QgsCoordinateReferenceSystem("EPSG:4326"),
-                    QgsProject.instance(),
-                )
-
                 try:
                     geom.transform(transform)
                 except QgsCsException:
@@ -660,6 +658,7 @@ class PlanetAOIFilter(AOI_FILTER_BASE, AOI_FILTER_WIDGET, PlanetFilterMixin):
         """
         multipart_polygon = None
         for layer in layers:
+            transform = coordinate_transform(layer.crs(), EPSG_4326)
             features = layer.getFeatures()
             # Creates the multipart polygon which will be used for the searches
             for feature in features:
@@ -672,12 +671,6 @@ class PlanetAOIFilter(AOI_FILTER_BASE, AOI_FILTER_WIDGET, PlanetFilterMixin):
                 elif not geom.isGeosValid():
                     continue
 
-                transform = QgsCoordinateTransform(
-                    layer.crs(),
-                    QgsCoordinateReferenceSystem("EPSG:4326"),
-                    QgsProject.instance(),
-                )
-
                 try:
                     geom.transform(transform)
                 except QgsCsException:
@@ -719,11 +712,7 @@ class PlanetAOIFilter(AOI_FILTER_BASE, AOI_FILTER_WIDGET, PlanetFilterMixin):
     def aoi_from_current_extent(self):
         """Return current map extent as geojson transformed to EPSG:4326"""
         canvas = iface.mapCanvas()
-        transform = QgsCoordinateTransform(
-            QgsProject.instance().crs(),
-            QgsCoordinateReferenceSystem("EPSG:4326"),
-            QgsProject.instance(),
-        )
+        transform = transform_from_project(EPSG_4326)
 
         canvas_extent: QgsRectangle = canvas.extent()
         try:
@@ -757,11 +746,7 @@ class PlanetAOIFilter(AOI_FILTER_BASE, AOI_FILTER_WIDGET, PlanetFilterMixin):
             log.debug("Active map layer invalid, skipping AOI extent")
             return
 
-        transform = QgsCoordinateTransform(
-            map_layer.crs(),
-            QgsCoordinateReferenceSystem("EPSG:4326"),
-            QgsProject.instance(),
-        )
+        transform = coordinate_transform(map_layer.crs(), EPSG_4326)
 
         ml_extent: QgsRectangle = map_layer.extent()
         try:
@@ -786,11 +771,7 @@ class PlanetAOIFilter(AOI_FILTER_BASE, AOI_FILTER_WIDGET, PlanetFilterMixin):
         """Return full data map extent as geojson transformed to EPSG:4326"""
         canvas = iface.mapCanvas()
 
-        transform = QgsCoordinateTransform(
-            QgsProject.instance().crs(),
-            QgsCoordinateReferenceSystem("EPSG:4326"),
-            QgsProject.instance(),
-        )
+        transform = transform_from_project(EPSG_4326)
 
         canvas_extent: QgsRectangle = canvas.fullExtent()
         if canvas_extent.isNull():  # Canvas not yet initialized
@@ -839,11 +820,7 @@ class PlanetAOIFilter(AOI_FILTER_BASE, AOI_FILTER_WIDGET, PlanetFilterMixin):
 
     @pyqtSlot(object)
     def set_draw_aoi(self, aoi):
-        transform = QgsCoordinateTransform(
-            QgsProject.instance().crs(),
-            QgsCoordinateReferenceSystem("EPSG:4326"),
-            QgsProject.instance(),
-        )
+        transform = transform_from_project(EPSG_4326)
 
         aoi_json = None
 
@@ -902,16 +879,11 @@ class PlanetAOIFilter(AOI_FILTER_BASE, AOI_FILTER_WIDGET, PlanetFilterMixin):
                 features = layer.selectedFeatures()
 
             # Creates the multipart polygon which will be used for the searches
+            transform = coordinate_transform(layer.crs(), EPSG_4326)
             multipart_polygon = None
             for feature in features:
                 geom = feature.geometry()
 
-                transform = QgsCoordinateTransform(
-                    layer.crs(),
-                    QgsCoordinateReferenceSystem("EPSG:4326"),
-                    QgsProject.instance(),
-                )
-
                 try:
                     geom.transform(transform)
                 except QgsCsException:
@@ -958,17 +930,9 @@ class PlanetAOIFilter(AOI_FILTER_BASE, AOI_FILTER_WIDGET, PlanetFilterMixin):
             # Deselect all features for the case when the user had no features selected
             layer.removeSelection()
 
-        trans_layer = QgsCoordinateTransform(
-            layer.sourceCrs(),
-            QgsCoordinateReferenceSystem("EPSG:4326"),
-            QgsProject.instance(),
-        )
+        trans_layer = coordinate_transform(layer.sourceCrs(), EPSG_4326)
 
-        trans_canvas = QgsCoordinateTransform(
-            QgsCoordinateReferenceSystem("EPSG:4326"),
-            QgsProject.instance().crs(),
-            QgsProject.instance(),
-        )
+        trans_canvas = transform_to_project(EPSG_4326)
 
         transform_bbox = trans_layer.transformBoundingBox(bbox)
         geom_bbox = QgsGeometry.fromRect(transform_bbox)
@@ -999,11 +963,7 @@ class PlanetAOIFilter(AOI_FILTER_BASE, AOI_FILTER_WIDGET, PlanetFilterMixin):
             return self._aoi_box.asGeometry()
 
     def aoi_as_4326_geom(self):
-        transform = QgsCoordinateTransform(
-            QgsProject.instance().crs(),
-            QgsCoordinateReferenceSystem("EPSG:4326"),
-            QgsProject.instance(),
-        )
+        transform = transform_from_project(EPSG_4326)
         geom = self.aoi_geom()
         if geom is not None:
             geom.transform(transform)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+    pe_footprints_item.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 Planet Inc, https://planet.com
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+__author__ = "Planet Federal"
+__date__ = "October 2026"
+__copyright__ = "(C) 2026 Planet Inc, https://planet.com"
+
+# This will get replaced with a git SHA1 when you do a git archive
+__revision__ = "$Format:%H$"
+
+import logging
+import os
+
+import numpy as np
+from qgis.core import QgsPointXY, QgsRectangle
+from qgis.gui import QgsMapCanvasItem
+from qgis.PyQt.QtCore import QPointF, QRectF, Qt
+from qgis.PyQt.QtGui import QBrush, QPen, QPolygonF
+
+LOG_LEVEL = os.environ.get("PYTHON_LOG_LEVEL", "WARNING").upper()
+logging.basicConfig(level=LOG_LEVEL)
+log = logging.getLogger(__name__)
+
+FOOTPRINTS_Z_VALUE = 100
+
+
+class FootprintsCanvasItem(QgsMapCanvasItem):
+    """
+    Draws many rectangular footprints as a single map canvas item.
+
+    Footprints are kept as a packed array of [xmin, ymin, xmax, ymax]
+    extents in the canvas CRS, and identified by their position in it.
+    Checking or highlighting a footprint just flags it and schedules a
+    repaint, in which only the footprints within the visible extent are
+    drawn.
+    """
+
+    def __init__(self, canvas, color, highlight_color, width=2):
+        super().__init__(canvas)
+        self.color = color
+        self.highlight_color = highlight_color
+        self.width = width
+        self.extents = np.zeros((0, 4))
+        self.checked = np.zeros(0, dtype=bool)
+        self.highlighted = None
+        self.setZValue(FOOTPRINTS_Z_VALUE)
+
+    def set_extents(self, extents):
+        """
+        Replaces the footprints drawn, all unchecked
+
+        :type extents: numpy.ndarray
+        """
+        self.prepareGeometryChange()
+        self.extents = np.asarray(extents, dtype=float).reshape(-1, 4)
+        self.checked = np.zeros(len(self.extents), dtype=bool)
+        self.highlighted = None
+        valid = self.extents[~np.isnan(self.extents).any(axis=1)]
+        if len(valid):
+            xmin, ymin = valid[:, :2].min(axis=0)
+            xmax, ymax = valid[:, 2:].max(axis=0)
+            self.setRect(QgsRectangle(xmin, ymin, xmax, ymax))
+        else:
+            self.setRect(QgsRectangle())
+        self.update()
+
+    def clear(self):
+        self.set_extents(np.zeros((0, 4)))
+
+    def set_checked(self, indices, checked):
+        """Flags a footprint, or an array of them, as checked or not"""
+        self.checked[indices] = checked
+        self.update()
+
+    def set_highlighted(self, index):
+        """Highlights a footprint, or none if index is None"""
+        if self.highlighted != index:
+            self.highlighted = index
+            self.update()
+
+    def boundingRect(self):
+        # Room for the outlines of the footprints along the item borders
+        return (
+            super()
+            .boundingRect()
+            .adjusted(-self.width, -self.width, self.width, self.width)
+        )
+
+    def _item_coordinates(self, extents):
+        """
+        Returns the corners of extents in item coordinates, as an array with
+        shape (N, 4, 2). The map to item transform is affine, so it is
+        derived from three points and applied to all corners at once, which
+        also holds for rotated canvases.
+        """
+        center = self.rect().center()
+        origin = self.toCanvasCoordinates(center) - self.pos()
+        unit_x = self.toCanvasCoordinates(QgsPointXY(center.x() + 1, center.y()))
+        unit_y = self.toCanvasCoordinates(QgsPointXY(center.x(), center.y() + 1))
+        unit_x -= self.pos()
+        unit_y -= self.pos()
+        matrix = np.array(
+            [
+                [unit_x.x() - origin.x(), unit_x.y() - origin.y()],
+                [unit_y.x() - origin.x(), unit_y.y() - origin.y()],
+            ]
+        )
+        corners = extents[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape(-1, 4, 2)
+        corners = corners - [center.x(), center.y()]
+        return corners @ matrix + [origin.x(), origin.y()]
+
+    def _visible(self):
+        extent = self.mapCanvas().extent()
+        return (
+            (self.extents[:, 0] <= extent.xMaximum())
+            & (self.extents[:, 2] >= extent.xMinimum())
+            & (self.extents[:, 1] <= extent.yMaximum())
+            & (self.extents[:, 3] >= extent.yMinimum())
+        )
+
+    def _draw(self, painter, corners):
+        if self.mapCanvas().rotation() == 0:
+            rects = [QRectF(QPointF(*c[3]), QPointF(*c[1])) for c in corners.tolist()]
+            painter.drawRects(rects)
+        else:
+            for c in corners.tolist():
+                painter.drawPolygon(QPolygonF([QPointF(*p) for p in c]))
+
+    def paint(self, painter, option=None, widget=None):
+        if not len(self.extents):
+            return
+        visible = self._visible()
+        if not visible.any():
+            return
+        corners = self._item_coordinates(self.extents[visible])
+
+        painter.setPen(QPen(self.color, self.width))
+        painter.setBrush(Qt.NoBrush)
+        self._draw(painter, corners)
+
+        checked = self.checked[visible]
+        if checked.any():
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QBrush(self.color, Qt.BDiagPattern))
+            self._draw(painter, corners[checked])
+
+        if self.highlighted is not None and visible[self.highlighted]:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QBrush(self.highlight_color, Qt.SolidPattern))
+            highlighted = np.flatnonzero(np.flatnonzero(visible) == self.highlighted)
+            self._draw(painter, corners[highlighted])
@@ -7,7 +7,7 @@ from .pe_legacy_warning_dialog import LegacyWarningDialog
 from .pe_gui_utils import waitcursor
 from ..pe_analytics import analytics_track, SAVED_SEARCH_ACCESSED
 from ..planet_api import PlanetClient
-from ..pe_utils import iface
+from ..pe_utils import iface, saved_search_history
 
 from qgis.PyQt.QtCore import QDateTime, Qt
 
@@ -27,6 +27,7 @@ class OpenSavedSearchDialog(BASE, WIDGET):
     def __init__(self):
         super(OpenSavedSearchDialog, self).__init__(iface.mainWindow())
         self.saved_search = None
+        self.incremental = False
         self.setupUi(self)
 
         self.bar = QgsMessageBar()
@@ -61,6 +62,7 @@ class OpenSavedSearchDialog(BASE, WIDGET):
         else:
             self.txtFilters.setPlainText("")
             self.labelDateRange.setText("---")
+            self.update_incremental_option(None)
 
     def delete_search(self):
         request = self.comboSavedSearch.currentData()
@@ -133,6 +135,19 @@ class OpenSavedSearchDialog(BASE, WIDGET):
             self.labelDateRange.setText(" / ".join(tokens))
         self.txtFilters.setPlainText(filters_as_text_from_request(request))
         self.check_for_legacy_request(request)
+        self.update_incremental_option(request)
+
+    def update_incremental_option(self, request):
+        published = None
+        if request and not self.check_for_legacy_request(request):
+            published = saved_search_history().last_published(request)
+        self.chkIncremental.setEnabled(published is not None)
+        if published is not None:
+            date = QDateTime.fromString(published, Qt.ISODate).toString()
+            self.chkIncremental.setToolTip(f"Last published image found: {date}")
+        else:
+            self.chkIncremental.setChecked(False)
+            self.chkIncremental.setToolTip("The search has not been run yet")
 
     def loadSearch(self):
         request = self.comboSavedSearch.currentData()
@@ -146,6 +161,7 @@ class OpenSavedSearchDialog(BASE, WIDGET):
                     self.saved_search = request
             else:
                 self.saved_search = request
+                self.incremental = self.chkIncremental.isChecked()
             self.accept()
         else:
             self.bar.pushMessage(
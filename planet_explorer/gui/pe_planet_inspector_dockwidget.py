@@ -32,10 +32,7 @@ from planet.api.models import Mosaics
 from qgis.PyQt.QtNetwork import QNetworkAccessManager, QNetworkRequest
 
 from qgis.core import (
-    QgsCoordinateReferenceSystem,
-    QgsCoordinateTransform,
     QgsGeometry,
-    QgsProject,
     QgsRectangle,
     QgsWkbTypes,
 )
@@ -61,10 +58,12 @@ from ..pe_analytics import (
 )
 
 from ..pe_utils import (
+    EPSG_4326,
     PLANET_COLOR,
     add_menu_section_action,
+    coordinate_transform,
     iface,
-    qgsgeometry_from_geojson,
+    qgsgeometry_for_image,
 )
 from ..planet_api import PlanetClient
 from .pe_gui_utils import waitcursor
@@ -149,9 +148,7 @@ class PlanetInspectorDockWidget(ORDERS_MONITOR_BASE, ORDERS_MONITOR_WIDGET):
     def _populate_scenes_from_point(self, point):
         self.listScenes.clear()
         canvasCrs = iface.mapCanvas().mapSettings().destinationCrs()
-        transform = QgsCoordinateTransform(
-            canvasCrs, QgsCoordinateReferenceSystem(4326), QgsProject.instance()
-        )
+        transform = coordinate_transform(canvasCrs, EPSG_4326)
         wgspoint = transform.transform(point)
         mosaicname = self._mosaic_name_from_current_layer()
         if mosaicname:
@@ -317,7 +314,7 @@ class SceneItemWidget(QFrame):
         self.footprint.setStrokeColor(PLANET_COLOR)
         self.footprint.setWidth(2)
 
-        self.geom = qgsgeometry_from_geojson(scene[GEOMETRY])
+        self.geom = qgsgeometry_for_image(scene)
 
         self.setStyleSheet("SceneItemWidget{border: 2px solid transparent;}")
 
@@ -343,9 +340,7 @@ class SceneItemWidget(QFrame):
     def zoom_to_extent(self):
         rect = QgsRectangle(self.geom.boundingBox())
         canvasCrs = iface.mapCanvas().mapSettings().destinationCrs()
-        transform = QgsCoordinateTransform(
-            QgsCoordinateReferenceSystem(4326), canvasCrs, QgsProject.instance()
-        )
+        transform = coordinate_transform(EPSG_4326, canvasCrs)
         newrect = transform.transform(rect)
         newrect.scale(1.05)
         iface.mapCanvas().setExtent(newrect)
@@ -361,9 +356,7 @@ class SceneItemWidget(QFrame):
     def show_footprint(self):
         rect = QgsRectangle(self.geom.boundingBox())
         canvasCrs = iface.mapCanvas().mapSettings().destinationCrs()
-        transform = QgsCoordinateTransform(
-            QgsCoordinateReferenceSystem(4326), canvasCrs, QgsProject.instance()
-        )
+        transform = coordinate_transform(EPSG_4326, canvasCrs)
         newrect = transform.transform(rect)
         self.footprint.setToGeometry(QgsGeometry.fromRect(newrect))
 
@@ -21,34 +21,42 @@ __copyright__ = "(C) 2020 Planet Inc, https://planet.com"
 # This will get replaced with a git SHA1 when you do a git archive
 __revision__ = "$Format:%H$"
 
-from collections import defaultdict
-
-from qgis.PyQt import QtCore
-from qgis.PyQt.QtCore import Qt, pyqtSignal
-from qgis.PyQt.QtGui import QPixmap
+import numpy as np
+from qgis.core import QgsProject
+from qgis.PyQt.QtCore import (
+    QAbstractItemModel,
+    QEvent,
+    QModelIndex,
+    QObject,
+    QPersistentModelIndex,
+    QRect,
+    QRectF,
+    QSize,
+    Qt,
+    pyqtSignal,
+)
+from qgis.PyQt.QtGui import QColor, QPainter, QPen, QPixmap, QTextDocument
 from qgis.PyQt.QtWidgets import (
-    QCheckBox,
-    QFrame,
-    QHBoxLayout,
-    QLabel,
-    QTreeWidget,
-    QTreeWidgetItem,
-    QVBoxLayout,
-    QWidget,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionButton,
+    QTreeView,
 )
-from qgis.core import QgsGeometry, QgsWkbTypes
-from qgis.gui import QgsRubberBand
 
 from ..pe_utils import (
+    EPSG_4326,
     LINKS,
     NAME,
     QUADS_AOI_BODY_COLOR,
     QUADS_AOI_COLOR,
     iface,
     mosaic_title,
-    qgsrectangle_for_canvas_from_4326_bbox_coords,
+    transform_bboxes,
 )
-from .pe_thumbnails import download_thumbnail
+from ..planet_api.p_bbox_index import BBoxIndex
+from .pe_aoi_maptools import PlanetFootprintsMapTool
+from .pe_footprints_item import FootprintsCanvasItem
+from .pe_thumbnails import cancel_thumbnail_downloads, download_thumbnail
 
 ID = "id"
 THUMBNAIL = "thumbnail"
@@ -56,286 +64,489 @@ PERCENT_COVERED = "percent_covered"
 BBOX = "bbox"
 
 PLACEHOLDER_THUMB = ":/plugins/planet_explorer/thumb-placeholder-128.svg"
+HOVER_COLOR = QColor(157, 165, 0)
+
+QUAD_ROW_HEIGHT = 56
+GROUP_ROW_HEIGHT = 28
+THUMBNAIL_SIZE = 48
+CHECKBOX_SIZE = 16
+SPACING = 6
+
+
+def footprint_extents(quads):
+    """
+    Returns the extents of quads in the project CRS, all transformed at once
+    """
+    return transform_bboxes(
+        [quad[BBOX] for quad in quads], EPSG_4326, QgsProject.instance().crs()
+    )
+
+
+class QuadsGroupNode:
+    """Top level row of the quads tree: a basemap, or a quad of many basemaps"""
 
+    __slots__ = ("parent", "row", "children", "text", "checked_count")
 
-class QuadsTreeWidget(QTreeWidget):
+    def __init__(self, parent, row, text):
+        self.parent = parent
+        self.row = row
+        self.children = []
+        self.text = text
+        self.checked_count = 0
+
+    def check_state(self):
+        if not self.checked_count:
+            return Qt.Unchecked
+        if self.checked_count == len(self.children):
+            return Qt.Checked
+        return Qt.PartiallyChecked
+
+
+class QuadNode:
+    """
+    Quad instance row of the quads tree. The quad is identified by its
+    position in the list of quads of the model.
+    """
+
+    __slots__ = ("parent", "row", "children", "index", "thumbnail", "requested")
+
+    def __init__(self, parent, row, index):
+        self.parent = parent
+        self.row = row
+        self.children = []
+        self.index = index
+        self.thumbnail = None
+        self.requested = False
+
+
+class QuadsTreeModel(QAbstractItemModel):
+    """
+    Model for the quads of the basemaps to order, grouped by basemap or by
+    quad.
+
+    Quads are kept in a flat list, basemap after basemap, with their check
+    state in a parallel array. Rows are plain Python objects, only drawn
+    when visible, and their thumbnails are requested the first time they are
+    drawn, so thousands of quads cost nothing until their group is expanded.
+    """
+
+    checkStateChanged = pyqtSignal()
+
+    def __init__(self, footprints, parent=None):
+        super().__init__(parent)
+        self.footprints = footprints
+        self.clear_quads()
+
+    def clear_quads(self):
+        self.root = QuadsGroupNode(None, 0, "")
+        self.quads = []
+        # Basemap name -> range of its quads in the list of quads
+        self.mosaics = {}
+        self.checked = np.zeros(0, dtype=bool)
+        # QuadNode of each quad
+        self._nodes = []
+
+    def clear(self):
+        self.beginResetModel()
+        self.clear_quads()
+        self.endResetModel()
+
+    def set_quads(self, mosaics, quads, group_by_quad=False):
+        """
+        Replaces the quads of the model, all unchecked
+
+        :param mosaics: Basemaps
+        :param quads: List of quads of each basemap
+        :param group_by_quad: Whether to group the instances of each quad in
+            the different basemaps, instead of the quads of each basemap
+        """
+        self.beginResetModel()
+        self.clear_quads()
+        groups = {}
+        for mosaic, mosaicquads in zip(mosaics, quads):
+            start = len(self.quads)
+            self.quads.extend(mosaicquads)
+            self.mosaics[mosaic.get(NAME)] = range(start, len(self.quads))
+            if not group_by_quad:
+                groups[mosaic.get(NAME)] = mosaic_title(mosaic)
+        self.checked = np.zeros(len(self.quads), dtype=bool)
+        self._nodes = [None] * len(self.quads)
+        nodes = {}
+        for name, text in groups.items():
+            nodes[name] = self._group(text)
+        for name, indices in self.mosaics.items():
+            for index in indices:
+                key = self.quads[index][ID] if group_by_quad else name
+                group = nodes.get(key)
+                if group is None:
+                    group = nodes[key] = self._group(key)
+                node = QuadNode(group, len(group.children), index)
+                group.children.append(node)
+                self._nodes[index] = node
+        self.endResetModel()
+
+    def _group(self, text):
+        group = QuadsGroupNode(self.root, len(self.root.children), text)
+        self.root.children.append(group)
+        return group
+
+    def node(self, index):
+        if index.isValid():
+            return index.internalPointer()
+        return self.root
+
+    def index_for_node(self, node):
+        if node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        return self.createIndex(row, column, self.node(parent).children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self.index_for_node(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if isinstance(node, QuadsGroupNode):
+            if role == Qt.DisplayRole:
+                return (
+                    f"<b>{node.text} - {node.checked_count} of "
+                    f"{len(node.children)} selected</b>"
+                )
+            elif role == Qt.CheckStateRole:
+                return node.check_state()
+            return None
+        quad = self.quads[node.index]
+        if role == Qt.DisplayRole:
+            covered = quad.get(PERCENT_COVERED)
+            coverage = "coverage unknown" if covered is None else f"{covered} % covered"
+            return (
+                f'<b>{quad[ID]}</b><br><span style="color:grey;">' f"{coverage}</span>"
+            )
+        elif role == Qt.CheckStateRole:
+            return Qt.Checked if self.checked[node.index] else Qt.Unchecked
+        elif role == Qt.DecorationRole:
+            return node.thumbnail
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        node = index.internalPointer()
+        if isinstance(node, QuadsGroupNode):
+            # Clicking a partially checked group unchecks all of its quads
+            checked = value == Qt.Checked and node.checked_count == 0
+            self.set_checked([child.index for child in node.children], checked)
+        else:
+            self.set_checked([node.index], value == Qt.Checked)
+        return True
+
+    def set_checked(self, indices, checked):
+        """Checks or unchecks quads, given their positions in the list"""
+        indices = np.asarray(indices, dtype=np.int64)
+        changed = indices[self.checked[indices] != checked]
+        if not len(changed):
+            return
+        self.checked[changed] = checked
+        self.footprints.set_checked(changed, checked)
+        groups = {}
+        for index in changed.tolist():
+            group = self._nodes[index].parent
+            group.checked_count += 1 if checked else -1
+            groups[group] = None
+        for group in groups:
+            first = self.index_for_node(group.children[0])
+            last = self.index_for_node(group.children[-1])
+            self.dataChanged.emit(first, last, [Qt.CheckStateRole])
+            self._emit_changed(group)
+        self.checkStateChanged.emit()
+
+    def _emit_changed(self, node, roles=None):
+        index = self.index_for_node(node)
+        self.dataChanged.emit(index, index, roles or [])
+
+    def selected_quads(self):
+        return [self.quads[i] for i in np.flatnonzero(self.checked)]
+
+    def selected_quads_classified(self):
+        return {
+            name: [self.quads[i] for i in indices if self.checked[i]]
+            for name, indices in self.mosaics.items()
+        }
+
+    def request_thumbnail(self, index, view):
+        node = self.node(index)
+        if not isinstance(node, QuadNode) or node.requested:
+            return
+        node.requested = True
+        loader = QuadThumbnailLoader(self, node, view, index)
+        download_thumbnail(self.quads[node.index][LINKS][THUMBNAIL], loader)
+
+    def set_thumbnail(self, node, img):
+        node.thumbnail = img
+        self._emit_changed(node, [Qt.DecorationRole])
+
+
+class QuadThumbnailLoader(QObject):
+    """
+    Receives the thumbnail of a quad on behalf of the quads view, and tells
+    the thumbnail manager whether the row it is drawn in is visible.
+    """
+
+    def __init__(self, model, node, view, index):
+        super().__init__(view)
+        self.model = model
+        self.node = node
+        self.view = view
+        self.index = QPersistentModelIndex(index)
+
+    def thumbnail_visible(self):
+        if not self.index.isValid() or not self.view.isVisible():
+            return False
+        rect = self.view.visualRect(QModelIndex(self.index))
+        return rect.isValid() and rect.intersects(self.view.viewport().rect())
+
+    def set_thumbnail(self, img):
+        # The index is no longer valid if the quads were cleared meanwhile
+        if self.index.isValid():
+            self.model.set_thumbnail(self.node, img)
+        self.deleteLater()
+
+
+class QuadsTreeDelegate(QStyledItemDelegate):
+    """
+    Paints the rows of the quads tree: checkbox, thumbnail for quads, and
+    description.
+    """
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.placeholder = (
+            QPixmap(PLACEHOLDER_THUMB, "SVG")
+            .scaled(
+                THUMBNAIL_SIZE,
+                THUMBNAIL_SIZE,
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation,
+            )
+            .toImage()
+        )
+        self.document = QTextDocument()
+
+    def _layout(self, rect, node):
+        rects = {}
+        x = rect.left() + 4
+        center = rect.center().y()
+        rects["checkbox"] = QRect(
+            x, center - CHECKBOX_SIZE // 2, CHECKBOX_SIZE, CHECKBOX_SIZE
+        )
+        x += CHECKBOX_SIZE + SPACING
+        if isinstance(node, QuadNode):
+            rects["thumbnail"] = QRect(
+                x, center - THUMBNAIL_SIZE // 2, THUMBNAIL_SIZE, THUMBNAIL_SIZE
+            )
+            x += THUMBNAIL_SIZE + SPACING
+        rects["text"] = QRect(x, rect.top(), max(0, rect.right() - x), rect.height())
+        return rects
+
+    def sizeHint(self, option, index):
+        node = index.model().node(index)
+        height = QUAD_ROW_HEIGHT if isinstance(node, QuadNode) else GROUP_ROW_HEIGHT
+        return QSize(option.rect.width(), height)
+
+    def paint(self, painter, option, index):
+        model = index.model()
+        node = model.node(index)
+        model.request_thumbnail(index, self.view)
+        style = self.view.style()
+        painter.save()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, self.view)
+        if option.state & QStyle.State_MouseOver and isinstance(node, QuadNode):
+            painter.setPen(QPen(HOVER_COLOR, 2))
+            painter.drawRect(option.rect.adjusted(1, 1, -1, -1))
+
+        rects = self._layout(option.rect, node)
+        checkbox = QStyleOptionButton()
+        checkbox.rect = rects["checkbox"]
+        checkbox.state = QStyle.State_Enabled | {
+            Qt.Checked: QStyle.State_On,
+            Qt.PartiallyChecked: QStyle.State_NoChange,
+        }.get(index.data(Qt.CheckStateRole), QStyle.State_Off)
+        style.drawPrimitive(QStyle.PE_IndicatorCheckBox, checkbox, painter, self.view)
+
+        if "thumbnail" in rects:
+            thumbnail = node.thumbnail
+            if thumbnail is None or thumbnail.isNull():
+                thumbnail = self.placeholder
+            size = thumbnail.size().scaled(
+                THUMBNAIL_SIZE, THUMBNAIL_SIZE, Qt.KeepAspectRatio
+            )
+            target = QRect(0, 0, size.width(), size.height())
+            target.moveCenter(rects["thumbnail"].center())
+            painter.drawImage(target, thumbnail)
+
+        text_rect = rects["text"]
+        self.document.setHtml(index.data(Qt.DisplayRole))
+        self.document.setTextWidth(text_rect.width())
+        top = text_rect.top() + (text_rect.height() - self.document.size().height()) / 2
+        painter.translate(text_rect.left(), top)
+        self.document.drawContents(
+            painter, QRectF(0, 0, text_rect.width(), text_rect.height())
+        )
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseButtonRelease, QEvent.MouseButtonPress):
+            return False
+        if event.button() != Qt.LeftButton:
+            return False
+        rects = self._layout(option.rect, model.node(index))
+        if rects["checkbox"].contains(event.pos()):
+            if event.type() == QEvent.MouseButtonRelease:
+                checked = index.data(Qt.CheckStateRole) == Qt.Checked
+                state = Qt.Unchecked if checked else Qt.Checked
+                model.setData(index, state, Qt.CheckStateRole)
+            return True
+        return False
+
+
+class QuadsTreeWidget(QTreeView):
+    """
+    Tree of the quads of the basemaps to order, with their footprints drawn
+    on the map canvas.
+    """
 
     quadsSelectionChanged = pyqtSignal()
 
     def __init__(self):
-        QTreeWidget.__init__(self, None)
-        self.setColumnCount(1)
-        self.header().hide()
+        QTreeView.__init__(self, None)
+        self.setHeaderHidden(True)
         self.setAutoScroll(True)
         self.setMouseTracking(True)
         self.setAlternatingRowColors(True)
         self.setSelectionMode(self.NoSelection)
-        self.widgets = {}
-        self._updating = False
-
-    def quad_widgets(self):
-        all_widgets = []
-        for widgets in self.widgets.values():
-            all_widgets.extend(widgets)
-        return all_widgets
+        self.footprints = FootprintsCanvasItem(
+            iface.mapCanvas(), QUADS_AOI_COLOR, QUADS_AOI_BODY_COLOR
+        )
+        # Over the footprint extents, in the same order as the model quads
+        self.footprints_index = BBoxIndex([])
+        self._map_tool = None
+        self._model = QuadsTreeModel(self.footprints, self)
+        self._model.checkStateChanged.connect(self.quadsSelectionChanged)
+        self.setModel(self._model)
+        self.setItemDelegate(QuadsTreeDelegate(self))
+        self.viewport().setAttribute(Qt.WA_Hover)
+        self.viewport().installEventFilter(self)
+        self.entered.connect(self._highlight_footprint)
 
     def clear(self):
-        for w in self.quad_widgets():
-            w.remove_footprint()
-        self.widgets = {}
-        super().clear()
+        cancel_thumbnail_downloads(self)
+        self._model.clear()
+        self.footprints.clear()
+        self.footprints_index = BBoxIndex([])
 
     def show_footprints(self):
-        for w in self.quad_widgets():
-            w.show_footprint()
+        # The project CRS might have changed since they were last shown
+        extents = footprint_extents(self._model.quads)
+        self.footprints.set_extents(extents)
+        self.footprints.set_checked(self._model.checked, True)
+        self.footprints_index = BBoxIndex(extents)
+        self.footprints.show()
 
     def hide_footprints(self):
-        for w in self.quad_widgets():
-            w.hide_footprint()
+        self.footprints.hide()
+
+    def _highlight_footprint(self, index):
+        node = self._model.node(index)
+        self.footprints.set_highlighted(
+            node.index if isinstance(node, QuadNode) else None
+        )
+
+    def eventFilter(self, obj, event):
+        if obj is self.viewport() and event.type() == QEvent.Leave:
+            self.footprints.set_highlighted(None)
+        return super().eventFilter(obj, event)
+
+    def select_on_map(self):
+        """
+        Lets the user check quads on the map: clicking toggles the quads
+        under the mouse, and dragging a box checks the quads inside it. The
+        footprint under the mouse is highlighted meanwhile.
+        """
+        canvas = iface.mapCanvas()
+        self._map_tool = PlanetFootprintsMapTool(canvas)
+        self._map_tool.pointHovered.connect(self._highlight_footprint_at)
+        self._map_tool.pointClicked.connect(self.toggleCheckedAt)
+        self._map_tool.extentSelected.connect(self.setCheckedInExtent)
+        self._map_tool.deactivated.connect(
+            lambda: self.footprints.set_highlighted(None)
+        )
+        canvas.setMapTool(self._map_tool)
+
+    def _quads_at(self, point):
+        return self.footprints_index.containing(point.x(), point.y())
+
+    def _highlight_footprint_at(self, point):
+        found = self._quads_at(point)
+        self.footprints.set_highlighted(found[-1] if len(found) else None)
+
+    def toggleCheckedAt(self, point):
+        """
+        Toggles the quads whose footprint contains a point in the project
+        CRS. They are all unchecked if they all were checked, and checked
+        otherwise.
+        """
+        found = self._quads_at(point)
+        if len(found):
+            self._model.set_checked(found, not self._model.checked[found].all())
+
+    def setCheckedInExtent(self, rect, checked=True):
+        """Checks the quads whose footprint lies inside an extent"""
+        found = self.footprints_index.within(
+            rect.xMinimum(), rect.yMinimum(), rect.xMaximum(), rect.yMaximum()
+        )
+        self._model.set_checked(found, checked)
 
     def quads_count(self):
-        return len(self.quad_widgets())
+        return len(self._model.quads)
 
     def selected_quads(self):
-        selected = []
-        for widgets in self.widgets.values():
-            selected.extend([w.quad for w in widgets if w.isSelected()])
-        return selected
+        return self._model.selected_quads()
 
     def selected_quads_classified(self):
-        selected = {}
-        for mosaic, widgets in self.widgets.items():
-            selected[mosaic] = [w.quad for w in widgets if w.isSelected()]
-        return selected
+        return self._model.selected_quads_classified()
 
     def setAllChecked(self, checked):
-        for w in self.quad_widgets():
-            w.blockSignals(True)
-            w.setChecked(checked)
-            w.blockSignals(True)
-        self._quad_selection_changed()
+        self._model.set_checked(np.arange(self.quads_count()), checked)
 
     def populate_by_quad(self, mosaics, quads):
         self.clear()
-        instances_by_quad = defaultdict(list)
-        for mosaic, mosaicquads in zip(mosaics, quads):
-            widgets = []
-            for quad in mosaicquads:
-                item = QuadInstanceTreeItem(quad)
-                widget = QuadInstanceItemWidget(quad)
-                widget.quadSelected.connect(self._quad_selection_changed)
-                widgets.append(widget)
-                instances_by_quad[quad[ID]].append((item, widget))
-            self.widgets[mosaic.get(NAME)] = widgets
-
-        for quadid, values in instances_by_quad.items():
-            item = QTreeWidgetItem()
-            self.addTopLevelItem(item)
-            widget = ParentTreeItemWidget(quadid, item)
-            self.setItemWidget(item, 0, widget)
-            item.setSizeHint(0, widget.sizeHint())
-            for quaditem, quadwidget in values:
-                item.addChild(quaditem)
-                self.setItemWidget(quaditem, 0, quadwidget)
-                quaditem.setSizeHint(0, quadwidget.sizeHint())
-            widget.update_name_and_checkbox()
+        self._model.set_quads(mosaics, quads, group_by_quad=True)
+        self.show_footprints()
 
     def populate_by_basemap(self, mosaics, quads):
         self.clear()
-        for mosaic, mosaicquads in zip(mosaics, quads):
-            item = QTreeWidgetItem()
-            self.addTopLevelItem(item)
-            widget = ParentTreeItemWidget(mosaic_title(mosaic), item)
-            self.setItemWidget(item, 0, widget)
-            item.setSizeHint(0, widget.sizeHint())
-            widgets = []
-            for quad in mosaicquads:
-                subitem = QuadInstanceTreeItem(quad)
-                item.addChild(subitem)
-                subwidget = QuadInstanceItemWidget(quad)
-                self.setItemWidget(subitem, 0, subwidget)
-                subitem.setSizeHint(0, subwidget.sizeHint())
-                subwidget.quadSelected.connect(self._quad_selection_changed)
-                widgets.append(subwidget)
-            self.widgets[mosaic.get(NAME)] = widgets
-            widget.update_name_and_checkbox()
-
-    def _quad_selection_changed(self):
-        if self._updating:
-            return
-        self._updating = True
-        self.quadsSelectionChanged.emit()
-        for i in range(self.topLevelItemCount()):
-            w = self.itemWidget(self.topLevelItem(i), 0)
-            if w is not None:
-                w.update_name_and_checkbox()
-        self._updating = False
-
-
-class ParentTreeItemWidget(QFrame):
-    def __init__(self, text, item):
-        QWidget.__init__(self)
-        self.setMouseTracking(True)
-        self.text = text
-        self.item = item
-        self.label = QLabel()
-        self.checkBox = QCheckBox("")
-        self.checkBox.setTristate(True)
-        self.checkBox.stateChanged.connect(self.check_box_state_changed)
-        layout = QHBoxLayout()
-        layout.setMargin(0)
-        layout.addWidget(self.checkBox)
-        layout.addWidget(self.label)
-        layout.addStretch()
-        self.setLayout(layout)
-
-    def check_box_state_changed(self):
-        total = self.item.childCount()
-        if self.checkBox.isTristate():
-            self.checkBox.setTristate(False)
-            self.checkBox.setChecked(False)
-        else:
-            for i in range(total):
-                w = self.item.treeWidget().itemWidget(self.item.child(i), 0)
-                w.setChecked(self.checkBox.isChecked(), False)
-            self.item.treeWidget().quadsSelectionChanged.emit()
-
-    def update_name_and_checkbox(self):
-        selected = 0
-        total = self.item.childCount()
-        for i in range(total):
-            w = self.item.treeWidget().itemWidget(self.item.child(i), 0)
-            if w.isSelected():
-                selected += 1
-        self.label.setText(f"<b>{self.text} - {selected} of {total} selected</b>")
-        self.checkBox.blockSignals(True)
-        if selected == total:
-            self.checkBox.setTristate(False)
-            self.checkBox.setCheckState(Qt.Checked)
-        elif selected == 0:
-            self.checkBox.setTristate(False)
-            self.checkBox.setCheckState(Qt.Unchecked)
-        else:
-            self.checkBox.setTristate(True)
-            self.checkBox.setCheckState(Qt.PartiallyChecked)
-        self.checkBox.blockSignals(False)
-
-
-class QuadInstanceTreeItem(QTreeWidgetItem):
-    def __init__(self, quad):
-        QTreeWidgetItem.__init__(self)
-        self.quad = quad
-
-
-class QuadInstanceItemWidget(QFrame):
-
-    quadSelected = pyqtSignal()
-
-    def __init__(self, quad):
-        QWidget.__init__(self)
-        self.setMouseTracking(True)
-        self.quad = quad
-        self.nameLabel = QLabel(
-            f'<b>{quad[ID]}</b><br><span style="color:grey;">'
-            f"{quad[PERCENT_COVERED]} % covered</span>"
-        )
-        self.iconLabel = QLabel()
-        pixmap = QPixmap(PLACEHOLDER_THUMB, "SVG")
-        thumb = pixmap.scaled(
-            48, 48, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation
-        )
-        self.iconLabel.setPixmap(thumb)
-        self.checkBox = QCheckBox("")
-        self.checkBox.stateChanged.connect(self.check_box_state_changed)
-        layout = QHBoxLayout()
-        layout.setMargin(0)
-        layout.addWidget(self.checkBox)
-        vlayout = QVBoxLayout()
-        vlayout.setMargin(0)
-        vlayout.addWidget(self.iconLabel)
-        self.iconWidget = QWidget()
-        self.iconWidget.setFixedSize(48, 48)
-        self.iconWidget.setLayout(vlayout)
-        layout.addWidget(self.iconWidget)
-        layout.addWidget(self.nameLabel)
-        layout.addStretch()
-        self.setLayout(layout)
-
-        download_thumbnail(quad[LINKS][THUMBNAIL], self)
-
-        self.footprint = QgsRubberBand(iface.mapCanvas(), QgsWkbTypes.PolygonGeometry)
-        self.footprint.setFillColor(QUADS_AOI_COLOR)
-        self.footprint.setStrokeColor(QUADS_AOI_COLOR)
-        self.footprint.setWidth(2)
-
-        self.footprintfill = QgsRubberBand(
-            iface.mapCanvas(), QgsWkbTypes.PolygonGeometry
-        )
-        self.footprintfill.setFillColor(QUADS_AOI_BODY_COLOR)
-        self.footprintfill.setWidth(0)
-
-        self.update_footprint_brush()
-        self.hide_solid_interior()
-        self.show_footprint()
-
-        self.setStyleSheet("QuadInstanceItemWidget{border: 2px solid transparent;}")
-
-    def set_thumbnail(self, img):
-        pixmap = QPixmap(img)
-        thumb = pixmap.scaled(48, 48, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        self.iconLabel.setPixmap(thumb)
-        self.iconLabel.setStyleSheet("")
-
-    def check_box_state_changed(self):
-        self.update_footprint_brush()
-        self.quadSelected.emit()
-
-    def show_footprint(self):
-        coords = self.quad[BBOX]
-        extent = qgsrectangle_for_canvas_from_4326_bbox_coords(coords)
-        self.geom = QgsGeometry.fromRect(extent)
-        self.footprint.setToGeometry(self.geom)
-        self.footprintfill.setToGeometry(self.geom)
-
-    def hide_footprint(self):
-        self.footprint.reset(QgsWkbTypes.PolygonGeometry)
-        self.footprintfill.reset(QgsWkbTypes.PolygonGeometry)
-
-    def show_solid_interior(self):
-        self.footprintfill.setBrushStyle(Qt.SolidPattern)
-        self.footprintfill.updateCanvas()
-
-    def hide_solid_interior(self):
-        self.footprintfill.setBrushStyle(Qt.NoBrush)
-        self.footprintfill.updateCanvas()
-
-    def update_footprint_brush(self):
-        self.footprint.setBrushStyle(
-            Qt.BDiagPattern if self.checkBox.isChecked() else Qt.NoBrush
-        )
-        self.footprint.updateCanvas()
-
-    def remove_footprint(self):
-        iface.mapCanvas().scene().removeItem(self.footprint)
-        iface.mapCanvas().scene().removeItem(self.footprintfill)
-
-    def isSelected(self):
-        return self.checkBox.isChecked()
-
-    def setChecked(self, checked, emit=True):
-        if not emit:
-            self.checkBox.blockSignals(True)
-        self.checkBox.setChecked(checked)
-        if not emit:
-            self.update_footprint_brush()
-            self.checkBox.blockSignals(False)
-
-    def enterEvent(self, event):
-        self.setStyleSheet(
-            "QuadInstanceItemWidget{border: 2px solid rgb(157, 165, 0);}"
-        )
-        self.show_solid_interior()
-
-    def leaveEvent(self, event):
-        self.setStyleSheet("QuadInstanceItemWidget{border: 2px solid transparent;}")
-        self.hide_solid_interior()
+        self._model.set_quads(mosaics, quads)
+        self.show_footprints()
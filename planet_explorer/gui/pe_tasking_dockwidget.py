@@ -25,11 +25,9 @@ import logging
 import os
 
 from qgis.core import (
-    QgsCoordinateReferenceSystem,
     QgsCoordinateTransform,
     QgsGeometry,
     QgsPointXY,
-    QgsProject,
     QgsRectangle,
     QgsWkbTypes,
 )
@@ -41,7 +39,15 @@ from qgis.PyQt.QtGui import QColor, QIcon
 from qgis.PyQt.QtWidgets import QDialog, QTextBrowser, QVBoxLayout
 
 from ..pe_analytics import analytics_track, SKYSAT_TASK_CREATED
-from ..pe_utils import PLANET_COLOR, open_link_with_browser, iface
+from ..pe_utils import (
+    EPSG_3857,
+    EPSG_4326,
+    PLANET_COLOR,
+    open_link_with_browser,
+    transform_from_project,
+    transform_to_project,
+    iface,
+)
 from ..planet_api import PlanetClient
 
 plugin_path = os.path.split(os.path.dirname(__file__))[0]
@@ -77,16 +83,8 @@ class AOICaptureMapTool(QgsMapTool):
 
     def canvasReleaseEvent(self, event):
         pt = event.mapPoint()
-        transform3857 = QgsCoordinateTransform(
-            QgsProject.instance().crs(),
-            QgsCoordinateReferenceSystem("EPSG:3857"),
-            QgsProject.instance(),
-        )
-        transform4326 = QgsCoordinateTransform(
-            QgsProject.instance().crs(),
-            QgsCoordinateReferenceSystem("EPSG:4326"),
-            QgsProject.instance(),
-        )
+        transform3857 = transform_from_project(EPSG_3857)
+        transform4326 = transform_from_project(EPSG_4326)
         pt4326 = transform4326.transform(pt)
         pt3857 = transform3857.transform(pt)
         SIZE = 5000
@@ -186,11 +184,7 @@ class TaskingDockWidget(BASE, WIDGET):
         self.pt = pt
         self.rect = rect
         self.footprint.setToGeometry(QgsGeometry.fromRect(rect))
-        transform = QgsCoordinateTransform(
-            QgsCoordinateReferenceSystem("EPSG:4326"),
-            QgsProject.instance().crs(),
-            QgsProject.instance(),
-        )
+        transform = transform_to_project(EPSG_4326)
         transformed = transform.transform(pt)
         self.marker.setToGeometry(QgsGeometry.fromPointXY(transformed))
         self._set_map_tool(False)
@@ -22,42 +22,392 @@ __copyright__ = "(C) 2019 Planet Inc, https://planet.com"
 # This will get replaced with a git SHA1 when you do a git archive
 __revision__ = "$Format:%H$"
 
-from collections import defaultdict
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict, defaultdict
+from functools import partial
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
+import numpy as np
 from qgis.PyQt.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
-from qgis.core import QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsProject
-from qgis.PyQt.QtCore import Qt, QUrl
+from qgis.core import QgsTask
+from qgis.PyQt.QtCore import QRect, Qt, QTimer, QUrl
+from qgis.PyQt import sip
 from qgis.PyQt.QtGui import QImage, QPainter, QPixmap
 
-from ..pe_utils import qgsgeometry_from_geojson
+from ..pe_utils import (
+    mercator_bboxes,
+    plugin_settings_folder,
+    qgsgeometry_from_geojson,
+)
+
+LOG_LEVEL = os.environ.get("PYTHON_LOG_LEVEL", "WARNING").upper()
+logging.basicConfig(level=LOG_LEVEL)
+log = logging.getLogger(__name__)
+
+THUMBNAIL_CACHE_MAX_SIZE = 200 * 1024 * 1024
+# Cached thumbnails younger than this are used without asking the server
+THUMBNAIL_MAX_AGE = 7 * 24 * 3600
+THUMBNAIL_INDEX_SAVE_DELAY = 2000
+MAX_THUMBNAIL_REQUESTS = 6
+MAX_THUMBNAILS_IN_MEMORY = 500
+COMPOUND_THUMBNAIL_SIZE = 256
+COMPOUND_THUMBNAIL_MEMO_SIZE = 200
+
+FILE = "file"
+SIZE = "size"
+ETAG = "etag"
+LAST_MODIFIED = "last_modified"
+FETCHED = "fetched"
+
+
+def thumbnail_cache_key(url):
+    """
+    Returns the URL without its api_key query parameter, so cached
+    thumbnails are still found after logging in again
+    """
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "api_key"]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class ThumbnailDiskCache:
+    """
+    Thumbnails stored on disk under the plugin settings folder, so they
+    survive QGIS restarts.
+
+    An index keeps, for each cached thumbnail, the file it is stored in, its
+    size and the ETag/Last-Modified values needed to revalidate it. Entries
+    are kept in least recently used order, and the oldest ones are evicted
+    when the total size exceeds ``max_size``.
+
+    The index is saved shortly after it changes, and when the plugin is
+    unloaded. Files left out of it, if QGIS exits before it is saved, are
+    deleted the next time the cache is loaded.
+    """
+
+    def __init__(self, folder, max_size=THUMBNAIL_CACHE_MAX_SIZE):
+        self.folder = folder
+        self.max_size = max_size
+        self.index_file = os.path.join(folder, "index.json")
+        self.entries = OrderedDict()
+        self.total_size = 0
+        self._save_pending = False
+        os.makedirs(folder, exist_ok=True)
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file) as f:
+                    self.entries = OrderedDict(json.load(f))
+            except (OSError, ValueError):
+                log.debug("Thumbnail cache index is corrupted, ignoring it")
+        self._sweep()
+        self.total_size = sum(entry[SIZE] for entry in self.entries.values())
+
+    def _sweep(self):
+        """Drops entries without a file, and files without an entry"""
+        files = set(os.listdir(self.folder))
+        self.entries = OrderedDict(
+            (key, entry) for key, entry in self.entries.items() if entry[FILE] in files
+        )
+        indexed = {entry[FILE] for entry in self.entries.values()}
+        index_files = {os.path.basename(self.index_file), self._tmp_index_file()}
+        for filename in files - indexed - index_files:
+            try:
+                os.remove(os.path.join(self.folder, filename))
+            except OSError:
+                pass
+
+    def _tmp_index_file(self):
+        return os.path.basename(self.index_file) + ".tmp"
+
+    def _path(self, entry):
+        return os.path.join(self.folder, entry[FILE])
+
+    def get(self, key):
+        """Returns the cached thumbnail data, or None if it is not cached"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        try:
+            with open(self._path(entry), "rb") as f:
+                data = f.read()
+        except OSError:
+            self._remove(key)
+            return None
+        self.entries.move_to_end(key)
+        self._schedule_save()
+        return data
+
+    def validators(self, key):
+        """Returns the (ETag, Last-Modified) pair stored for a thumbnail"""
+        entry = self.entries.get(key, {})
+        return entry.get(ETAG), entry.get(LAST_MODIFIED)
+
+    def is_fresh(self, key):
+        entry = self.entries.get(key)
+        return entry is not None and time.time() - entry[FETCHED] < THUMBNAIL_MAX_AGE
+
+    def put(self, key, data, etag=None, last_modified=None):
+        self._remove(key)
+        filename = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        entry = {
+            FILE: filename,
+            SIZE: len(data),
+            ETAG: etag,
+            LAST_MODIFIED: last_modified,
+            FETCHED: time.time(),
+        }
+        try:
+            with open(self._path(entry), "wb") as f:
+                f.write(data)
+        except OSError:
+            log.debug(f"Could not write thumbnail {key} to disk cache")
+            return
+        self.entries[key] = entry
+        self.total_size += entry[SIZE]
+        while self.total_size > self.max_size and len(self.entries) > 1:
+            self._remove(next(iter(self.entries)))
+        self._schedule_save()
+
+    def revalidated(self, key):
+        """Marks a thumbnail as fresh after the server confirmed it is unchanged"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry[FETCHED] = time.time()
+            self.entries.move_to_end(key)
+            self._schedule_save()
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_size -= entry[SIZE]
+            try:
+                os.remove(self._path(entry))
+            except OSError:
+                pass
+
+    def _schedule_save(self):
+        if not self._save_pending:
+            self._save_pending = True
+            QTimer.singleShot(THUMBNAIL_INDEX_SAVE_DELAY, self.save)
+
+    def flush(self):
+        """Saves the index now if it has changes waiting to be saved"""
+        if self._save_pending:
+            self.save()
+
+    def save(self):
+        self._save_pending = False
+        tmp_file = os.path.join(self.folder, self._tmp_index_file())
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(list(self.entries.items()), f)
+            os.replace(tmp_file, self.index_file)
+        except OSError:
+            log.debug("Could not save thumbnail cache index")
+
+
+def _is_visible(widget):
+    # Objects that are not widgets, such as the thumbnail loaders of item
+    # views, tell whether the row they load a thumbnail for is on screen
+    if hasattr(widget, "thumbnail_visible"):
+        return widget.thumbnail_visible()
+    return not widget.visibleRegion().isEmpty()
+
+
+def _is_owned_by(parent, obj):
+    obj = obj.parent()
+    while obj is not None:
+        if obj is parent:
+            return True
+        obj = obj.parent()
+    return False
 
 
 class ThumbnailManager:
-    def __init__(self):
+    """
+    Downloads thumbnails and hands them to the widgets that asked for them.
+
+    Requests are queued and at most ``max_requests`` of them are in flight at
+    a time. When a slot is free, thumbnails for widgets currently visible on
+    screen are requested first, then those for hidden widgets (collapsed or
+    scrolled out of view), and finally the revalidation of stale cached
+    thumbnails. Requests whose widgets have all been deleted are dropped, or
+    aborted if already in flight.
+    """
+
+    def __init__(
+        self,
+        max_requests=MAX_THUMBNAIL_REQUESTS,
+        max_thumbnails=MAX_THUMBNAILS_IN_MEMORY,
+    ):
         self.nam = QNetworkAccessManager()
         self.nam.finished.connect(self.thumbnail_downloaded)
-        self.thumbnails = {}
+        self.max_requests = max_requests
+        self.max_thumbnails = max_thumbnails
+        self.thumbnails = OrderedDict()
         self.widgets = defaultdict(list)
+        # key -> (url, revalidate) for requests waiting for a free slot
+        self.pending = OrderedDict()
+        # key -> QNetworkReply for requests being downloaded
+        self.replies = {}
+        self._schedule_pending = False
+        self._disk_cache = None
+
+    def flush(self):
+        if self._disk_cache is not None:
+            self._disk_cache.flush()
+
+    def disk_cache(self):
+        if self._disk_cache is None:
+            folder = os.path.join(plugin_settings_folder(), "thumbnails")
+            self._disk_cache = ThumbnailDiskCache(folder)
+        return self._disk_cache
+
+    def _cache_thumbnail(self, key, img):
+        self.thumbnails[key] = img
+        self.thumbnails.move_to_end(key)
+        while len(self.thumbnails) > self.max_thumbnails:
+            self.thumbnails.popitem(last=False)
 
     def download_thumbnail(self, url, widget):
-        if url in self.thumbnails:
-            widget.set_thumbnail(self.thumbnails[url])
+        key = thumbnail_cache_key(url)
+        if key in self.thumbnails:
+            self.thumbnails.move_to_end(key)
+            widget.set_thumbnail(self.thumbnails[key])
+            return
+        data = self.disk_cache().get(key)
+        if data is not None:
+            img = QImage()
+            if img.loadFromData(data):
+                self._cache_thumbnail(key, img)
+                widget.set_thumbnail(img)
+                if not self.disk_cache().is_fresh(key):
+                    self._enqueue(url, key, revalidate=True)
+                return
+        if widget not in self.widgets[key]:
+            self.widgets[key].append(widget)
+            widget.destroyed.connect(partial(self._widget_destroyed, key))
+        self._enqueue(url, key)
+
+    def _enqueue(self, url, key, revalidate=False):
+        if key in self.replies:
+            return
+        if key in self.pending:
+            # a download takes precedence over a revalidation
+            revalidate = revalidate and self.pending[key][1]
+        self.pending[key] = (url, revalidate)
+        # Widgets ask for their thumbnail before being added to their view,
+        # so visibility is only checked once control returns to the event loop
+        if not self._schedule_pending:
+            self._schedule_pending = True
+            QTimer.singleShot(0, self._schedule)
+
+    def _live_widgets(self, key):
+        widgets = [w for w in self.widgets.get(key, []) if not sip.isdeleted(w)]
+        if widgets:
+            self.widgets[key] = widgets
         else:
-            self.widgets[url].append(widget)
-            self.nam.get(QNetworkRequest(QUrl(url)))
+            self.widgets.pop(key, None)
+        return widgets
+
+    def _widget_destroyed(self, key, *args):
+        if self._live_widgets(key):
+            return
+        if key in self.pending and not self.pending[key][1]:
+            del self.pending[key]
+        elif key in self.replies:
+            self.replies[key].abort()
+
+    def _next_request(self):
+        hidden = None
+        revalidation = None
+        for key, (url, revalidate) in list(self.pending.items()):
+            if revalidate:
+                revalidation = revalidation or key
+                continue
+            widgets = self._live_widgets(key)
+            if not widgets:
+                del self.pending[key]
+            elif any(_is_visible(w) for w in widgets):
+                return key
+            else:
+                hidden = hidden or key
+        return hidden or revalidation
+
+    def _schedule(self):
+        self._schedule_pending = False
+        while len(self.replies) < self.max_requests:
+            key = self._next_request()
+            if key is None:
+                break
+            url, revalidate = self.pending.pop(key)
+            self._request(url, key, revalidate)
+
+    def _request(self, url, key, revalidate=False):
+        request = QNetworkRequest(QUrl(url))
+        request.setAttribute(QNetworkRequest.User, key)
+        if revalidate:
+            etag, last_modified = self.disk_cache().validators(key)
+            if etag:
+                request.setRawHeader(b"If-None-Match", etag.encode())
+            if last_modified:
+                request.setRawHeader(b"If-Modified-Since", last_modified.encode())
+        self.replies[key] = self.nam.get(request)
+
+    def cancel(self, parent):
+        """
+        Cancels the requests made for widgets contained in ``parent``, unless
+        other widgets are still waiting for the same thumbnail
+        """
+        for key in list(self.pending) + list(self.replies):
+            widgets = [
+                w for w in self._live_widgets(key) if not _is_owned_by(parent, w)
+            ]
+            if widgets:
+                self.widgets[key] = widgets
+                continue
+            self.widgets.pop(key, None)
+            if key in self.pending and not self.pending[key][1]:
+                del self.pending[key]
+            elif key in self.replies:
+                self.replies[key].abort()
 
     def thumbnail_downloaded(self, reply):
+        key = reply.request().attribute(QNetworkRequest.User)
+        if key is None:
+            key = thumbnail_cache_key(reply.url().toString())
+        if self.replies.get(key) is reply:
+            del self.replies[key]
         if reply.error() == QNetworkReply.NoError:
-            url = reply.url().toString()
-            img = QImage()
-            img.loadFromData(reply.readAll())
-            self.thumbnails[url] = img
-            for w in self.widgets[url]:
-                try:
-                    w.set_thumbnail(img)
-                except Exception:
-                    # the widget might have been deleted
-                    pass
+            status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+            if status == 304:
+                self.disk_cache().revalidated(key)
+            else:
+                data = bytes(reply.readAll())
+                img = QImage()
+                img.loadFromData(data)
+                if not img.isNull():
+                    etag = bytes(reply.rawHeader(b"ETag")).decode() or None
+                    last_modified = (
+                        bytes(reply.rawHeader(b"Last-Modified")).decode() or None
+                    )
+                    self.disk_cache().put(key, data, etag, last_modified)
+                self._cache_thumbnail(key, img)
+                for w in self._live_widgets(key):
+                    try:
+                        w.set_thumbnail(img)
+                    except Exception:
+                        # the widget might have been deleted
+                        pass
+                self.widgets.pop(key, None)
+        else:
+            self.widgets.pop(key, None)
+        reply.deleteLater()
+        self._schedule()
 
 
 _thumbnailManager = ThumbnailManager()
@@ -67,31 +417,42 @@ def download_thumbnail(url, widget):
     _thumbnailManager.download_thumbnail(url, widget)
 
 
-def createCompoundThumbnail(_bboxes, thumbnails):
-    bboxes = []
-    transform = QgsCoordinateTransform(
-        QgsCoordinateReferenceSystem("EPSG:4326"),
-        QgsCoordinateReferenceSystem("EPSG:3857"),
-        QgsProject.instance(),
-    )
-    for box in _bboxes:
-        rect4326 = qgsgeometry_from_geojson(box).boundingBox()
-        rect = transform.transformBoundingBox(rect4326)
-        bboxes.append(
-            [rect.xMinimum(), rect.yMinimum(), rect.xMaximum(), rect.yMaximum()]
-        )
+def cancel_thumbnail_downloads(parent):
+    _thumbnailManager.cancel(parent)
+
+
+def flush_thumbnail_cache():
+    _thumbnailManager.flush()
+
+
+def compose_thumbnail(bboxes, thumbnails, size=COMPOUND_THUMBNAIL_SIZE):
+    """
+    Draws thumbnails side by side according to their extents. Only QImage
+    is used, so it can run outside of the main thread.
+
+    :param bboxes: (N, 4) array of extents in EPSG:3857. Thumbnails with NaN
+        extents are left out
+    :type bboxes: numpy.ndarray
+    :param thumbnails: Thumbnails, in the same order as their extents
+    :type thumbnails: list[QImage]
+    :rtype: QImage
+    """
+    image = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    valid = ~np.isnan(bboxes).any(axis=1)
+    if not valid.any():
+        return image
+    bboxes = bboxes[valid]
+    thumbnails = [t for t, v in zip(thumbnails, valid) if v]
     globalbox = (
-        min([v[0] for v in bboxes]),
-        min([v[1] for v in bboxes]),
-        max([v[2] for v in bboxes]),
-        max([v[3] for v in bboxes]),
+        bboxes[:, 0].min(),
+        bboxes[:, 1].min(),
+        bboxes[:, 2].max(),
+        bboxes[:, 3].max(),
     )
-    SIZE = 256
     globalwidth = globalbox[2] - globalbox[0]
     globalheight = globalbox[3] - globalbox[1]
-    pixmap = QPixmap(SIZE, SIZE)
-    pixmap.fill(Qt.transparent)
-    painter = QPainter(pixmap)
+    painter = QPainter(image)
     try:
         for i, thumbnail in enumerate(thumbnails):
             box = bboxes[i]
@@ -103,11 +464,11 @@ def createCompoundThumbnail(_bboxes, thumbnails):
             else:
                 offsetx = (height - width) / 2
                 offsety = 0
-            x = int((box[0] - offsetx - globalbox[0]) / globalwidth * SIZE)
-            y = int((globalbox[3] - box[3] - offsety) / globalheight * SIZE)
-            outputwidth = int((width + 2 * offsetx) / globalwidth * SIZE)
-            outputheight = int((height + 2 * offsety) / globalheight * SIZE)
-            painter.drawPixmap(x, y, outputwidth, outputheight, thumbnail)
+            x = int((box[0] - offsetx - globalbox[0]) / globalwidth * size)
+            y = int((globalbox[3] - box[3] - offsety) / globalheight * size)
+            outputwidth = int((width + 2 * offsetx) / globalwidth * size)
+            outputheight = int((height + 2 * offsety) / globalheight * size)
+            painter.drawImage(QRect(x, y, outputwidth, outputheight), thumbnail)
     except Exception:
         """
         Unexpected values for bboxes might cause uneexpected errors. We just ignore
@@ -115,4 +476,60 @@ def createCompoundThumbnail(_bboxes, thumbnails):
         """
     finally:
         painter.end()
-    return pixmap
+    return image
+
+
+def createCompoundThumbnail(_bboxes, thumbnails):
+    bboxes = []
+    for box in _bboxes:
+        rect = qgsgeometry_from_geojson(box).boundingBox()
+        bboxes.append(
+            [rect.xMinimum(), rect.yMinimum(), rect.xMaximum(), rect.yMaximum()]
+        )
+    image = compose_thumbnail(
+        mercator_bboxes(bboxes), [thumbnail.toImage() for thumbnail in thumbnails]
+    )
+    return QPixmap.fromImage(image)
+
+
+_compound_thumbnails = OrderedDict()
+
+
+def compound_thumbnail_key(ids):
+    """Returns the key a compound thumbnail is memoized with, from its item ids"""
+    return hashlib.sha1("\n".join(sorted(ids)).encode("utf-8")).hexdigest()
+
+
+def memoized_compound_thumbnail(key):
+    image = _compound_thumbnails.get(key)
+    if image is not None:
+        _compound_thumbnails.move_to_end(key)
+    return image
+
+
+def memoize_compound_thumbnail(key, image):
+    _compound_thumbnails[key] = image
+    _compound_thumbnails.move_to_end(key)
+    while len(_compound_thumbnails) > COMPOUND_THUMBNAIL_MEMO_SIZE:
+        _compound_thumbnails.popitem(last=False)
+
+
+class CompoundThumbnailTask(QgsTask):
+    """
+    Composes compound thumbnails in the background. ``jobs`` maps the key of
+    each compound thumbnail to the extents, in EPSG:3857, and the thumbnails
+    to compose it from. Once ``taskCompleted`` is emitted, ``images`` maps
+    the same keys to the composed QImages.
+    """
+
+    def __init__(self, jobs):
+        super().__init__("Composing thumbnails", QgsTask.CanCancel)
+        self.jobs = jobs
+        self.images = {}
+
+    def run(self):
+        for key, (bboxes, thumbnails) in self.jobs.items():
+            if self.isCanceled():
+                return False
+            self.images[key] = compose_thumbnail(bboxes, thumbnails)
+        return True
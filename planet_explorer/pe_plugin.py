@@ -115,6 +115,8 @@ from planet_explorer.gui.pe_tasking_dockwidget import (
     remove_tasking_widget,
 )
 
+from planet_explorer.gui.pe_thumbnails import flush_thumbnail_cache
+
 PLANET_COM = "https://planet.com"
 SAT_SPECS_PDF = (
     "https://assets.planet.com/docs/"
@@ -578,6 +580,7 @@ class PlanetExplorer(object):
         remove_explorer()
         remove_orders_monitor()
         remove_tasking_widget()
+        flush_thumbnail_cache()
 
         QgsGui.layerTreeEmbeddedWidgetRegistry().removeProvider(self.provider.id())
 
@@ -29,10 +29,12 @@ import logging
 import os
 import re
 import urllib
+from collections import OrderedDict
 from typing import List, Optional, Tuple  # Union,
 from urllib.parse import quote
 
 import iso8601
+import numpy as np
 
 from planet.api.exceptions import APIException
 from planet.api.models import Mosaics
@@ -51,12 +53,16 @@ from qgis.core import (
     QgsApplication,
     QgsCoordinateReferenceSystem,
     QgsCoordinateTransform,
+    QgsCsException,
     QgsFeature,
     QgsField,
     QgsFields,
     QgsGeometry,
     QgsJsonUtils,
     QgsLayerTree,
+    QgsLineString,
+    QgsMultiPolygon,
+    QgsPolygon,
     QgsProject,
     QgsRasterLayer,
     QgsRectangle,
@@ -69,6 +75,7 @@ from qgis.utils import iface as qgisiface
 
 from .planet_api import PlanetClient
 from .planet_api.p_client import tile_service_url
+from .planet_api.p_search_cache import SavedSearchHistory, SearchResultCache
 from .planet_api.p_utils import geometry_from_json_str_or_obj, geometry_from_request
 
 # This can be further patched using the test.utils module
@@ -111,6 +118,10 @@ ENABLE_CLIP_SETTING = "enableClip"
 ENABLE_STAC_METADATA = "enableStacMetadata"
 ENABLE_COMPOSITE = "enableComposite"
 ENABLE_HARMONIZATION_SETTING = "enableHarmonization"
+QUAD_DOWNLOAD_WORKERS_SETTING = "quadDownloadWorkers"
+DEFAULT_QUAD_DOWNLOAD_WORKERS = 8
+SEARCH_PREFETCH_PAGES_SETTING = "searchPrefetchPages"
+DEFAULT_SEARCH_PREFETCH_PAGES = 1
 
 BASE_URL = "https://www.planet.com"
 
@@ -150,23 +161,220 @@ WIDGET_PROVIDER_NAME = "planetmosaiclayerwidget"
 COMMIT_ID = ""
 
 
+EPSG_4326 = "EPSG:4326"
+EPSG_3857 = "EPSG:3857"
+
+EARTH_RADIUS = 6378137.0
+MAX_LATITUDE = 85.0511287798066
+# Points transformed along each edge of an extent, as transformBoundingBox does
+BBOX_EDGE_POINTS = 21
+
+_crs_cache = {}
+_transform_cache = {}
+_transform_cache_connected = False
+
+
+def crs(value):
+    """
+    Returns the CRS for an auth id like "EPSG:4326", created only once for
+    each auth id. CRS objects are returned as they are.
+    """
+    if isinstance(value, QgsCoordinateReferenceSystem):
+        return value
+    cached = _crs_cache.get(value)
+    if cached is None:
+        cached = _crs_cache[value] = QgsCoordinateReferenceSystem(value)
+    return cached
+
+
+def _crs_key(value):
+    value = crs(value)
+    return value.authid() or value.toWkt()
+
+
+def clear_transform_cache():
+    _transform_cache.clear()
+
+
+def coordinate_transform(source, destination):
+    """
+    Returns a transform between two CRSs, using the transform context of the
+    current project.
+
+    Transforms are created once for each pair of CRSs and reused until the
+    project CRS or its transform context change, since setting up a
+    transform means looking up and instantiating the operation between the
+    two CRSs. Callers get their own copy, so they can't alter the cached one.
+
+    :param source: CRS, or its auth id
+    :param destination: CRS, or its auth id
+    :rtype: QgsCoordinateTransform
+    """
+    global _transform_cache_connected
+    project = QgsProject.instance()
+    if not _transform_cache_connected:
+        project.crsChanged.connect(clear_transform_cache)
+        project.transformContextChanged.connect(clear_transform_cache)
+        project.cleared.connect(clear_transform_cache)
+        _transform_cache_connected = True
+    key = (_crs_key(source), _crs_key(destination))
+    transform = _transform_cache.get(key)
+    if transform is None:
+        transform = QgsCoordinateTransform(crs(source), crs(destination), project)
+        _transform_cache[key] = transform
+    return QgsCoordinateTransform(transform)
+
+
+def transform_to_project(source=EPSG_4326):
+    return coordinate_transform(source, QgsProject.instance().crs())
+
+
+def transform_from_project(destination=EPSG_4326):
+    return coordinate_transform(QgsProject.instance().crs(), destination)
+
+
+def mercator_bboxes(bboxes):
+    """
+    Converts [west, south, east, north] extents from EPSG:4326 to EPSG:3857,
+    all at once
+
+    :type bboxes: numpy.ndarray | list
+    :rtype: numpy.ndarray
+    """
+    bboxes = np.asarray(bboxes, dtype=float).reshape(-1, 4)
+    lon = bboxes[:, [0, 2]]
+    lat = np.clip(bboxes[:, [1, 3]], -MAX_LATITUDE, MAX_LATITUDE)
+    x = np.radians(lon) * EARTH_RADIUS
+    y = np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) * EARTH_RADIUS
+    return np.column_stack([x[:, 0], y[:, 0], x[:, 1], y[:, 1]])
+
+
+def transform_bboxes(bboxes, source, destination):
+    """
+    Transforms many [xmin, ymin, xmax, ymax] extents at once, returning the
+    extents of the transformed ones.
+
+    Points along the edges of all the extents are transformed in a single
+    call, and EPSG:4326 to EPSG:3857 is computed directly with numpy.
+    Extents that can't be transformed are returned as NaN.
+
+    :type bboxes: numpy.ndarray | list
+    :param source: CRS, or its auth id
+    :param destination: CRS, or its auth id
+    :rtype: numpy.ndarray
+    """
+    bboxes = np.asarray(bboxes, dtype=float).reshape(-1, 4)
+    source_key, destination_key = _crs_key(source), _crs_key(destination)
+    if source_key == destination_key:
+        return bboxes.copy()
+    if source_key == EPSG_4326 and destination_key == EPSG_3857:
+        return mercator_bboxes(bboxes)
+
+    transformed = np.full(bboxes.shape, np.nan)
+    valid = ~np.isnan(bboxes).any(axis=1)
+    if not valid.any():
+        return transformed
+    xmin, ymin, xmax, ymax = (c[:, None] for c in bboxes[valid].T)
+    steps = np.linspace(0.0, 1.0, BBOX_EDGE_POINTS)
+    along_x = xmin + (xmax - xmin) * steps
+    along_y = ymin + (ymax - ymin) * steps
+    xs = np.hstack([along_x, along_x, np.repeat(xmin, len(steps), 1)])
+    xs = np.hstack([xs, np.repeat(xmax, len(steps), 1)])
+    ys = np.hstack([np.repeat(ymin, len(steps), 1), np.repeat(ymax, len(steps), 1)])
+    ys = np.hstack([ys, along_y, along_y])
+
+    transform = coordinate_transform(source, destination)
+    line = QgsLineString(xs.ravel().tolist(), ys.ravel().tolist())
+    try:
+        line.transform(transform)
+        points = np.column_stack([line.xVector(), line.yVector()])
+        points = points.reshape(len(xs), -1, 2)
+        transformed[valid, :2] = points.min(axis=1)
+        transformed[valid, 2:] = points.max(axis=1)
+    except QgsCsException:
+        # Some point is out of the bounds of the destination CRS, so the
+        # extents are transformed one by one to find which
+        for i in np.flatnonzero(valid):
+            try:
+                rect = transform.transformBoundingBox(QgsRectangle(*bboxes[i]))
+            except QgsCsException:
+                continue
+            transformed[i] = [
+                rect.xMinimum(),
+                rect.yMinimum(),
+                rect.xMaximum(),
+                rect.yMaximum(),
+            ]
+    return transformed
+
+
 def qgsrectangle_for_canvas_from_4326_bbox_coords(coords):
-    transform = QgsCoordinateTransform(
-        QgsCoordinateReferenceSystem("EPSG:4326"),
-        QgsProject.instance().crs(),
-        QgsProject.instance(),
-    )
+    transform = transform_to_project(EPSG_4326)
     extent = QgsRectangle(*coords)
     transform_extent = transform.transformBoundingBox(extent)
     return transform_extent
 
 
-def qgsgeometry_from_geojson(json_type):
+def _ring_from_coords(coords):
+    xs = [c[0] for c in coords]
+    ys = [c[1] for c in coords]
+    if len(coords[0]) > 2:
+        return QgsLineString(xs, ys, [c[2] for c in coords])
+    return QgsLineString(xs, ys)
+
+
+def _polygon_from_coords(rings):
+    polygon = QgsPolygon()
+    polygon.setExteriorRing(_ring_from_coords(rings[0]))
+    for ring in rings[1:]:
+        polygon.addInteriorRing(_ring_from_coords(ring))
+    return polygon
+
+
+def _qgsgeometry_from_json_geom(json_geom):
+    """
+    Builds a polygon or multipolygon straight from GeoJSON coordinates,
+    without serializing it back to a string for QgsJsonUtils to parse
+    """
+    coords = json_geom["coordinates"]
+    if json_geom["type"].lower() == "polygon":
+        return QgsGeometry(_polygon_from_coords(coords))
+    multipolygon = QgsMultiPolygon()
+    for rings in coords:
+        multipolygon.addGeometry(_polygon_from_coords(rings))
+    return QgsGeometry(multipolygon)
+
+
+def _qgsgeometry_from_json_geom_string(json_geom):
+    try:
+        feats = QgsJsonUtils.stringToFeatureList(
+            json.dumps(json_geom), QgsFields(), None
+        )
+        return feats[0].geometry()
+    except Exception:
+        return QgsGeometry()  # will return an empty geom
+
+
+GEOMETRY_MEMO_SIZE = 10000
+# Geometries of search result items, keyed by item type and id
+_geometry_memo = OrderedDict()
+
+
+def qgsgeometry_from_geojson(json_type, key=None):
     """
     :param json_type: GeoJSON (as string or `json` object)
     :type json_type: str | dict
+    :param key: Optional key to memoize the geometry with, such as an item id.
+        The GeoJSON is only converted the first time a key is seen
+    :type key: str
     :rtype: QgsGeometry
     """
+    if key is not None and key in _geometry_memo:
+        _geometry_memo.move_to_end(key)
+        # Geometries are implicitly shared, the copy is cheap and keeps the
+        # memoized one safe from in place edits like transform()
+        return QgsGeometry(_geometry_memo[key])
+
     geom = QgsGeometry()
     json_geom = geometry_from_json_str_or_obj(json_type)
     if not json_geom:
@@ -183,28 +391,175 @@ def qgsgeometry_from_geojson(json_type):
         return geom
 
     try:
-        feats = QgsJsonUtils.stringToFeatureList(
-            json.dumps(json_geom), QgsFields(), None
-        )
-        geom = feats[0].geometry()
+        geom = _qgsgeometry_from_json_geom(json_geom)
     except Exception:
-        pass  # will return an empty geom
+        log.debug("Could not build geometry from coordinates, parsing it as JSON")
+        geom = _qgsgeometry_from_json_geom_string(json_geom)
 
+    if key is not None:
+        _geometry_memo[key] = QgsGeometry(geom)
+        if len(_geometry_memo) > GEOMETRY_MEMO_SIZE:
+            _geometry_memo.popitem(last=False)
     return geom
 
 
-def area_coverage_for_image(image, request):
-    aoi_geom = geometry_from_request(request)
-    if aoi_geom is None:
+def qgsgeometry_for_image(image):
+    """
+    Returns the footprint of a search result item, memoized by item type and
+    id
+
+    :rtype: QgsGeometry
+    """
+    properties = image.get("properties", {})
+    key = f"{properties.get(ITEM_TYPE)}/{image.get(ID)}"
+    return qgsgeometry_from_geojson(image["geometry"], key)
+
+
+class RequestAoi:
+    """
+    AOI of a search request, parsed once and prepared so that the coverage
+    of many image footprints can be computed against it cheaply
+    """
+
+    def __init__(self, aoi_json):
+        self.geometry = qgsgeometry_from_geojson(aoi_json)
+        self.area = self.geometry.area()
+        self.engine = QgsGeometry.createGeometryEngine(self.geometry.constGet())
+        self.engine.prepareGeometry()
+
+    def coverage(self, footprint):
+        """
+        :param footprint: Image footprint, in EPSG:4326
+        :type footprint: QgsGeometry
+        :returns: Percentage of the AOI covered by the footprint
+        :rtype: float
+        """
+        if self.area == 0:
+            return 100
+        if footprint.isEmpty() or not self.engine.intersects(footprint.constGet()):
+            return 0
+        if self.engine.within(footprint.constGet()):
+            return 100
+        if self.engine.contains(footprint.constGet()):
+            intersection_area = footprint.area()
+        else:
+            intersection_area = self.geometry.intersection(footprint).area()
+        return intersection_area / self.area * 100
+
+
+# Margin, in percent, for rounding errors when comparing coverage bounds
+COVERAGE_TOLERANCE = 1e-9
+
+
+def request_aoi(request):
+    """
+    Returns the prepared AOI of a search request. It is meant to be built
+    once per request, and passed to the coverage functions for every image
+    or page of results of that request.
+
+    :rtype: RequestAoi | None
+    """
+    aoi_json = geometry_from_request(request)
+    if aoi_json is None:
         return None
-    aoi_qgsgeom = qgsgeometry_from_geojson(aoi_geom)
-    aoi_area = aoi_qgsgeom.area()
-    if aoi_area == 0:
-        return 100
-    image_qgsgeom = qgsgeometry_from_geojson(image["geometry"])
-    intersection = aoi_qgsgeom.intersection(image_qgsgeom)
-    area_coverage = intersection.area() / aoi_area * 100
-    return area_coverage
+    return RequestAoi(aoi_json)
+
+
+def area_coverage_for_image(image, aoi, footprint=None):
+    """
+    :param aoi: Prepared AOI of the search request, as returned by
+        request_aoi
+    :type aoi: RequestAoi | None
+    :param footprint: Already parsed footprint of the image, if available
+    :type footprint: QgsGeometry
+    :returns: Percentage of the request AOI covered by the image, or None if
+        the request has no AOI
+    """
+    if aoi is None:
+        return None
+    if footprint is None:
+        footprint = qgsgeometry_for_image(image)
+    return aoi.coverage(footprint)
+
+
+def _outer_rings(geometry):
+    coords = (geometry or {}).get("coordinates") or []
+    geom_type = (geometry or {}).get("type", "").lower()
+    if geom_type == "polygon":
+        return coords[:1]
+    elif geom_type == "multipolygon":
+        return [polygon[0] for polygon in coords if polygon]
+    return []
+
+
+def footprint_bboxes(geometries):
+    """
+    Computes the bounding boxes of GeoJSON polygons and multipolygons. The
+    vertices of all the outer rings are packed in a single array and reduced
+    per geometry, instead of building a QgsGeometry for each of them.
+
+    :param geometries: GeoJSON geometries, with 2D coordinates
+    :type geometries: list
+    :returns: (N, 4) array of [xmin, ymin, xmax, ymax] rows, NaN for
+        geometries without coordinates
+    :rtype: numpy.ndarray
+    """
+    coords = []
+    counts = np.zeros(len(geometries), dtype=int)
+    for i, geometry in enumerate(geometries):
+        start = len(coords)
+        for ring in _outer_rings(geometry):
+            coords.extend(ring)
+        counts[i] = len(coords) - start
+    bboxes = np.full((len(geometries), 4), np.nan)
+    if coords:
+        points = np.asarray(coords, dtype=float)
+        nonempty = counts > 0
+        offsets = (np.cumsum(counts) - counts)[nonempty]
+        bboxes[nonempty, :2] = np.minimum.reduceat(points, offsets)
+        bboxes[nonempty, 2:] = np.maximum.reduceat(points, offsets)
+    return bboxes
+
+
+def area_coverage_mask(images, aoi, minvalue=0, maxvalue=100):
+    """
+    Tells which images of a page of search results cover between
+    ``minvalue`` and ``maxvalue`` percent of the request AOI.
+
+    The overlap between the bounding boxes of the footprints and the AOI is
+    an upper bound of the coverage, computed for the whole page at once.
+    Images whose bound is below ``minvalue`` are rejected without building
+    their geometry, and exact coverage is only computed for the rest.
+
+    :param aoi: Prepared AOI of the search request, as returned by
+        request_aoi
+    :type aoi: RequestAoi | None
+    :rtype: numpy.ndarray of bool
+    """
+    mask = np.ones(len(images), dtype=bool)
+    if aoi is None or not images or (minvalue <= 0 and maxvalue >= 100):
+        return mask
+    if aoi.area == 0:
+        mask[:] = minvalue <= 100 <= maxvalue
+        return mask
+    bboxes = footprint_bboxes([image.get("geometry") for image in images])
+    rect = aoi.geometry.boundingBox()
+    width = np.minimum(bboxes[:, 2], rect.xMaximum()) - np.maximum(
+        bboxes[:, 0], rect.xMinimum()
+    )
+    height = np.minimum(bboxes[:, 3], rect.yMaximum()) - np.maximum(
+        bboxes[:, 1], rect.yMinimum()
+    )
+    bound = np.nan_to_num(
+        np.clip(width, 0, None) * np.clip(height, 0, None) / aoi.area * 100
+    )
+    # A footprint that doesn't overlap the AOI bbox covers nothing of it
+    mask[bound == 0] = minvalue <= 0
+    mask[bound < minvalue - COVERAGE_TOLERANCE] = False
+    for i in np.flatnonzero(mask & (bound > 0)):
+        coverage = area_coverage_for_image(images[i], aoi)
+        mask[i] = minvalue <= coverage <= maxvalue
+    return mask
 
 
 def add_menu_section_action(text, menu, tag="b", pad=0.5):
@@ -381,7 +736,7 @@ def create_preview_group(
         for img in images:
             feat = QgsFeature()
             feat.setFields(fields)
-            qgs_geom = qgsgeometry_from_geojson(img["geometry"])
+            qgs_geom = qgsgeometry_for_image(img)
             feat.setGeometry(qgs_geom)
 
             f_names = [f.name() for f in fields]
@@ -426,11 +781,7 @@ def create_preview_group(
 
 
 def zoom_canvas_to_geometry(geom):
-    transform = QgsCoordinateTransform(
-        QgsCoordinateReferenceSystem("EPSG:4326"),
-        QgsProject.instance().crs(),
-        QgsProject.instance(),
-    )
+    transform = transform_to_project(EPSG_4326)
     rect: QgsRectangle = transform.transformBoundingBox(geom.boundingBox())
 
     if not rect.isEmpty():
@@ -452,6 +803,37 @@ def resource_file(f):
     return os.path.join(os.path.dirname(__file__), "resources", f)
 
 
+def plugin_settings_folder():
+    folder = os.path.join(
+        os.path.dirname(QgsApplication.qgisUserDatabaseFilePath()), "planetexplorer"
+    )
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+_search_result_cache = None
+_saved_search_history = None
+
+
+def search_result_cache():
+    global _search_result_cache
+    if _search_result_cache is None:
+        _search_result_cache = SearchResultCache(
+            os.path.join(plugin_settings_folder(), "search_cache")
+        )
+    _search_result_cache.set_account(PlanetClient.getInstance().api_key())
+    return _search_result_cache
+
+
+def saved_search_history():
+    global _saved_search_history
+    if _saved_search_history is None:
+        _saved_search_history = SavedSearchHistory(
+            os.path.join(plugin_settings_folder(), "saved_searches")
+        )
+    return _saved_search_history
+
+
 def orders_download_folder():
     download_folder = (
         QSettings().value(f"{SETTINGS_NAMESPACE}/{ORDERS_DOWNLOAD_FOLDER_SETTING}", "")
@@ -470,6 +852,28 @@ def orders_download_folder():
     return download_folder
 
 
+def quad_download_workers():
+    value = QSettings().value(
+        f"{SETTINGS_NAMESPACE}/{QUAD_DOWNLOAD_WORKERS_SETTING}",
+        DEFAULT_QUAD_DOWNLOAD_WORKERS,
+    )
+    try:
+        return max(1, int(float(value)))
+    except (TypeError, ValueError):
+        return DEFAULT_QUAD_DOWNLOAD_WORKERS
+
+
+def search_prefetch_pages():
+    value = QSettings().value(
+        f"{SETTINGS_NAMESPACE}/{SEARCH_PREFETCH_PAGES_SETTING}",
+        DEFAULT_SEARCH_PREFETCH_PAGES,
+    )
+    try:
+        return max(0, int(float(value)))
+    except (TypeError, ValueError):
+        return DEFAULT_SEARCH_PREFETCH_PAGES
+
+
 def mosaic_title(mosaic):
     date = iso8601.parse_date(mosaic[FIRST_ACQUIRED])
     if INTERVAL in mosaic:
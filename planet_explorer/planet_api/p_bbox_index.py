@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+    p_bbox_index.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 Planet Inc, https://planet.com
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+__author__ = "Planet Federal"
+__date__ = "October 2026"
+__copyright__ = "(C) 2026 Planet Inc, https://planet.com"
+
+# This will get replaced with a git SHA1 when you do a git archive
+__revision__ = "$Format:%H$"
+
+import logging
+import os
+
+import numpy as np
+
+LOG_LEVEL = os.environ.get("PYTHON_LOG_LEVEL", "WARNING").upper()
+logging.basicConfig(level=LOG_LEVEL)
+log = logging.getLogger(__name__)
+
+# Children of each node of the tree
+NODE_SIZE = 16
+
+
+class BBoxIndex:
+    """
+    Spatial index over a packed array of [xmin, ymin, xmax, ymax] extents.
+
+    It is a static R-tree, built at once with the sort-tile-recursive
+    algorithm: extents are sorted into tiles of nearby ones, which are
+    grouped ``node_size`` at a time into the nodes of the level above, up to
+    the root. Each level is a numpy array of node extents, and the children
+    of node i are the nodes i * node_size to (i + 1) * node_size - 1 of the
+    level below, so queries test a whole level of candidates at once.
+
+    Queries return the positions of the matching extents in the array the
+    index was built from, sorted. Extents with NaN values are not indexed.
+    """
+
+    def __init__(self, bboxes, node_size=NODE_SIZE):
+        self.bboxes = np.asarray(bboxes, dtype=float).reshape(-1, 4)
+        self.node_size = node_size
+        valid = np.flatnonzero(~np.isnan(self.bboxes).any(axis=1))
+        # Position in bboxes of each leaf of the tree
+        self.order = valid[self._tile_order(self.bboxes[valid])]
+        level = self.bboxes[self.order]
+        self.levels = [level]
+        while len(level) > node_size:
+            starts = np.arange(0, len(level), node_size)
+            level = np.column_stack(
+                [
+                    np.minimum.reduceat(level[:, :2], starts),
+                    np.maximum.reduceat(level[:, 2:], starts),
+                ]
+            )
+            self.levels.append(level)
+
+    def __len__(self):
+        return len(self.bboxes)
+
+    def _tile_order(self, bboxes):
+        count = len(bboxes)
+        if not count:
+            return np.zeros(0, dtype=np.int64)
+        centers_x = bboxes[:, 0] + bboxes[:, 2]
+        centers_y = bboxes[:, 1] + bboxes[:, 3]
+        leaves = -(-count // self.node_size)
+        slice_size = int(np.ceil(np.sqrt(leaves))) * self.node_size
+        by_x = np.argsort(centers_x, kind="stable")
+        slices = np.arange(count) // slice_size
+        return by_x[np.lexsort((centers_y[by_x], slices))]
+
+    def intersecting(self, xmin, ymin, xmax, ymax):
+        """Returns the extents that intersect a box, touching included"""
+        if not len(self.order):
+            return np.zeros(0, dtype=np.int64)
+        depth = len(self.levels) - 1
+        nodes = np.arange(len(self.levels[depth]))
+        while True:
+            boxes = self.levels[depth][nodes]
+            nodes = nodes[
+                (boxes[:, 0] <= xmax)
+                & (boxes[:, 2] >= xmin)
+                & (boxes[:, 1] <= ymax)
+                & (boxes[:, 3] >= ymin)
+            ]
+            if depth == 0 or not len(nodes):
+                break
+            depth -= 1
+            children = nodes[:, None] * self.node_size + np.arange(self.node_size)
+            children = children.ravel()
+            nodes = children[children < len(self.levels[depth])]
+        if depth:
+            return np.zeros(0, dtype=np.int64)
+        return np.sort(self.order[nodes])
+
+    def containing(self, x, y):
+        """Returns the extents that contain a point"""
+        return self.intersecting(x, y, x, y)
+
+    def within(self, xmin, ymin, xmax, ymax):
+        """Returns the extents that lie completely inside a box"""
+        candidates = self.intersecting(xmin, ymin, xmax, ymax)
+        boxes = self.bboxes[candidates]
+        inside = (
+            (boxes[:, 0] >= xmin)
+            & (boxes[:, 1] >= ymin)
+            & (boxes[:, 2] <= xmax)
+            & (boxes[:, 3] <= ymax)
+        )
+        return candidates[inside]
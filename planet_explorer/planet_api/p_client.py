@@ -218,7 +218,7 @@ class PlanetClient(QObject, ClientV1):
         url = self._url("basemaps/v1/series/{}/mosaics?v=1.5".format(series_id))
         return self._get(url, api_models.Mosaics).get_body()
 
-    def get_quads_for_mosaic(self, mosaic, bbox=None, minimal=False):
+    def get_quads_for_mosaic(self, mosaic, bbox=None, minimal=False, page_size=None):
         """List all available quad for a given mosaic
         :returns: :py:Class:`planet.api.models.JSON`
         """
@@ -227,9 +227,6 @@ class PlanetClient(QObject, ClientV1):
         else:
             mosaicid = mosaic["id"]
 
-        url = self._url(
-            f"basemaps/v1/mosaics/{mosaicid}/quads?bbox={bbox[0]},{bbox[1]},{bbox[2]},{bbox[3]}"
-        )
         if bbox is None:
             if isinstance(mosaic, str):
                 bbox = [-180, -85, 180, 85]
@@ -241,9 +238,13 @@ class PlanetClient(QObject, ClientV1):
             min(180, bbox[2]),
             min(84.99, bbox[3]),
         )
-        url = url.format(lx=bbox[0], ly=bbox[1], ux=bbox[2], uy=bbox[3])
+        url = self._url(
+            f"basemaps/v1/mosaics/{mosaicid}/quads?bbox={bbox[0]},{bbox[1]},{bbox[2]},{bbox[3]}"
+        )
         if minimal:
             url += "&minimal=true"
+        if page_size is not None:
+            url += f"&_page_size={page_size}"
         return self._get(url, api_models.MosaicQuads).get_body()
 
     def get_one_quad(self, mosaic):
@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+    p_downloader.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 Planet Inc, https://planet.com
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+__author__ = "Planet Federal"
+__date__ = "October 2026"
+__copyright__ = "(C) 2026 Planet Inc, https://planet.com"
+
+# This will get replaced with a git SHA1 when you do a git archive
+__revision__ = "$Format:%H$"
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+import requests
+
+LOG_LEVEL = os.environ.get("PYTHON_LOG_LEVEL", "WARNING").upper()
+logging.basicConfig(level=LOG_LEVEL)
+log = logging.getLogger(__name__)
+
+PART_SUFFIX = ".part"
+
+DEFAULT_WORKERS = 4
+DEFAULT_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+REQUEST_TIMEOUT = (15, 60)
+
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+CHUNKS_PER_FILE = 200
+
+
+class DownloadCanceledException(Exception):
+    """Raised inside download workers when the owning task is canceled"""
+
+    pass
+
+
+def chunk_size_for(file_size):
+    """
+    Returns a chunk size that gives a reasonable number of progress updates
+    for a file of the given size, without making tiny reads on big files.
+
+    :param file_size: Expected file size in bytes, or 0 if unknown
+    :type file_size: int
+    :rtype: int
+    """
+    if not file_size:
+        return MIN_CHUNK_SIZE
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, file_size // CHUNKS_PER_FILE))
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, maximum=BACKOFF_MAX):
+    """Exponential backoff with full jitter for the given (zero-based) attempt"""
+    return random.uniform(0, min(maximum, base * (2**attempt)))
+
+
+class DownloadManifest:
+    """
+    Index of the files downloaded for an order, stored as JSON next to them.
+
+    Each entry records the file id, its size, the ETag returned by the server
+    and whether the download was completed, so a later run can tell which
+    files are already on disk and only fetch the missing or changed ones.
+    """
+
+    SAVE_EVERY = 50
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                log.debug(f"Download manifest {path} is corrupted, ignoring it")
+
+    def is_complete(self, key, local_path):
+        """True if the manifest entry is complete and matches the file on disk"""
+        entry = self.entries.get(key)
+        if not entry or not entry.get("complete"):
+            return False
+        try:
+            return os.path.getsize(local_path) == entry.get("size")
+        except OSError:
+            return False
+
+    def etag(self, key):
+        entry = self.entries.get(key)
+        return entry.get("etag") if entry else None
+
+    def record(self, key, file_id, local_path, etag):
+        with self._lock:
+            self.entries[key] = {
+                "id": file_id,
+                "size": os.path.getsize(local_path),
+                "etag": etag,
+                "complete": True,
+            }
+            self._unsaved += 1
+            if self._unsaved >= self.SAVE_EVERY:
+                self._save()
+
+    def save(self):
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        tmp_path = self.path + PART_SUFFIX
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+
+def _is_file_error(ex):
+    """True if the server answered with an error for this file in particular"""
+    return isinstance(ex, requests.HTTPError) and ex.response is not None
+
+
+def _is_retryable(ex):
+    """Client errors (other than timeouts and throttling) won't fix themselves"""
+    response = getattr(ex, "response", None)
+    if isinstance(ex, requests.HTTPError) and response is not None:
+        status = response.status_code
+        return not (400 <= status < 500) or status in (408, 429)
+    return True
+
+
+class ChunkedDownloader:
+    """
+    Downloads a list of (url, local path) pairs over a bounded pool of worker
+    threads.
+
+    Each file is first written to a ``.part`` file next to its final location.
+    If the transfer is interrupted, the next run resumes it with an HTTP Range
+    request instead of starting over, and failed requests are retried with
+    exponential backoff. Files that already exist at their final location are
+    not downloaded again, unless an ETag is passed for them in ``validators``.
+    In that case a conditional request is made and the file is only fetched
+    again if the server reports it has changed.
+
+    Progress is aggregated across all workers and reported as a percentage
+    through the ``progress`` callback.
+
+    A file the server answers with an HTTP error for (once its retries are
+    used up) doesn't stop the others. The error is stored in ``failures``
+    under the job index and the remaining files keep downloading. Only
+    transport errors and cancelation abort the whole download.
+    """
+
+    def __init__(
+        self,
+        jobs,
+        max_workers=DEFAULT_WORKERS,
+        retries=DEFAULT_RETRIES,
+        is_canceled=None,
+        progress=None,
+        file_finished=None,
+        validators=None,
+    ):
+        """
+        :param jobs: List of (url, local path) tuples to download
+        :type jobs: list
+        :param max_workers: Maximum number of concurrent downloads
+        :type max_workers: int
+        :param retries: Number of retries allowed for each file
+        :type retries: int
+        :param is_canceled: Callable returning True when downloading must stop
+        :type is_canceled: callable
+        :param progress: Callable receiving the overall progress (0-100)
+        :type progress: callable
+        :param file_finished: Callable receiving the job index and local path
+            of each file as soon as it has been downloaded
+        :type file_finished: callable
+        :param validators: ETags of the files already on disk, by job index
+        :type validators: dict
+        """
+        self.jobs = list(jobs)
+        self.max_workers = max(1, int(max_workers))
+        self.retries = max(0, int(retries))
+        self._is_canceled = is_canceled or (lambda: False)
+        self._progress = progress or (lambda value: None)
+        self._file_finished = file_finished or (lambda index, path: None)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._sessions = []
+        self._abort = threading.Event()
+        self._validators = validators or {}
+        self._fractions = [0.0] * len(self.jobs)
+        self.etags = [None] * len(self.jobs)
+        self.failures = {}
+
+    def run(self):
+        """
+        Downloads all jobs, blocking until they are finished.
+
+        :returns: List of local paths of the downloaded files, in job order,
+            with None for the files listed in ``failures``
+        :raises DownloadCanceledException: If the download was canceled
+        """
+        if not self.jobs:
+            return []
+        workers = min(self.max_workers, len(self.jobs))
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(self._download, i, url, path)
+                    for i, (url, path) in enumerate(self.jobs)
+                ]
+                _, pending = wait(futures, return_when=FIRST_EXCEPTION)
+                if pending:
+                    # The connection or the task failed. Stop the other workers
+                    self._abort.set()
+                    for future in pending:
+                        future.cancel()
+        finally:
+            for session in self._sessions:
+                session.close()
+        errors = [f.exception() for f in futures if not f.cancelled() and f.exception()]
+        real_errors = [
+            e for e in errors if not isinstance(e, DownloadCanceledException)
+        ]
+        if errors:
+            raise (real_errors or errors)[0]
+        return [f.result() for f in futures]
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def _check_canceled(self):
+        if self._abort.is_set() or self._is_canceled():
+            raise DownloadCanceledException()
+
+    def _set_fraction(self, index, fraction):
+        with self._lock:
+            self._fractions[index] = fraction
+            progress = sum(self._fractions) * 100.0 / len(self._fractions)
+        self._progress(progress)
+
+    def _sleep(self, seconds):
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            self._check_canceled()
+            time.sleep(min(0.25, max(0, deadline - time.monotonic())))
+
+    def _download(self, index, url, path):
+        part_path = path + PART_SUFFIX
+        if os.path.exists(path):
+            validator = self._validators.get(index)
+            if validator is None or self._not_modified(index, url, validator):
+                self._set_fraction(index, 1.0)
+                self._file_finished(index, path)
+                return path
+            if os.path.exists(part_path):
+                # The remote file has changed, so a partial download left
+                # over from a previous run can't be resumed
+                os.remove(part_path)
+        attempt = 0
+        while True:
+            self._check_canceled()
+            try:
+                self._download_part(index, url, part_path)
+                os.replace(part_path, path)
+                self._set_fraction(index, 1.0)
+                self._file_finished(index, path)
+                return path
+            except DownloadCanceledException:
+                raise
+            except (requests.RequestException, OSError) as ex:
+                if attempt >= self.retries or not _is_retryable(ex):
+                    if not _is_file_error(ex):
+                        raise
+                    log.debug(f"Download of {os.path.basename(path)} failed ({ex})")
+                    with self._lock:
+                        self.failures[index] = ex
+                    self._set_fraction(index, 1.0)
+                    return None
+                delay = backoff_delay(attempt)
+                attempt += 1
+                log.debug(
+                    f"Download of {os.path.basename(path)} failed ({ex}), "
+                    f"retrying in {delay:.1f}s ({attempt}/{self.retries})"
+                )
+                self._sleep(delay)
+
+    def _not_modified(self, index, url, etag):
+        headers = {"If-None-Match": etag}
+        try:
+            with self._session().get(
+                url, stream=True, headers=headers, timeout=REQUEST_TIMEOUT
+            ) as r:
+                if r.status_code == 304 or r.headers.get("ETag") == etag:
+                    self.etags[index] = etag
+                    return True
+                return not r.ok
+        except requests.RequestException:
+            # Keep the local copy if it can't be revalidated
+            log.debug(f"Could not revalidate {url}, keeping local copy")
+            return True
+
+    def _download_part(self, index, url, part_path):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        with self._session().get(
+            url, stream=True, headers=headers, timeout=REQUEST_TIMEOUT
+        ) as r:
+            if offset and r.status_code == 416:
+                # Requested range starts at the end of the file, so the
+                # partial file is already complete
+                return
+            r.raise_for_status()
+            self.etags[index] = r.headers.get("ETag")
+            if offset and r.status_code != 206:
+                # Server ignored the Range header. Start again from scratch
+                offset = 0
+            remaining = int(r.headers.get("content-length") or 0)
+            total = offset + remaining
+            chunk_size = chunk_size_for(total)
+            written = offset
+            with open(part_path, "ab" if offset else "wb") as f:
+                for chunk in r.iter_content(chunk_size):
+                    self._check_canceled()
+                    f.write(chunk)
+                    written += len(chunk)
+                    if total:
+                        self._set_fraction(index, min(written / total, 0.99))
+            if total and written < total:
+                raise requests.exceptions.ChunkedEncodingError(
+                    f"Connection closed after {written} of {total} bytes"
+                )
@@ -23,12 +23,11 @@ __revision__ = "$Format:%H$"
 
 import json
 import os
-import shutil
 import traceback
 import zipfile
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
 from osgeo import gdal
 
 from qgis.core import (
@@ -43,7 +42,15 @@ from qgis.PyQt.QtCore import QUrl
 from qgis.PyQt.QtGui import QDesktopServices
 from qgis.PyQt.QtWidgets import QPushButton
 
-from ..pe_utils import QGIS_LOG_SECTION_NAME, iface
+from ..pe_utils import QGIS_LOG_SECTION_NAME, iface, quad_download_workers
+from .p_downloader import (
+    ChunkedDownloader,
+    DownloadCanceledException,
+    DownloadManifest,
+)
+
+QUAD_RETRIES = 3
+QUADS_MANIFEST_FILENAME = "quads_manifest.json"
 
 
 class OrderProcessorTask(QgsTask):
@@ -55,52 +62,65 @@ class OrderProcessorTask(QgsTask):
 
     def run(self):
         try:
-            chunk_size = 1024
             locations = self.order.locations()
             download_folder = self.order.download_folder()
-            if os.path.exists(download_folder):
-                shutil.rmtree(download_folder)
-            os.makedirs(download_folder)
-            zip_locations = [
-                (url, path) for url, path in locations if path.lower().endswith("zip")
-            ]
-            for url, path in zip_locations:
-                local_filename = os.path.basename(path)
-                local_fullpath = os.path.join(download_folder, local_filename)
-                self.filenames.append(local_fullpath)
-                r = requests.get(url, stream=True)
-                file_size = r.headers.get("content-length") or 0
-                file_size = int(file_size)
-                percentage_per_chunk = (100.0 / len(zip_locations)) / (
-                    file_size / chunk_size
-                )
-                progress = 0
-                with open(local_fullpath, "wb") as f:
-                    for chunk in r.iter_content(chunk_size):
-                        f.write(chunk)
-                        progress += percentage_per_chunk
-                        self.setProgress(progress)
-                        if self.isCanceled():
-                            return False
+            # The download folder is kept so interrupted downloads can resume
+            os.makedirs(download_folder, exist_ok=True)
+            jobs = []
+            for url, path in locations:
+                if path.lower().endswith("zip"):
+                    local_filename = os.path.basename(path)
+                    local_fullpath = os.path.join(download_folder, local_filename)
+                    jobs.append((url, local_fullpath))
+            self.filenames = [path for url, path in jobs]
+            self.images = []
+            # Each archive is extracted on a separate worker as soon as it has
+            # been downloaded, while the remaining ones are still downloading
+            with ThreadPoolExecutor(max_workers=1) as extractor:
+                extractions = []
+
+                def archive_downloaded(index, path):
+                    extractions.append(extractor.submit(self.extract_archive, path))
 
-            self.process_download()
+                downloader = ChunkedDownloader(
+                    jobs,
+                    is_canceled=self.isCanceled,
+                    progress=self.setProgress,
+                    file_finished=archive_downloaded,
+                )
+                try:
+                    downloader.run()
+                except DownloadCanceledException:
+                    return False
+                if downloader.failures:
+                    raise next(iter(downloader.failures.values()))
+                for extraction in extractions:
+                    self.images.extend(extraction.result())
 
             return True
         except Exception:
             self.exception = traceback.format_exc()
             return False
 
-    def process_download(self):
-        self.msg = []
-        for filename in self.filenames:
-            output_folder = os.path.splitext(filename)[0]
-            if not os.path.exists(output_folder):
-                os.makedirs(output_folder)
+    def extract_archive(self, filename):
+        """
+        Extracts a downloaded archive next to it and returns the images listed
+        in its manifest. The archive is deleted once it has been extracted and
+        its manifest could be read. A corrupt archive is deleted as well, so
+        that it is downloaded again the next time the order is processed.
+        """
+        output_folder = os.path.splitext(filename)[0]
+        os.makedirs(output_folder, exist_ok=True)
+        try:
             with zipfile.ZipFile(filename, "r") as z:
                 z.extractall(output_folder)
+        except zipfile.BadZipFile:
             os.remove(filename)
-            manifest_file = os.path.join(output_folder, "manifest.json")
-            self.images = self.images_from_manifest(manifest_file)
+            raise
+        manifest_file = os.path.join(output_folder, "manifest.json")
+        images = self.images_from_manifest(manifest_file)
+        os.remove(filename)
+        return images
 
     def images_from_manifest(self, manifest_file):
         base_folder = os.path.dirname(manifest_file)
@@ -189,35 +209,63 @@ class QuadsOrderProcessorTask(QgsTask):
         self.exception = None
         self.order = order
         self.filenames = defaultdict(list)
+        self.failed_quads = []
 
     def run(self):
         try:
-            chunk_size = 1024
             locations = self.order.locations()
             download_folder = self.order.download_folder()
-            if os.path.exists(download_folder):
-                shutil.rmtree(download_folder)
-            os.makedirs(download_folder)
-            i = 0
-            total = sum([len(x) for x in locations.values()])
+            os.makedirs(download_folder, exist_ok=True)
+            manifest = DownloadManifest(
+                os.path.join(download_folder, QUADS_MANIFEST_FILENAME)
+            )
+            jobs = []
+            keys = []
+            validators = {}
             for mosaic, files in locations.items():
                 if files:
                     folder = os.path.join(download_folder, mosaic)
                     os.makedirs(folder, exist_ok=True)
                     for url, path in files:
                         local_filename = os.path.basename(path) + ".tif"
-                        local_fullpath = os.path.join(
-                            download_folder, mosaic, local_filename
-                        )
+                        local_fullpath = os.path.join(folder, local_filename)
                         self.filenames[mosaic].append(local_fullpath)
-                        r = requests.get(url, stream=True)
-                        with open(local_fullpath, "wb") as f:
-                            for chunk in r.iter_content(chunk_size):
-                                f.write(chunk)
-                        i += 1
-                        self.setProgress(i * 100 / total)
-                        if self.isCanceled():
-                            return False
+                        key = f"{mosaic}/{local_filename}"
+                        if manifest.is_complete(key, local_fullpath):
+                            validators[len(jobs)] = manifest.etag(key)
+                        elif os.path.exists(local_fullpath):
+                            # Leftover from an unfinished or older download
+                            os.remove(local_fullpath)
+                        jobs.append((url, local_fullpath))
+                        keys.append((key, path))
+            total = len(jobs)
+            completed = []
+
+            def quad_finished(index, path):
+                key, quad_id = keys[index]
+                manifest.record(key, quad_id, path, downloader.etags[index])
+                completed.append(path)
+                self.setProgress(len(completed) * 100 / total)
+
+            downloader = ChunkedDownloader(
+                jobs,
+                max_workers=quad_download_workers(),
+                retries=QUAD_RETRIES,
+                is_canceled=self.isCanceled,
+                file_finished=quad_finished,
+                validators=validators,
+            )
+            try:
+                downloader.run()
+            except DownloadCanceledException:
+                return False
+            finally:
+                manifest.save()
+            for index in sorted(downloader.failures):
+                key, quad_id = keys[index]
+                mosaic = key.rsplit("/", 1)[0]
+                self.filenames[mosaic].remove(jobs[index][1])
+                self.failed_quads.append(quad_id)
 
             return True
         except Exception:
@@ -253,6 +301,8 @@ class QuadsOrderProcessorTask(QgsTask):
             else:
                 if self.order.load_as_virtual:
                     for mosaic, files in self.filenames.items():
+                        if not files:
+                            continue
                         vrtpath = os.path.join(
                             self.order.download_folder(), mosaic, f"{mosaic}.vrt"
                         )
@@ -264,10 +314,25 @@ class QuadsOrderProcessorTask(QgsTask):
                         for layer in mosaiclayers:
                             QgsProject.instance().addMapLayer(layer)
                         # TODO create groups
+                if not self.failed_quads:
+                    iface.messageBar().pushMessage(
+                        "Planet Explorer",
+                        f"Order '{self.order.name}' correctly downloaded and processed",
+                        level=Qgis.Success,
+                        duration=5,
+                    )
+            if self.failed_quads:
+                QgsMessageLog.logMessage(
+                    f"Order '{self.order.name}': {len(self.failed_quads)} quads could"
+                    " not be downloaded:\n" + "\n".join(self.failed_quads),
+                    QGIS_LOG_SECTION_NAME,
+                    Qgis.Warning,
+                )
                 iface.messageBar().pushMessage(
                     "Planet Explorer",
-                    f"Order '{self.order.name}' correctly downloaded and processed",
-                    level=Qgis.Success,
+                    f"Order '{self.order.name}' downloaded, but"
+                    f" {len(self.failed_quads)} quads failed. See log for details",
+                    level=Qgis.Warning,
                     duration=5,
                 )
         elif self.exception is not None:
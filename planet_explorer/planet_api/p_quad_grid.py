@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+    p_quad_grid.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 Planet Inc, https://planet.com
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+__author__ = "Planet Federal"
+__date__ = "October 2026"
+__copyright__ = "(C) 2026 Planet Inc, https://planet.com"
+
+# This will get replaced with a git SHA1 when you do a git archive
+__revision__ = "$Format:%H$"
+
+import logging
+import math
+import os
+
+LOG_LEVEL = os.environ.get("PYTHON_LOG_LEVEL", "WARNING").upper()
+logging.basicConfig(level=LOG_LEVEL)
+log = logging.getLogger(__name__)
+
+ID = "id"
+BBOX = "bbox"
+LINKS = "_links"
+LEVEL = "level"
+GRID = "grid"
+QUAD_SIZE = "quad_size"
+PERCENT_COVERED = "percent_covered"
+ITEMS = "items"
+
+TILE_SIZE = 256
+DEFAULT_QUAD_SIZE = 4096
+MAX_LATITUDE = 85.0511287798066
+
+# Tolerance, in degrees, when comparing computed and listed quad extents
+BBOX_TOLERANCE = 1e-5
+# Quads per page when listing the quads of a mosaic to confirm its coverage
+COVERAGE_PAGE_SIZE = 250
+
+
+class QuadGrid:
+    """
+    Web Mercator quad grid shared by all the mosaics of a basemap series.
+
+    A mosaic at zoom ``level`` is split in square quads of ``quad_size``
+    pixels, identified as ``x-y``, with ``x`` growing eastwards and ``y``
+    growing northwards. Quad ids and extents can therefore be computed
+    locally from the mosaic metadata, without listing them through the API.
+    """
+
+    def __init__(self, level, quad_size=DEFAULT_QUAD_SIZE):
+        self.level = int(level)
+        self.quad_size = int(quad_size)
+        self.size = max(1, (2**self.level) * TILE_SIZE // self.quad_size)
+
+    @staticmethod
+    def from_mosaic(mosaic):
+        """
+        :param mosaic: Mosaic description, as returned by the basemaps API
+        :type mosaic: dict
+        :rtype: QuadGrid | None
+        """
+        level = mosaic.get(LEVEL)
+        if level is None:
+            return None
+        quad_size = (mosaic.get(GRID) or {}).get(QUAD_SIZE, DEFAULT_QUAD_SIZE)
+        return QuadGrid(level, quad_size)
+
+    def key(self):
+        return self.level, self.quad_size
+
+    def __eq__(self, other):
+        return isinstance(other, QuadGrid) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def _x(self, lon):
+        x = int(math.floor((lon + 180.0) / 360.0 * self.size))
+        return min(max(x, 0), self.size - 1)
+
+    def _y(self, lat):
+        lat = min(max(lat, -MAX_LATITUDE), MAX_LATITUDE)
+        merc = math.asinh(math.tan(math.radians(lat)))
+        y = int(math.floor((1 + merc / math.pi) / 2 * self.size))
+        return min(max(y, 0), self.size - 1)
+
+    def _lon(self, x):
+        return x / self.size * 360.0 - 180.0
+
+    def _lat(self, y):
+        return math.degrees(math.atan(math.sinh(math.pi * (2 * y / self.size - 1))))
+
+    def quad_at(self, lon, lat):
+        """Returns the (x, y) indices of the quad containing the given point"""
+        return self._x(lon), self._y(lat)
+
+    def quad_bbox(self, x, y):
+        """Returns the [west, south, east, north] extent of a quad in EPSG:4326"""
+        return [self._lon(x), self._lat(y), self._lon(x + 1), self._lat(y + 1)]
+
+    def quad_indices(self, bbox):
+        """
+        Returns the (x, y) indices of all the quads intersecting a bbox
+
+        :param bbox: [west, south, east, north] extent in EPSG:4326
+        :type bbox: list
+        :rtype: list
+        """
+        xmin, ymin = self.quad_at(bbox[0], bbox[1])
+        xmax, ymax = self.quad_at(bbox[2], bbox[3])
+        return [(x, y) for y in range(ymin, ymax + 1) for x in range(xmin, xmax + 1)]
+
+    def quads_for_bbox(self, bbox):
+        """
+        Returns the quads intersecting a bbox, as a dict of quad bboxes
+        keyed by quad id
+        """
+        return {quad_id(x, y): self.quad_bbox(x, y) for x, y in self.quad_indices(bbox)}
+
+    def intersects(self, x, y, bbox):
+        qbbox = self.quad_bbox(x, y)
+        return (
+            qbbox[0] <= bbox[2]
+            and qbbox[2] >= bbox[0]
+            and qbbox[1] <= bbox[3]
+            and qbbox[3] >= bbox[1]
+        )
+
+    def matches(self, quads, bbox):
+        """
+        Checks that quads listed through the API agree with this grid: every
+        quad id must be a cell intersecting the requested bbox and, when the
+        quad has an extent, it must be the extent computed for that cell.
+        """
+        for quad in quads:
+            indices = parse_quad_id(quad.get(ID))
+            if indices is None or not self.intersects(*indices, bbox):
+                return False
+            listed = quad.get(BBOX)
+            if listed is not None:
+                computed = self.quad_bbox(*indices)
+                if any(abs(a - b) > BBOX_TOLERANCE for a, b in zip(listed, computed)):
+                    return False
+        return True
+
+
+def quad_id(x, y):
+    return f"{x}-{y}"
+
+
+def parse_quad_id(value):
+    """Returns the (x, y) indices of an ``x-y`` quad id, or None"""
+    try:
+        x, y = str(value).split("-")
+        return int(x), int(y)
+    except ValueError:
+        return None
+
+
+def _contains(outer, inner):
+    if outer is None or inner is None:
+        return False
+    return (
+        outer[0] <= inner[0]
+        and outer[1] <= inner[1]
+        and outer[2] >= inner[2]
+        and outer[3] >= inner[3]
+    )
+
+
+def group_mosaics_by_grid(mosaics):
+    """
+    Groups mosaics sharing the same quad grid, keeping the original order of
+    the mosaics inside each group. Mosaics without grid metadata are put in
+    groups of their own.
+
+    :returns: List of lists of indices into ``mosaics``
+    """
+    groups = {}
+    ungrouped = []
+    for i, mosaic in enumerate(mosaics):
+        grid = QuadGrid.from_mosaic(mosaic)
+        if grid is None:
+            ungrouped.append([i])
+        else:
+            groups.setdefault(grid, []).append(i)
+    return list(groups.values()) + ungrouped
+
+
+def derive_quads(reference_mosaic, reference_quads, mosaic, bbox=None):
+    """
+    Builds the quads of ``mosaic`` from the quads listed for another mosaic of
+    the same series, instead of listing them again through the API.
+
+    Quad ids and extents are shared by all the mosaics of a series, so only
+    the links, which point to the mosaic the quad belongs to, have to be
+    rewritten. Quads outside of the extent of ``mosaic`` are dropped, and
+    nothing is derived if ``mosaic`` extends beyond ``reference_mosaic``.
+
+    The coverage of a quad differs from one mosaic to another, and a quad of
+    the reference may be missing in ``mosaic``, so derived quads have no
+    ``percent_covered`` and have to be checked with ``confirm_quads``.
+
+    :param reference_mosaic: Mosaic the quads were listed for
+    :type reference_mosaic: dict
+    :param reference_quads: Quads listed for ``reference_mosaic``
+    :type reference_quads: list
+    :param mosaic: Mosaic to derive quads for
+    :type mosaic: dict
+    :param bbox: Extent the quads were listed for. Defaults to the extent of
+        ``reference_mosaic``
+    :type bbox: list
+    :returns: List of quads, or None if they can't be safely derived and have
+        to be listed through the API
+    """
+    grid = QuadGrid.from_mosaic(reference_mosaic)
+    if grid is None or grid != QuadGrid.from_mosaic(mosaic):
+        return None
+    bbox = bbox or reference_mosaic.get(BBOX)
+    if bbox is None or not grid.matches(reference_quads, bbox):
+        log.debug(
+            f"Quads listed for {reference_mosaic.get(ID)} don't match the local "
+            "quad grid, they can't be reused"
+        )
+        return None
+
+    reference_bbox = reference_mosaic.get(BBOX)
+    mosaic_bbox = mosaic.get(BBOX)
+    same_extent = reference_bbox == mosaic_bbox
+    if not same_extent and not _contains(reference_bbox, mosaic_bbox):
+        return None
+    old_path = f"/mosaics/{reference_mosaic[ID]}/"
+    new_path = f"/mosaics/{mosaic[ID]}/"
+    quads = []
+    for quad in reference_quads:
+        if not same_extent:
+            if not grid.intersects(*parse_quad_id(quad[ID]), mosaic_bbox):
+                continue
+        links = {}
+        for name, link in quad.get(LINKS, {}).items():
+            if isinstance(link, str) and old_path in link:
+                links[name] = link.replace(old_path, new_path)
+            elif isinstance(link, str) and "/mosaics/" in link:
+                # Link to the mosaic in a format we don't know how to rewrite
+                return None
+            else:
+                links[name] = link
+        derived = dict(quad)
+        derived[LINKS] = links
+        derived.pop(PERCENT_COVERED, None)
+        quads.append(derived)
+    return quads
+
+
+def confirmed_quads(quads, listed_quads):
+    """
+    Returns the derived quads that are also in a listing of the quads of
+    their mosaic, with the coverage given by that listing
+
+    :param quads: Quads returned by ``derive_quads``
+    :type quads: list
+    :param listed_quads: Quads listed through the API for the same mosaic,
+        possibly with ``minimal=True``
+    :type listed_quads: list
+    """
+    listed = {quad[ID]: quad for quad in listed_quads}
+    confirmed = []
+    for quad in quads:
+        listed_quad = listed.get(quad[ID])
+        if listed_quad is None:
+            continue
+        quad = dict(quad)
+        if PERCENT_COVERED in listed_quad:
+            quad[PERCENT_COVERED] = listed_quad[PERCENT_COVERED]
+        confirmed.append(quad)
+    return confirmed
+
+
+def confirm_quads(client, mosaic, quads, bbox=None):
+    """
+    Checks quads derived for ``mosaic`` against a minimal listing of its
+    quads, read in pages of COVERAGE_PAGE_SIZE quads, so that quads missing
+    in that mosaic are dropped instead of becoming broken download links.
+    The listing is much lighter than the full one, which is what the links
+    would otherwise be taken from.
+
+    :param client: PlanetClient
+    :param bbox: Extent the quads were derived for. Defaults to the extent of
+        ``mosaic``
+    :returns: List of the quads confirmed, as returned by ``confirmed_quads``
+    """
+    listed = []
+    pages = client.get_quads_for_mosaic(
+        mosaic, bbox, minimal=True, page_size=COVERAGE_PAGE_SIZE
+    )
+    for page in pages.iter():
+        listed.extend(page.get().get(ITEMS, []))
+    return confirmed_quads(quads, listed)
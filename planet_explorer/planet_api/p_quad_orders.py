@@ -4,10 +4,10 @@ import os
 import uuid
 
 from planet.api.models import MosaicQuads
-from qgis.core import QgsApplication
 
-from ..pe_utils import orders_download_folder, user_agent
+from ..pe_utils import orders_download_folder, plugin_settings_folder, user_agent
 from .p_client import PlanetClient
+from .p_quad_grid import confirm_quads, derive_quads
 
 
 class OrderAlreadyExistsException(Exception):
@@ -15,11 +15,7 @@ class OrderAlreadyExistsException(Exception):
 
 
 def _quad_orders_file():
-    folder = os.path.join(
-        os.path.dirname(QgsApplication.qgisUserDatabaseFilePath()), "planetexplorer"
-    )
-    os.makedirs(folder, exist_ok=True)
-    file = os.path.join(folder, "quadorders.json")
+    file = os.path.join(plugin_settings_folder(), "quadorders.json")
     return file
 
 
@@ -134,11 +130,22 @@ class QuadCompleteOrder(QuadOrder):
     def locations(self):
         p_client = PlanetClient.getInstance()
         locations = {}
+        # Mosaics of the same series share their quads, so they are only
+        # listed once per quad grid
+        references = []
         for mosaic in self.mosaics:
-            json_quads = []
-            quads = p_client.get_quads_for_mosaic(mosaic, minimal=True)
-            for page in quads.iter():
-                json_quads.extend(page.get().get(MosaicQuads.ITEM_KEY))
+            json_quads = None
+            for reference, reference_quads in references:
+                json_quads = derive_quads(reference, reference_quads, mosaic)
+                if json_quads is not None:
+                    json_quads = confirm_quads(p_client, mosaic, json_quads)
+                    break
+            if json_quads is None:
+                json_quads = []
+                quads = p_client.get_quads_for_mosaic(mosaic, minimal=True)
+                for page in quads.iter():
+                    json_quads.extend(page.get().get(MosaicQuads.ITEM_KEY))
+                references.append((mosaic, json_quads))
             locations[mosaic[NAME]] = [
                 (quad[LINKS][DOWNLOAD], quad[ID]) for quad in json_quads
             ]
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+    p_scene_store.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 Planet Inc, https://planet.com
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+__author__ = "Planet Federal"
+__date__ = "October 2026"
+__copyright__ = "(C) 2026 Planet Inc, https://planet.com"
+
+# This will get replaced with a git SHA1 when you do a git archive
+__revision__ = "$Format:%H$"
+
+import json
+import logging
+import os
+from datetime import timezone
+
+import iso8601
+import numpy as np
+
+from .p_bbox_index import BBoxIndex
+
+LOG_LEVEL = os.environ.get("PYTHON_LOG_LEVEL", "WARNING").upper()
+logging.basicConfig(level=LOG_LEVEL)
+log = logging.getLogger(__name__)
+
+ID = "id"
+PROPERTIES = "properties"
+GEOMETRY = "geometry"
+ACQUIRED = "acquired"
+PUBLISHED = "published"
+CLOUD_COVER = "cloud_cover"
+ITEM_TYPE = "item_type"
+SATELLITE_ID = "satellite_id"
+
+NO_GEOMETRY = 0
+POLYGON = 1
+MULTIPOLYGON = 2
+GEOMETRY_TYPES = {"polygon": POLYGON, "multipolygon": MULTIPOLYGON}
+
+
+def _datetimes(values):
+    """Parses ISO 8601 UTC timestamps into a datetime64 array, NaT if missing"""
+    try:
+        return np.array(
+            [v.rstrip("Z") if v else "NaT" for v in values], dtype="datetime64[us]"
+        )
+    except ValueError:
+        # Timestamps with explicit offsets, converted one by one
+        parsed = []
+        for v in values:
+            if v:
+                dt = iso8601.parse_date(v).astimezone(timezone.utc)
+                parsed.append(np.datetime64(dt.replace(tzinfo=None), "us"))
+            else:
+                parsed.append(np.datetime64("NaT", "us"))
+        return np.array(parsed, dtype="datetime64[us]")
+
+
+def _floats(values):
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float32)
+
+
+class SceneStore:
+    """
+    Metadata of daily imagery search results, kept in columns instead of a
+    dict per scene.
+
+    Each scene is a record, identified by its position in the store. The
+    fields used to group, sort, filter and draw scenes are kept in parallel
+    numpy arrays, footprints in a packed buffer of coordinates, and the rest
+    of the metadata as compact JSON text, only decoded when needed. The
+    original item dict can be rebuilt for any record with ``image()``.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.ids = []
+        self._records = {}
+        self.item_types = []
+        self.satellites = []
+        # value -> position in item_types and satellites
+        self._item_type_codes = {}
+        self._satellite_codes = {}
+        self.acquired = np.zeros(0, dtype="datetime64[us]")
+        self.published = np.zeros(0, dtype="datetime64[us]")
+        self.cloud_cover = np.zeros(0, dtype=np.float32)
+        self.item_type = np.zeros(0, dtype=np.int16)
+        self.satellite = np.zeros(0, dtype=np.int32)
+        self.downloadable = np.zeros(0, dtype=bool)
+        self.checked = np.zeros(0, dtype=bool)
+        self.bboxes = np.zeros((0, 4))
+        self._metadata = []
+        # Footprints: the rings of record i are rings[scene_rings[i]:
+        # scene_rings[i + 1]], the coordinates of ring j are coords[
+        # ring_coords[j]:ring_coords[j + 1]], and the rings starting a new
+        # polygon are flagged in ring_outer
+        self.geometry_type = np.zeros(0, dtype=np.int8)
+        self.coords = np.zeros((0, 2))
+        self.ring_coords = np.zeros(1, dtype=np.int64)
+        self.ring_outer = np.zeros(0, dtype=bool)
+        self.scene_rings = np.zeros(1, dtype=np.int64)
+        self._index = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _code(names, codes, value):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(names)
+            names.append(value)
+        return code
+
+    def add(self, images, downloadable):
+        """
+        Adds search result items to the store
+
+        :param images: Items, as returned by the search API
+        :type images: list
+        :param downloadable: Whether the assets of each item can be downloaded
+        :type downloadable: list
+        :returns: Records of the added items
+        :rtype: range
+        """
+        first = len(self.ids)
+        if not images:
+            return range(first, first)
+        properties = [image[PROPERTIES] for image in images]
+        self.ids.extend(image[ID] for image in images)
+        self._records.update((image[ID], first + i) for i, image in enumerate(images))
+        self.acquired = np.concatenate(
+            [self.acquired, _datetimes([p.get(ACQUIRED) for p in properties])]
+        )
+        self.published = np.concatenate(
+            [self.published, _datetimes([p.get(PUBLISHED) for p in properties])]
+        )
+        self.cloud_cover = np.concatenate(
+            [self.cloud_cover, _floats([p.get(CLOUD_COVER) for p in properties])]
+        )
+        item_types = [
+            self._code(self.item_types, self._item_type_codes, p[ITEM_TYPE])
+            for p in properties
+        ]
+        self.item_type = np.concatenate(
+            [self.item_type, np.array(item_types, dtype=np.int16)]
+        )
+        satellites = [
+            self._code(self.satellites, self._satellite_codes, p.get(SATELLITE_ID))
+            for p in properties
+        ]
+        self.satellite = np.concatenate(
+            [self.satellite, np.array(satellites, dtype=np.int32)]
+        )
+        self.downloadable = np.concatenate(
+            [self.downloadable, np.array(downloadable, dtype=bool)]
+        )
+        self.checked = np.concatenate([self.checked, np.zeros(len(images), bool)])
+        self._metadata.extend(
+            json.dumps(
+                {k: v for k, v in image.items() if k != GEOMETRY},
+                separators=(",", ":"),
+            )
+            for image in images
+        )
+        self._add_geometries([image.get(GEOMETRY) for image in images])
+        return range(first, len(self.ids))
+
+    def _add_geometries(self, geometries):
+        types = []
+        rings = []
+        outer = []
+        scene_rings = []
+        for geometry in geometries:
+            geometry = geometry or {}
+            geometry_type = GEOMETRY_TYPES.get(
+                geometry.get("type", "").lower(), NO_GEOMETRY
+            )
+            coordinates = geometry.get("coordinates") or []
+            if geometry_type == POLYGON:
+                coordinates = [coordinates]
+            elif geometry_type == NO_GEOMETRY:
+                coordinates = []
+            for polygon in coordinates:
+                for i, ring in enumerate(polygon):
+                    points = np.asarray(ring, dtype=float).reshape(len(ring), -1)
+                    rings.append(points[:, :2])
+                    outer.append(i == 0)
+            types.append(geometry_type)
+            scene_rings.append(len(rings))
+
+        ring_sizes = np.array([len(ring) for ring in rings], dtype=np.int64)
+        page_coords = np.concatenate(rings) if rings else np.zeros((0, 2))
+        ring_offsets = len(self.coords) + np.cumsum(ring_sizes)
+        scene_offsets = len(self.ring_outer) + np.array(scene_rings, dtype=np.int64)
+
+        # Scene extents, from the vertices of all their rings at once
+        bboxes = np.full((len(geometries), 4), np.nan)
+        scene_starts = np.concatenate([[0], scene_rings[:-1]]).astype(np.int64)
+        ring_starts = np.concatenate([[0], np.cumsum(ring_sizes)]).astype(np.int64)
+        coord_starts = ring_starts[scene_starts]
+        coord_ends = ring_starts[np.array(scene_rings, dtype=np.int64)]
+        nonempty = coord_ends > coord_starts
+        if nonempty.any():
+            offsets = coord_starts[nonempty]
+            bboxes[nonempty, :2] = np.minimum.reduceat(page_coords, offsets)
+            bboxes[nonempty, 2:] = np.maximum.reduceat(page_coords, offsets)
+
+        self.geometry_type = np.concatenate(
+            [self.geometry_type, np.array(types, dtype=np.int8)]
+        )
+        self.coords = np.concatenate([self.coords, page_coords])
+        self.ring_coords = np.concatenate([self.ring_coords, ring_offsets])
+        self.ring_outer = np.concatenate([self.ring_outer, np.array(outer, dtype=bool)])
+        self.scene_rings = np.concatenate([self.scene_rings, scene_offsets])
+        self.bboxes = np.concatenate([self.bboxes, bboxes])
+
+    def record(self, image_id):
+        """Returns the record of an item, or None if it is not in the store"""
+        return self._records.get(image_id)
+
+    def metadata(self, record):
+        """Returns the item dict of a record, without its geometry"""
+        return json.loads(self._metadata[record])
+
+    def properties(self, record):
+        return self.metadata(record)[PROPERTIES]
+
+    def datetime(self, record):
+        """Returns the acquisition time of a record, as a naive UTC datetime"""
+        return self.acquired[record].astype(object)
+
+    def item_type_name(self, record):
+        return self.item_types[self.item_type[record]]
+
+    def satellite_name(self, record):
+        return self.satellites[self.satellite[record]]
+
+    def geometry_key(self, record):
+        """Key to memoize the footprint of a record with, as done for items"""
+        return f"{self.item_type_name(record)}/{self.ids[record]}"
+
+    def geometry(self, record):
+        """Returns the footprint of a record, as a GeoJSON geometry"""
+        geometry_type = self.geometry_type[record]
+        if geometry_type == NO_GEOMETRY:
+            return None
+        polygons = []
+        for ring in range(self.scene_rings[record], self.scene_rings[record + 1]):
+            start, end = self.ring_coords[ring], self.ring_coords[ring + 1]
+            coords = self.coords[start:end].tolist()
+            if self.ring_outer[ring]:
+                polygons.append([coords])
+            else:
+                polygons[-1].append(coords)
+        if geometry_type == POLYGON:
+            return {"type": "Polygon", "coordinates": polygons[0] if polygons else []}
+        return {"type": "MultiPolygon", "coordinates": polygons}
+
+    def image(self, record):
+        """Rebuilds the item dict of a record"""
+        image = self.metadata(record)
+        image[GEOMETRY] = self.geometry(record)
+        return image
+
+    def images(self, records):
+        return [self.image(record) for record in records]
+
+    def index(self):
+        """
+        Returns a spatial index over the footprint extents of the records,
+        built again only when records have been added since the last call
+
+        :rtype: BBoxIndex
+        """
+        if self._index is None or len(self._index) != len(self):
+            self._index = BBoxIndex(self.bboxes)
+        return self._index
+
+    def checked_records(self):
+        return np.flatnonzero(self.checked)
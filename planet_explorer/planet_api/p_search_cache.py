@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+    p_search_cache.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 Planet Inc, https://planet.com
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+__author__ = "Planet Federal"
+__date__ = "October 2026"
+__copyright__ = "(C) 2026 Planet Inc, https://planet.com"
+
+# This will get replaced with a git SHA1 when you do a git archive
+__revision__ = "$Format:%H$"
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+
+LOG_LEVEL = os.environ.get("PYTHON_LOG_LEVEL", "WARNING").upper()
+logging.basicConfig(level=LOG_LEVEL)
+log = logging.getLogger(__name__)
+
+# Seconds search results are served from the cache before searching again
+SEARCH_CACHE_TTL = 30 * 60
+SEARCH_CACHE_MAX_ENTRIES = 20
+# Searches returning more items than this are only cached up to this number
+SEARCH_CACHE_MAX_IMAGES = 5000
+# Decimal places kept in coordinates, about 10 cm at the equator
+COORDINATE_PRECISION = 6
+
+REQUEST = "request"
+SORT = "sort"
+FILE = "file"
+CREATED = "created"
+COMPLETE = "complete"
+COUNT = "count"
+
+# Filters whose list of subfilters or values doesn't depend on its order
+_UNORDERED_CONFIGS = ("AndFilter", "OrFilter", "StringInFilter", "PermissionFilter")
+
+
+def _canonical(value):
+    if isinstance(value, float):
+        value = round(value, COORDINATE_PRECISION)
+        return int(value) if value.is_integer() else value
+    if isinstance(value, dict):
+        canonical = {k: _canonical(v) for k, v in value.items()}
+        if value.get("type") in _UNORDERED_CONFIGS and isinstance(
+            canonical.get("config"), list
+        ):
+            canonical["config"] = sorted(
+                canonical["config"], key=lambda v: json.dumps(v, sort_keys=True)
+            )
+        return canonical
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def request_key(request):
+    """
+    Returns a hash identifying a search request, which doesn't change when
+    filters are listed in a different order or coordinates differ by less
+    than the COORDINATE_PRECISION.
+
+    :param request: Body of a quick search request
+    :type request: dict
+    :rtype: str
+    """
+    canonical = _canonical(request)
+    if isinstance(canonical.get("item_types"), list):
+        canonical["item_types"] = sorted(canonical["item_types"])
+    text = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def saved_search_key(saved_search):
+    """
+    Returns a hash identifying the definition of a saved search, which
+    changes when its filters or item types are updated
+
+    :param saved_search: Saved search, as returned by the searches API
+    :type saved_search: dict
+    :rtype: str
+    """
+    return request_key(
+        {"item_types": saved_search["item_types"], "filter": saved_search["filter"]}
+    )
+
+
+def sort_images(images, sort):
+    """
+    Sorts search results locally, the way the search API would for a
+    ``"<field> asc|desc"`` sort order
+    """
+    field, _, order = sort.partition(" ")
+    return sorted(
+        images,
+        key=lambda image: (image["properties"].get(field) or "", image.get("id")),
+        reverse=order == "desc",
+    )
+
+
+class SearchResultCache:
+    """
+    Results of recent searches, stored on disk so they survive QGIS
+    restarts.
+
+    Entries are keyed by a hash of the API key of the account, so that an
+    account is never served results found with another one, plus the
+    canonical hash of the request body and the sort order. They hold the
+    items read so far for that search. An entry is complete once all the
+    pages of the search have been read, in which case it also serves the same
+    search in any other sort order, sorting items locally. Entries expire
+    after ``ttl`` seconds, and the least recently used ones are evicted beyond
+    ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        folder,
+        max_entries=SEARCH_CACHE_MAX_ENTRIES,
+        ttl=SEARCH_CACHE_TTL,
+        max_images=SEARCH_CACHE_MAX_IMAGES,
+    ):
+        self.folder = folder
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_images = max_images
+        self.index_file = os.path.join(folder, "index.json")
+        self.entries = OrderedDict()
+        self.account = ""
+        os.makedirs(folder, exist_ok=True)
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file) as f:
+                    self.entries = OrderedDict(json.load(f))
+            except (OSError, ValueError):
+                log.debug("Search cache index is corrupted, ignoring it")
+        for key in [k for k in self.entries if not self._is_fresh(k)]:
+            self._remove(key)
+
+    def set_account(self, api_key):
+        """Sets the account whose searches are read and stored"""
+        self.account = (
+            hashlib.sha1(api_key.encode("utf-8")).hexdigest() if api_key else ""
+        )
+
+    def _request_key(self, request):
+        return f"{self.account} {request_key(request)}"
+
+    def _key(self, request, sort):
+        return f"{self._request_key(request)} {sort}"
+
+    def _path(self, entry):
+        return os.path.join(self.folder, entry[FILE])
+
+    def _is_fresh(self, key):
+        return time.time() - self.entries[key][CREATED] < self.ttl
+
+    def _read(self, key):
+        if not self._is_fresh(key):
+            self._remove(key)
+            self.save()
+            return None
+        try:
+            with open(self._path(self.entries[key])) as f:
+                images = [json.loads(line) for line in f]
+        except (OSError, ValueError):
+            self._remove(key)
+            self.save()
+            return None
+        self.entries.move_to_end(key)
+        return images
+
+    def get(self, request, sort):
+        """
+        Returns the cached results of a search, as a tuple with the list of
+        items and whether they are all the items the search returns, or None
+        if the search is not cached.
+        """
+        key = self._key(request, sort)
+        if key in self.entries:
+            images = self._read(key)
+            if images is not None:
+                return images, self.entries[key][COMPLETE]
+        # The complete results in another order are just as good
+        prefix = self._request_key(request)
+        for other in list(self.entries):
+            entry = self.entries.get(other)
+            if entry is None or entry[REQUEST] != prefix or not entry[COMPLETE]:
+                continue
+            images = self._read(other)
+            if images is not None:
+                return sort_images(images, sort), True
+        return None
+
+    def put(self, request, sort, images, complete):
+        """
+        Stores the items read so far for a search, replacing those stored
+        before. Items beyond ``max_images`` are not stored, and the entry is
+        then not complete.
+        """
+        self._remove(self._key(request, sort))
+        self.append(request, sort, images, complete)
+
+    def append(self, request, sort, images, complete):
+        """
+        Adds the items of a new page of results to those stored for a
+        search. Items are stored as JSON lines, so that a page is written
+        without rewriting the previous ones.
+        """
+        key = self._key(request, sort)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = {
+                REQUEST: self._request_key(request),
+                SORT: sort,
+                FILE: hashlib.sha1(key.encode("utf-8")).hexdigest() + ".jsonl",
+                CREATED: time.time(),
+                COMPLETE: False,
+                COUNT: 0,
+            }
+        elif entry[COMPLETE]:
+            return
+        room = self.max_images - entry[COUNT]
+        if len(images) > room:
+            images = images[:room]
+            complete = False
+        try:
+            with open(self._path(entry), "a" if entry[COUNT] else "w") as f:
+                for image in images:
+                    f.write(json.dumps(image, separators=(",", ":")))
+                    f.write("\n")
+        except OSError:
+            log.debug("Could not write search results to disk cache")
+            self._remove(key)
+            return
+        entry[COUNT] += len(images)
+        entry[COMPLETE] = complete
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries)))
+        self.save()
+
+    def clear(self):
+        for key in list(self.entries):
+            self._remove(key)
+        self.save()
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            try:
+                os.remove(self._path(entry))
+            except OSError:
+                pass
+
+    def save(self):
+        tmp_file = self.index_file + ".tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(list(self.entries.items()), f)
+            os.replace(tmp_file, self.index_file)
+        except OSError:
+            log.debug("Could not save search cache index")
+
+
+PUBLISHED = "published"
+SEARCH = "search"
+
+
+def published_since_request(request, published):
+    """
+    Returns a copy of a search request that only matches the items published
+    after the given timestamp
+    """
+    since = {
+        "type": "DateRangeFilter",
+        "field_name": PUBLISHED,
+        "config": {"gt": published},
+    }
+    incremental = dict(request)
+    incremental["filter"] = {"type": "AndFilter", "config": [request["filter"], since]}
+    return incremental
+
+
+def last_published(images):
+    """Returns the latest ``published`` timestamp of a list of items, or None"""
+    published = [image["properties"].get(PUBLISHED) for image in images]
+    return max([p for p in published if p], default=None)
+
+
+def merge_images(images, new_images):
+    """
+    Merges newly found items into a list of items, replacing the items that
+    are already in it by their new version
+    """
+    new_ids = {image["id"] for image in new_images}
+    return [image for image in images if image["id"] not in new_ids] + new_images
+
+
+class SavedSearchHistory:
+    """
+    Complete results of the last run of each saved search, stored on disk
+    with the latest ``published`` timestamp among them.
+
+    They are kept without expiration, so the next run of a saved search only
+    has to look for the items published since then and merge them into the
+    stored results. Results are only valid for the request they were stored
+    for, as the filters of a loaded saved search can be edited before
+    running it, and for the definition of the saved search they were found
+    with, as it can be updated.
+
+    An index with the keys and the ``published`` timestamp of each saved
+    search is kept in memory, so the state of a saved search is known
+    without reading its results.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.index_file = os.path.join(folder, "index.json")
+        self.entries = {}
+        os.makedirs(folder, exist_ok=True)
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file) as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                log.debug("Saved search history index is corrupted, ignoring it")
+
+    def _path(self, search_id):
+        filename = hashlib.sha1(search_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.folder, filename + ".json")
+
+    def get(self, search_id, request=None):
+        """
+        Returns the stored results of a saved search, as a tuple with the
+        list of items and the latest ``published`` timestamp among them, or
+        None if there are no results stored for that search and request.
+        """
+        entry = self.entries.get(search_id)
+        if entry is None:
+            return None
+        if request is not None and entry[REQUEST] != request_key(request):
+            return None
+        try:
+            with open(self._path(search_id)) as f:
+                images = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return images, entry[PUBLISHED]
+
+    def last_published(self, saved_search):
+        """
+        Returns the latest ``published`` timestamp among the results stored
+        for a saved search, or None if there are none stored for its current
+        definition
+        """
+        entry = self.entries.get(saved_search["id"])
+        if entry is None or entry[SEARCH] != saved_search_key(saved_search):
+            return None
+        return entry[PUBLISHED]
+
+    def put(self, saved_search, request, images, published=None):
+        """
+        Stores the complete results of a saved search, found with the given
+        request. The latest ``published`` timestamp is taken from the items,
+        unless a later one is given.
+        """
+        search_id = saved_search["id"]
+        published = max(
+            [p for p in (published, last_published(images)) if p], default=None
+        )
+        if published is None:
+            # Nothing to compare the items published later with
+            self.remove(search_id)
+            return
+        tmp_file = self._path(search_id) + ".tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(images, f)
+            os.replace(tmp_file, self._path(search_id))
+        except OSError:
+            log.debug(f"Could not store results of saved search {search_id}")
+            return
+        self.entries[search_id] = {
+            SEARCH: saved_search_key(saved_search),
+            REQUEST: request_key(request),
+            PUBLISHED: published,
+        }
+        self.save()
+
+    def remove(self, search_id):
+        if self.entries.pop(search_id, None) is not None:
+            self.save()
+        try:
+            os.remove(self._path(search_id))
+        except OSError:
+            pass
+
+    def save(self):
+        tmp_file = self.index_file + ".tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_file, self.index_file)
+        except OSError:
+            log.debug("Could not save saved search history index")
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+    p_search_tasks.py
+    ---------------------
+    Date                 : October 2026
+    Copyright            : (C) 2026 Planet Inc, https://planet.com
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+__author__ = "Planet Federal"
+__date__ = "October 2026"
+__copyright__ = "(C) 2026 Planet Inc, https://planet.com"
+
+# This will get replaced with a git SHA1 when you do a git archive
+__revision__ = "$Format:%H$"
+
+import logging
+import os
+import traceback
+
+from qgis.core import QgsTask
+
+from .p_search_cache import (
+    SEARCH_CACHE_MAX_IMAGES,
+    last_published,
+    published_since_request,
+)
+
+LOG_LEVEL = os.environ.get("PYTHON_LOG_LEVEL", "WARNING").upper()
+logging.basicConfig(level=LOG_LEVEL)
+log = logging.getLogger(__name__)
+
+DELTA_PAGE_SIZE = 250
+
+
+class SearchStatsTask(QgsTask):
+    """
+    Reads the total number of items matching a daily imagery search from the
+    stats endpoint. It runs alongside the task reading the first page of
+    results, so the count doesn't delay them.
+    """
+
+    def __init__(self, client, request):
+        super().__init__("Counting Planet imagery", QgsTask.CanCancel)
+        self.client = client
+        self.request = request
+        self.total_count = None
+        self.exception = None
+
+    def run(self):
+        try:
+            stats_request = {"interval": "year"}
+            stats_request.update(self.request)
+            resp = self.client.stats(stats_request).get()
+            self.total_count = sum([b["count"] for b in resp["buckets"]])
+            return not self.isCanceled()
+        except Exception:
+            self.exception = traceback.format_exc()
+            return False
+
+
+class SearchDeltaTask(QgsTask):
+    """
+    Reads all the items matching a search that were published after a given
+    timestamp, to update the stored results of a previous run of the search.
+
+    Once ``taskCompleted`` is emitted, ``images`` holds the new items, or
+    None if there are more than ``max_images`` of them, and ``published``
+    the latest publication timestamp found.
+    """
+
+    def __init__(self, client, request, published, max_images=SEARCH_CACHE_MAX_IMAGES):
+        super().__init__("Searching new Planet imagery", QgsTask.CanCancel)
+        self.client = client
+        self.request = published_since_request(request, published)
+        self.max_images = max_images
+        self.images = []
+        self.published = published
+        self.exception = None
+
+    def run(self):
+        try:
+            response = self.client.quick_search(self.request, page_size=DELTA_PAGE_SIZE)
+            for page in response.iter():
+                if self.isCanceled():
+                    return False
+                self.images.extend(page.get().get(page.ITEM_KEY))
+                if len(self.images) > self.max_images:
+                    self.images = None
+                    return True
+            self.published = last_published(self.images) or self.published
+            return not self.isCanceled()
+        except Exception:
+            self.exception = traceback.format_exc()
+            return False
+
+
+class SearchPageTask(QgsTask):
+    """
+    Reads a page of daily imagery search results off the main thread.
+
+    Without ``pages``, the search is started and its first page read.
+    Otherwise, the next page is read from the given ``pages`` iterator of a
+    search started by a previous task.
+
+    The outcome is read from the task attributes once ``taskCompleted`` is
+    emitted: ``images``, ``has_more`` and ``pages``, to pass to the task
+    reading the next page.
+
+    When a new search is started, its first ``skip`` items, already known
+    from a previous run of the same search, are read but not returned.
+    """
+
+    def __init__(self, client, request, sort=None, page_size=None, pages=None, skip=0):
+        description = (
+            "Searching Planet imagery" if pages is None else "Loading more results"
+        )
+        super().__init__(description, QgsTask.CanCancel)
+        self.client = client
+        self.request = request
+        self.sort = sort
+        self.page_size = page_size
+        self.pages = pages
+        self.skip = skip
+        self.images = []
+        self.has_more = False
+        self.exception = None
+
+    def run(self):
+        try:
+            if self.pages is None:
+                response = self.client.quick_search(
+                    self.request, page_size=self.page_size, sort=self.sort
+                )
+                self.pages = response.iter()
+            if self.isCanceled():
+                return False
+            while True:
+                page = next(self.pages, None)
+                if page is None:
+                    self.has_more = False
+                    break
+                body = page.get()
+                images = body.get(page.ITEM_KEY)
+                self.has_more = body[page.LINKS_KEY].get(page.NEXT_KEY) is not None
+                skip, self.skip = self.skip, max(0, self.skip - len(images))
+                if skip < len(images) or not self.has_more:
+                    self.images = images[skip:]
+                    break
+                if self.isCanceled():
+                    return False
+            return not self.isCanceled()
+        except Exception:
+            self.exception = traceback.format_exc()
+            return False
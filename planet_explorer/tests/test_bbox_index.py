@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from planet_explorer.planet_api.p_bbox_index import BBoxIndex
+
+
+def _brute_force(bboxes, xmin, ymin, xmax, ymax):
+    return np.flatnonzero(
+        (bboxes[:, 0] <= xmax)
+        & (bboxes[:, 2] >= xmin)
+        & (bboxes[:, 1] <= ymax)
+        & (bboxes[:, 3] >= ymin)
+    )
+
+
+@pytest.mark.parametrize("count", [0, 1, 15, 16, 17, 300, 5000])
+def test_intersecting_matches_brute_force(count):
+    rng = np.random.default_rng(count)
+    origins = rng.uniform(-180, 170, (count, 2))
+    bboxes = np.hstack([origins, origins + rng.uniform(0, 10, (count, 2))])
+    index = BBoxIndex(bboxes)
+    for box in [(-10, -10, 10, 10), (0, 0, 0, 0), (-200, -200, 200, 200)]:
+        expected = _brute_force(bboxes, *box)
+        np.testing.assert_array_equal(index.intersecting(*box), expected)
+
+
+def test_point_and_box_queries():
+    bboxes = np.array(
+        [
+            [0, 0, 10, 10],
+            [5, 5, 15, 15],
+            [np.nan, np.nan, np.nan, np.nan],
+            [20, 20, 30, 30],
+        ]
+    )
+    index = BBoxIndex(bboxes, node_size=2)
+    assert len(index) == 4
+    assert list(index.containing(7, 7)) == [0, 1]
+    assert list(index.containing(25, 25)) == [3]
+    assert list(index.containing(17, 17)) == []
+    assert list(index.within(-1, -1, 16, 16)) == [0, 1]
+    assert list(index.within(-1, -1, 11, 11)) == [0]
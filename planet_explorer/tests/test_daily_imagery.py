@@ -6,7 +6,7 @@ import json
 from qgis.PyQt import QtCore
 from qgis.core import QgsProject, QgsVectorLayer
 
-from planet_explorer.tests.utils import qgis_debug_wait
+from planet_explorer.tests.utils import qgis_debug_wait, wait_for_search
 from planet_explorer.gui.pe_range_slider import PlanetExplorerRangeSlider
 from planet_explorer.gui.pe_filters import PlanetAOIFilter
 
@@ -48,9 +48,10 @@ def test_search_default_filter(
     qtbot.keyClicks(dock_widget._aoi_filter.leAOI, sample_aoi)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
     qtbot.mouseClick(dock_widget.btnSearch, QtCore.Qt.LeftButton)
+    wait_for_search(qtbot, dock_widget)
     # just verify that at least some images are showing
     qgis_debug_wait(qtbot, qgis_debug_enabled)
-    assert dock_widget.searchResultsWidget.tree.topLevelItemCount() > 1
+    assert dock_widget.searchResultsWidget.tree.model().rowCount() > 1
     images_found = int(
         dock_widget.searchResultsWidget.lblImageCount.text().split(" ")[0]
     )
@@ -86,12 +87,13 @@ def test_search_date_time_filter(
     qtbot.mouseClick(dock_widget.btnBackFromFilters, QtCore.Qt.LeftButton)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
     qtbot.mouseClick(dock_widget.btnSearch, QtCore.Qt.LeftButton)
+    wait_for_search(qtbot, dock_widget)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
 
     # make sure all items from the search are correct
-    results_tree = dock_widget.searchResultsWidget.tree
-    for index in range(results_tree.topLevelItemCount()):
-        for image in results_tree.topLevelItem(index).images():
+    results_model = dock_widget.searchResultsWidget.tree.model()
+    for index in range(results_model.rowCount()):
+        for image in results_model.node(results_model.index(index, 0)).images():
             assert (
                 datetime.datetime.strptime(
                     image["properties"]["published"], DATE_TIME_FORMAT
@@ -151,14 +153,15 @@ def test_search_item_type_filter(
     qtbot.mouseClick(dock_widget.btnBackFromFilters, QtCore.Qt.LeftButton)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
     qtbot.mouseClick(dock_widget.btnSearch, QtCore.Qt.LeftButton)
+    wait_for_search(qtbot, dock_widget)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
 
     # make sure all items from the search are correct
-    results_tree = dock_widget.searchResultsWidget.tree
-    assert results_tree.topLevelItemCount() >= 1
+    results_model = dock_widget.searchResultsWidget.tree.model()
+    assert results_model.rowCount() >= 1
 
-    for index in range(results_tree.topLevelItemCount()):
-        assert results_tree.topLevelItem(index).itemtype == item_type
+    for index in range(results_model.rowCount()):
+        assert results_model.node(results_model.index(index, 0)).itemtype == item_type
 
 
 @pytest.mark.parametrize("band", ["4Band", "8Band"])
@@ -201,13 +204,14 @@ def test_search_spectral_band_filter(
     qtbot.mouseClick(dock_widget.btnBackFromFilters, QtCore.Qt.LeftButton)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
     qtbot.mouseClick(dock_widget.btnSearch, QtCore.Qt.LeftButton)
+    wait_for_search(qtbot, dock_widget)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
 
     # make sure all items from the search are correct
-    results_tree = dock_widget.searchResultsWidget.tree
-    assert results_tree.topLevelItemCount() >= 1
+    results_model = dock_widget.searchResultsWidget.tree.model()
+    assert results_model.rowCount() >= 1
 
-    for image in results_tree.topLevelItem(0).images():
+    for image in results_model.node(results_model.index(0, 0)).images():
         if band == "4Band":
             assert "basic_analytic_4b" in image["assets"]
         if band == "8Band":
@@ -254,15 +258,16 @@ def test_search_instrument_filter(
     qtbot.mouseClick(dock_widget.btnBackFromFilters, QtCore.Qt.LeftButton)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
     qtbot.mouseClick(dock_widget.btnSearch, QtCore.Qt.LeftButton)
+    wait_for_search(qtbot, dock_widget)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
 
     # if no images found, just skip the test
     # TODO: extend the date range?
-    results_tree = dock_widget.searchResultsWidget.tree
-    if results_tree.topLevelItemCount() == 0:
+    results_model = dock_widget.searchResultsWidget.tree.model()
+    if results_model.rowCount() == 0:
         pytest.skip(f"No images found with instrument: {instrument}")
 
-    for image in results_tree.topLevelItem(0).images():
+    for image in results_model.node(results_model.index(0, 0)).images():
         assert instrument == image["properties"]["instrument"]
 
 
@@ -290,13 +295,14 @@ def test_search_item_id_filter(
     qtbot.mouseClick(dock_widget.btnBackFromFilters, QtCore.Qt.LeftButton)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
     qtbot.mouseClick(dock_widget.btnSearch, QtCore.Qt.LeftButton)
+    wait_for_search(qtbot, dock_widget)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
 
     # make sure all items from the search are correct
-    results_tree = dock_widget.searchResultsWidget.tree
-    assert results_tree.topLevelItemCount() == 1
+    results_model = dock_widget.searchResultsWidget.tree.model()
+    assert results_model.rowCount() == 1
     # make sure the item id for the returned image is correct
-    assert results_tree.topLevelItem(0).images()[0]["id"] == item_id
+    assert results_model.node(results_model.index(0, 0)).images()[0]["id"] == item_id
 
 
 @pytest.mark.parametrize(
@@ -349,12 +355,13 @@ def test_search_env_conditions_filter(
     qtbot.mouseClick(dock_widget.btnBackFromFilters, QtCore.Qt.LeftButton)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
     qtbot.mouseClick(dock_widget.btnSearch, QtCore.Qt.LeftButton)
+    wait_for_search(qtbot, dock_widget)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
 
     # make sure all items from the search are correct
-    results_tree = dock_widget.searchResultsWidget.tree
-    for index in range(results_tree.topLevelItemCount()):
-        for image in results_tree.topLevelItem(index).images():
+    results_model = dock_widget.searchResultsWidget.tree.model()
+    for index in range(results_model.rowCount()):
+        for image in results_model.node(results_model.index(index, 0)).images():
             assert image["properties"][data_api_name] <= max_
             assert image["properties"][data_api_name] >= min_
 
@@ -372,15 +379,16 @@ def test_preview_daily_imagery(
     qtbot.keyClicks(dock_widget._aoi_filter.leAOI, sample_aoi)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
     qtbot.mouseClick(dock_widget.btnSearch, QtCore.Qt.LeftButton)
+    wait_for_search(qtbot, dock_widget)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
 
     # grab the first result and add it to the canvas
-    results_tree = dock_widget.searchResultsWidget.tree
-    item_widget = results_tree.itemWidget(results_tree.topLevelItem(0), 0)
-    qtbot.mouseClick(item_widget.labelZoomTo, QtCore.Qt.LeftButton)
+    results_widget = dock_widget.searchResultsWidget
+    index = results_widget.tree.model().index(0, 0)
+    results_widget.zoom_to_index(index)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
 
-    qtbot.mouseClick(item_widget.labelAddPreview, QtCore.Qt.LeftButton)
+    results_widget.add_preview_for_index(index)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
 
     layers = QgsProject.instance().mapLayers().values()
@@ -399,6 +407,7 @@ def test_search_wrong_aoi(qtbot, logged_in_explorer_dock_widget, qgis_debug_enab
     qtbot.keyClicks(dock_widget._aoi_filter.leAOI, "wrong AOI")
     qgis_debug_wait(qtbot, qgis_debug_enabled)
     qtbot.mouseClick(dock_widget.btnSearch, QtCore.Qt.LeftButton)
+    wait_for_search(qtbot, dock_widget)
 
 
 @pytest.mark.parametrize(
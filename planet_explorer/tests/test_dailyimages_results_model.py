@@ -0,0 +1,60 @@
+from qgis.core import QgsGeometry, QgsPointXY, QgsRectangle
+from qgis.PyQt.QtCore import Qt
+
+from planet_explorer.gui.pe_dailyimages_results_model import DailyImagesResultsModel
+from planet_explorer.gui.pe_results_configuration_dialog import PlanetNodeMetadata
+
+
+def _image(image_id, xmin, ymin, xmax, ymax, satellite="sat1", downloadable=True):
+    return {
+        "id": image_id,
+        "properties": {
+            "acquired": "2026-01-02T10:00:00Z",
+            "item_type": "PSScene",
+            "satellite_id": satellite,
+        },
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [
+                [[xmin, ymin], [xmax, ymin], [xmax, ymax], [xmin, ymax], [xmin, ymin]]
+            ],
+        },
+        "_links": {},
+        "_permissions": ["assets.ortho_analytic_4b:download"] if downloadable else [],
+    }
+
+
+IMAGES = [
+    _image("scene1", 0, 0, 2, 2),
+    _image("scene2", 1, 1, 3, 3),
+    _image("scene3", 10, 10, 11, 11, satellite="sat2", downloadable=False),
+]
+
+
+def _model():
+    model = DailyImagesResultsModel([PlanetNodeMetadata.CLOUD_PERCENTAGE])
+    model.add_images(IMAGES)
+    return model
+
+
+def test_records_on_map():
+    model = _model()
+    assert model.records_at(QgsPointXY(0.5, 0.5)) == [0]
+    assert model.records_at(QgsPointXY(1.5, 1.5)) == [0, 1]
+    assert model.records_at(QgsPointXY(5, 5)) == []
+    box = QgsGeometry.fromRect(QgsRectangle(2.5, 2.5, 10.5, 10.5))
+    assert model.records_intersecting(box) == [1, 2]
+    assert model.records_within(QgsRectangle(-1, -1, 2.5, 2.5)) == [0]
+
+
+def test_set_records_checked():
+    model = _model()
+    model.set_records_checked([0, 1, 2])
+    # Scenes that can't be downloaded are not checked
+    assert model.selected_count() == 2
+    assert model.store.checked.tolist() == [True, True, False]
+    satellite = model.scene(0).parent
+    assert model.index_for_node(satellite).data(Qt.CheckStateRole) == Qt.Checked
+    model.set_records_checked([1], checked=False)
+    assert model.selected_count() == 1
+    assert satellite.check_state == Qt.PartiallyChecked
@@ -0,0 +1,213 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from planet_explorer.planet_api import p_downloader
+from planet_explorer.planet_api.p_downloader import (
+    PART_SUFFIX,
+    ChunkedDownloader,
+    DownloadCanceledException,
+)
+
+DATA = bytes(range(256)) * 1200
+ETAG = '"v1"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        count = sum(1 for path, _ in self.server.requests if path == self.path)
+        if self.path == "/missing":
+            self.send_error(404)
+            return
+        if self.path == "/dropped" and count == 1:
+            # Announces the whole file, then closes the connection halfway
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(DATA)))
+            self.end_headers()
+            self.wfile.write(DATA[: len(DATA) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        start = 0
+        byte_range = self.headers.get("Range")
+        if byte_range:
+            start = int(byte_range.split("=")[1].rstrip("-"))
+            if start >= len(DATA):
+                self.send_error(416)
+                return
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(DATA) - 1}/{len(DATA)}"
+            )
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(DATA) - start))
+        self.send_header("ETag", '"v2"' if self.path == "/changed" else ETAG)
+        self.end_headers()
+        self.wfile.write(DATA[start:])
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(p_downloader, "backoff_delay", lambda attempt: 0)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_download(server, tmp_path):
+    path = str(tmp_path / "file.bin")
+    progress = []
+    downloader = ChunkedDownloader(
+        [(f"{server.url}/file", path)], progress=progress.append
+    )
+    assert downloader.run() == [path]
+    assert _read(path) == DATA
+    assert not os.path.exists(path + PART_SUFFIX)
+    assert downloader.etags == [ETAG]
+    assert progress[-1] == 100
+
+
+def test_resume_from_part(server, tmp_path):
+    path = str(tmp_path / "file.bin")
+    with open(path + PART_SUFFIX, "wb") as f:
+        f.write(DATA[:1000])
+    ChunkedDownloader([(f"{server.url}/file", path)]).run()
+    assert _read(path) == DATA
+    assert server.requests[0][1]["Range"] == "bytes=1000-"
+
+
+def test_complete_part_gets_416(server, tmp_path):
+    path = str(tmp_path / "file.bin")
+    with open(path + PART_SUFFIX, "wb") as f:
+        f.write(DATA)
+    ChunkedDownloader([(f"{server.url}/file", path)]).run()
+    assert _read(path) == DATA
+    assert len(server.requests) == 1
+
+
+def test_no_retry_on_404(server, tmp_path):
+    path = str(tmp_path / "missing.bin")
+    downloader = ChunkedDownloader([(f"{server.url}/missing", path)], retries=3)
+    assert downloader.run() == [None]
+    assert len(server.requests) == 1
+    assert not os.path.exists(path)
+    assert isinstance(downloader.failures[0], requests.HTTPError)
+
+
+def test_failed_file_does_not_stop_others(server, tmp_path):
+    paths = [str(tmp_path / f"{i}.bin") for i in range(4)]
+    jobs = [(f"{server.url}/file{i}", path) for i, path in enumerate(paths)]
+    jobs[1] = (f"{server.url}/missing", paths[1])
+    finished = []
+    downloader = ChunkedDownloader(
+        jobs, max_workers=2, file_finished=lambda i, path: finished.append(i)
+    )
+    assert downloader.run() == [paths[0], None, paths[2], paths[3]]
+    assert list(downloader.failures) == [1]
+    assert sorted(finished) == [0, 2, 3]
+    for i in (0, 2, 3):
+        assert _read(paths[i]) == DATA
+
+
+def test_transport_error_aborts(tmp_path):
+    path = str(tmp_path / "file.bin")
+    # Nothing listens on port 9 of the loopback interface
+    downloader = ChunkedDownloader([("http://127.0.0.1:9/file", path)], retries=0)
+    with pytest.raises(requests.ConnectionError):
+        downloader.run()
+    assert downloader.failures == {}
+
+
+def test_retry_after_dropped_connection(server, tmp_path):
+    path = str(tmp_path / "dropped.bin")
+    ChunkedDownloader([(f"{server.url}/dropped", path)], retries=2).run()
+    assert _read(path) == DATA
+    assert len(server.requests) == 2
+    # The second request resumes after the bytes written the first time
+    resumed = int(server.requests[1][1]["Range"].split("=")[1].rstrip("-"))
+    assert 0 < resumed <= len(DATA) // 2
+
+
+def test_existing_file_not_modified(server, tmp_path):
+    path = str(tmp_path / "file.bin")
+    with open(path, "wb") as f:
+        f.write(b"local copy")
+    downloader = ChunkedDownloader([(f"{server.url}/file", path)], validators={0: ETAG})
+    downloader.run()
+    assert _read(path) == b"local copy"
+    assert server.requests[0][1]["If-None-Match"] == ETAG
+    assert downloader.etags == [ETAG]
+
+
+def test_existing_file_changed(server, tmp_path):
+    path = str(tmp_path / "file.bin")
+    with open(path, "wb") as f:
+        f.write(b"local copy")
+    downloader = ChunkedDownloader(
+        [(f"{server.url}/changed", path)], validators={0: '"v0"'}
+    )
+    downloader.run()
+    assert _read(path) == DATA
+    assert downloader.etags == ['"v2"']
+
+
+def test_existing_file_changed_discards_part(server, tmp_path):
+    path = str(tmp_path / "file.bin")
+    with open(path, "wb") as f:
+        f.write(b"local copy")
+    with open(path + PART_SUFFIX, "wb") as f:
+        f.write(b"stale partial download")
+    downloader = ChunkedDownloader(
+        [(f"{server.url}/changed", path)], validators={0: '"v0"'}
+    )
+    downloader.run()
+    assert _read(path) == DATA
+    assert not os.path.exists(path + PART_SUFFIX)
+    assert "Range" not in server.requests[-1][1]
+
+
+def test_existing_file_without_validator(server, tmp_path):
+    path = str(tmp_path / "file.bin")
+    with open(path, "wb") as f:
+        f.write(b"local copy")
+    ChunkedDownloader([(f"{server.url}/file", path)]).run()
+    assert _read(path) == b"local copy"
+    assert server.requests == []
+
+
+def test_cancel(server, tmp_path):
+    path = str(tmp_path / "file.bin")
+    canceled = threading.Event()
+    downloader = ChunkedDownloader(
+        [(f"{server.url}/file", path)],
+        is_canceled=canceled.is_set,
+        progress=lambda value: canceled.set(),
+    )
+    with pytest.raises(DownloadCanceledException):
+        downloader.run()
+    assert not os.path.exists(path)
+    # What was received is kept, to be resumed by the next run
+    assert 0 < os.path.getsize(path + PART_SUFFIX) < len(DATA)
@@ -0,0 +1,39 @@
+import numpy as np
+from qgis.core import QgsRectangle
+from qgis.PyQt.QtGui import QColor
+
+from planet_explorer.gui.pe_footprints_item import FootprintsCanvasItem
+
+EXTENTS = [
+    [0, 0, 10, 10],
+    [20, 0, 30, 10],
+    [np.nan, np.nan, np.nan, np.nan],
+]
+
+
+def test_footprints_item_state(qgis_canvas):
+    item = FootprintsCanvasItem(qgis_canvas, QColor(157, 165, 0), QColor(0, 0, 0))
+    item.set_extents(EXTENTS)
+    assert item.rect() == QgsRectangle(0, 0, 30, 10)
+    assert not item.checked.any()
+
+    item.set_checked(1, True)
+    item.set_highlighted(0)
+    assert item.checked.tolist() == [False, True, False]
+    assert item.highlighted == 0
+
+    # New footprints start unchecked
+    item.set_extents(EXTENTS[:1])
+    assert item.checked.tolist() == [False]
+    assert item.highlighted is None
+
+
+def test_footprints_item_visible(qgis_canvas):
+    item = FootprintsCanvasItem(qgis_canvas, QColor(157, 165, 0), QColor(0, 0, 0))
+    item.set_extents(EXTENTS)
+    qgis_canvas.setExtent(QgsRectangle(-5, -5, 15, 15))
+    assert item._visible().tolist() == [True, False, False]
+    corners = item._item_coordinates(item.extents[:1])
+    assert corners.shape == (1, 4, 2)
+    # Map y grows upwards, item y downwards
+    assert corners[0, 0, 1] > corners[0, 3, 1]
@@ -0,0 +1,62 @@
+import pytest
+
+from planet_explorer.pe_utils import (
+    _qgsgeometry_from_json_geom_string,
+    qgsgeometry_for_image,
+    qgsgeometry_from_geojson,
+)
+
+POLYGON = {
+    "type": "Polygon",
+    "coordinates": [
+        [[18.6, -33.8], [18.6, -34.1], [19.2, -34.1], [19.2, -33.8], [18.6, -33.8]],
+        [[18.8, -33.9], [18.9, -33.9], [18.9, -34.0], [18.8, -33.9]],
+    ],
+}
+
+MULTIPOLYGON = {
+    "type": "MultiPolygon",
+    "coordinates": [
+        [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]],
+        [[[2, 2], [3, 2], [3, 3], [2, 2]]],
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    "json_geom",
+    [
+        pytest.param(POLYGON, id="polygon_with_hole"),
+        pytest.param(MULTIPOLYGON, id="multipolygon"),
+    ],
+)
+def test_qgsgeometry_from_geojson_matches_json_parsing(json_geom):
+    geom = qgsgeometry_from_geojson(json_geom)
+    expected = _qgsgeometry_from_json_geom_string(json_geom)
+    assert geom.wkbType() == expected.wkbType()
+    assert geom.equals(expected)
+    assert geom.area() == pytest.approx(expected.area())
+
+
+@pytest.mark.parametrize(
+    "json_geom",
+    [
+        pytest.param({"type": "Point", "coordinates": [0, 0]}, id="point"),
+        pytest.param({"type": "Polygon", "coordinates": []}, id="no_coordinates"),
+    ],
+)
+def test_qgsgeometry_from_geojson_empty(json_geom):
+    assert qgsgeometry_from_geojson(json_geom).isEmpty()
+
+
+def test_qgsgeometry_for_image_is_memoized():
+    image = {
+        "id": "20220710_170008_10_2403",
+        "properties": {"item_type": "PSScene"},
+        "geometry": POLYGON,
+    }
+    geom = qgsgeometry_for_image(image)
+    geom.translate(10, 10)
+    # the memoized geometry is not affected by changes to returned copies
+    image["geometry"] = MULTIPOLYGON
+    assert qgsgeometry_for_image(image).equals(qgsgeometry_from_geojson(POLYGON))
@@ -0,0 +1,44 @@
+import json
+import os
+import zipfile
+
+import pytest
+
+from planet_explorer.planet_api.p_order_tasks import OrderProcessorTask
+
+
+class _Order:
+    def name(self):
+        return "order"
+
+
+def test_extract_archive(tmp_path):
+    archive = str(tmp_path / "order.zip")
+    manifest = {
+        "files": [
+            {
+                "path": "files/image.tif",
+                "media_type": "image/tiff",
+                "annotations": {
+                    "planet/asset_type": "ortho_analytic_4b",
+                    "planet/item_type": "PSScene",
+                },
+            }
+        ]
+    }
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("manifest.json", json.dumps(manifest))
+        z.writestr("files/image.tif", b"")
+    images = OrderProcessorTask(_Order()).extract_archive(archive)
+    assert images == [(str(tmp_path / "order" / "files" / "image.tif"), "PSScene")]
+    assert not os.path.exists(archive)
+
+
+def test_extract_corrupt_archive(tmp_path):
+    archive = str(tmp_path / "order.zip")
+    with open(archive, "wb") as f:
+        f.write(b"not a zip file")
+    with pytest.raises(zipfile.BadZipFile):
+        OrderProcessorTask(_Order()).extract_archive(archive)
+    # Removed so that the next run downloads it again
+    assert not os.path.exists(archive)
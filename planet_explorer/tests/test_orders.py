@@ -7,7 +7,7 @@ from qgis.PyQt import QtCore
 from qgis.core import QgsProject
 from planet_explorer.gui.pe_orders import PlanetOrdersDialog
 from planet_explorer.gui.pe_orders_monitor_dockwidget import OrderWrapper
-from planet_explorer.tests.utils import get_random_string
+from planet_explorer.tests.utils import get_random_string, wait_for_search
 from planet_explorer.planet_api.p_quad_orders import QuadOrder
 
 
@@ -29,14 +29,17 @@ def checked_images(
     qtbot.keyClicks(daily_images_widget._aoi_filter.leAOI, sample_aoi)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
     qtbot.mouseClick(daily_images_widget.btnSearch, QtCore.Qt.LeftButton)
+    wait_for_search(qtbot, daily_images_widget)
     qgis_debug_wait(qtbot, qgis_debug_enabled)
 
     # order the first result
-    results_tree = daily_images_widget.searchResultsWidget.tree
-    checkbox = results_tree.itemWidget(results_tree.topLevelItem(0), 0).checkBox
-    qtbot.mouseClick(
-        checkbox, QtCore.Qt.LeftButton, pos=QtCore.QPoint(2, int(checkbox.height() / 2))
-    )
+    results_widget = daily_images_widget.searchResultsWidget
+    results_model = results_widget.tree.model()
+    # check state changes are notified once back in the event loop
+    with qtbot.waitSignal(results_widget.checkedCountChanged):
+        results_model.setData(
+            results_model.index(0, 0), QtCore.Qt.Checked, QtCore.Qt.CheckStateRole
+        )
     qgis_debug_wait(qtbot, qgis_debug_enabled)
 
     yield dock_widget, daily_images_widget
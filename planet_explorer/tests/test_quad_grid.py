@@ -0,0 +1,140 @@
+import pytest
+
+from planet_explorer.planet_api.p_quad_grid import (
+    QuadGrid,
+    confirm_quads,
+    confirmed_quads,
+    derive_quads,
+    group_mosaics_by_grid,
+)
+
+API_URL = "https://api.planet.com/basemaps/v1/mosaics"
+
+
+def _mosaic(mosaic_id, level=15, bbox=(-180, -85, 180, 85)):
+    return {
+        "id": mosaic_id,
+        "level": level,
+        "grid": {"quad_size": 4096},
+        "bbox": list(bbox),
+    }
+
+
+def _quad(grid, mosaic_id, x, y):
+    return {
+        "id": f"{x}-{y}",
+        "bbox": grid.quad_bbox(x, y),
+        "percent_covered": 100,
+        "_links": {
+            "download": f"{API_URL}/{mosaic_id}/quads/{x}-{y}/full?api_key=KEY",
+            "thumbnail": f"{API_URL}/{mosaic_id}/quads/{x}-{y}/thumb?api_key=KEY",
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    "lon, lat, expected",
+    [
+        pytest.param(0.0001, 0.0001, (1024, 1024), id="origin"),
+        pytest.param(-179.9999, -85.05, (0, 0), id="south_west_corner"),
+        pytest.param(179.9999, 85.05, (2047, 2047), id="north_east_corner"),
+    ],
+)
+def test_quad_at(lon, lat, expected):
+    grid = QuadGrid(15, 4096)
+    assert grid.size == 2048
+    assert grid.quad_at(lon, lat) == expected
+    west, south, east, north = grid.quad_bbox(*expected)
+    assert west <= lon <= east
+    assert south <= lat <= north
+
+
+def test_quads_for_bbox():
+    grid = QuadGrid(15, 4096)
+    quads = grid.quads_for_bbox([0.01, 0.01, 0.3, 0.3])
+    assert sorted(quads) == ["1024-1024", "1024-1025", "1025-1024", "1025-1025"]
+
+
+def test_group_mosaics_by_grid():
+    mosaics = [_mosaic("a"), _mosaic("b", level=18), _mosaic("c"), {"id": "d"}]
+    assert group_mosaics_by_grid(mosaics) == [[0, 2], [1], [3]]
+
+
+def test_derive_quads():
+    grid = QuadGrid(15, 4096)
+    bbox = [0.01, 0.01, 0.3, 0.3]
+    reference_quads = [_quad(grid, "a", x, y) for x, y in grid.quad_indices(bbox)]
+    quads = derive_quads(_mosaic("a"), reference_quads, _mosaic("b"), bbox)
+    assert [q["id"] for q in quads] == [q["id"] for q in reference_quads]
+    assert all("/mosaics/b/" in q["_links"]["download"] for q in quads)
+    assert all("/mosaics/a/" not in q["_links"]["thumbnail"] for q in quads)
+    # Coverage differs between mosaics, the reference one is not kept
+    assert all("percent_covered" not in q for q in quads)
+
+
+def test_confirmed_quads():
+    grid = QuadGrid(15, 4096)
+    bbox = [0.01, 0.01, 0.3, 0.3]
+    reference_quads = [_quad(grid, "a", x, y) for x, y in grid.quad_indices(bbox)]
+    quads = derive_quads(_mosaic("a"), reference_quads, _mosaic("b"), bbox)
+    listed = [
+        {"id": "1024-1024", "percent_covered": 40},
+        {"id": "1025-1025"},
+        {"id": "2000-2000", "percent_covered": 100},
+    ]
+    confirmed = confirmed_quads(quads, listed)
+    # Quads missing in the listing are dropped, and never listed ones added
+    assert [q["id"] for q in confirmed] == ["1024-1024", "1025-1025"]
+    assert confirmed[0]["percent_covered"] == 40
+    assert "percent_covered" not in confirmed[1]
+    assert "/mosaics/b/" in confirmed[0]["_links"]["download"]
+
+
+class _Page:
+    def __init__(self, items):
+        self.items = items
+
+    def get(self):
+        return {"items": self.items}
+
+
+class _Client:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def get_quads_for_mosaic(self, mosaic, bbox=None, minimal=False, page_size=None):
+        self.calls.append((mosaic["id"], minimal, page_size))
+        return self
+
+    def iter(self):
+        return iter(self.pages)
+
+
+def test_confirm_quads():
+    grid = QuadGrid(15, 4096)
+    bbox = [0.01, 0.01, 0.3, 0.3]
+    reference_quads = [_quad(grid, "a", x, y) for x, y in grid.quad_indices(bbox)]
+    quads = derive_quads(_mosaic("a"), reference_quads, _mosaic("b"), bbox)
+    client = _Client(
+        [
+            _Page([{"id": "1024-1024", "percent_covered": 40}]),
+            _Page([{"id": "1025-1024"}]),
+        ]
+    )
+    confirmed = confirm_quads(client, _mosaic("b"), quads, bbox)
+    assert sorted(q["id"] for q in confirmed) == ["1024-1024", "1025-1024"]
+    assert len(client.calls) == 1
+    assert client.calls[0][:2] == ("b", True)
+
+
+def test_derive_quads_rejects_mismatching_grid():
+    grid = QuadGrid(15, 4096)
+    bbox = [0.01, 0.01, 0.3, 0.3]
+    reference_quads = [_quad(grid, "a", 1024, 1024)]
+    reference_quads[0]["bbox"] = [0, 0, 1, 1]
+    assert derive_quads(_mosaic("a"), reference_quads, _mosaic("b"), bbox) is None
+    assert (
+        derive_quads(_mosaic("a"), reference_quads, _mosaic("b", level=18), bbox)
+        is None
+    )
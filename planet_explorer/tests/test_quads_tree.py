@@ -0,0 +1,95 @@
+import numpy as np
+from qgis.core import QgsPointXY, QgsProject, QgsRectangle
+from qgis.PyQt.QtCore import QModelIndex, Qt
+from qgis.PyQt.QtGui import QColor
+
+from planet_explorer.gui.pe_footprints_item import FootprintsCanvasItem
+from planet_explorer.gui.pe_quads_treewidget import QuadsTreeModel, QuadsTreeWidget
+from planet_explorer.pe_utils import EPSG_4326, crs
+
+API_URL = "https://api.planet.com/basemaps/v1/mosaics"
+
+
+def _quad(mosaic, quad_id, bbox=(0, 0, 1, 1)):
+    return {
+        "id": quad_id,
+        "bbox": list(bbox),
+        "percent_covered": 100,
+        "_links": {"thumbnail": f"{API_URL}/{mosaic}/quads/{quad_id}/thumb"},
+    }
+
+
+MOSAICS = [{"name": "mosaic1"}, {"name": "mosaic2"}]
+QUADS = [
+    [_quad("mosaic1", "1-1"), _quad("mosaic1", "1-2")],
+    [_quad("mosaic2", "1-1")],
+]
+
+
+def _model(qgis_canvas, group_by_quad):
+    footprints = FootprintsCanvasItem(qgis_canvas, QColor(0, 0, 0), QColor(0, 0, 0))
+    footprints.set_extents(np.zeros((3, 4)))
+    model = QuadsTreeModel(footprints)
+    model.set_quads(MOSAICS, QUADS, group_by_quad)
+    return model
+
+
+def test_quads_by_basemap(qgis_canvas):
+    model = _model(qgis_canvas, group_by_quad=False)
+    assert model.rowCount() == 2
+    first = model.index(0, 0)
+    assert model.rowCount(first) == 2
+    assert model.rowCount(model.index(1, 0)) == 1
+
+    model.set_checked([0], True)
+    assert first.data(Qt.CheckStateRole) == Qt.PartiallyChecked
+    assert "1 of 2 selected" in first.data(Qt.DisplayRole)
+    assert model.footprints.checked.tolist() == [True, False, False]
+
+    # Clicking a partially checked group unchecks all of its quads
+    model.setData(first, Qt.Checked, Qt.CheckStateRole)
+    assert model.selected_quads() == []
+    model.setData(first, Qt.Checked, Qt.CheckStateRole)
+    assert model.selected_quads_classified() == {
+        "mosaic1": QUADS[0],
+        "mosaic2": [],
+    }
+
+
+def test_quads_by_quad(qgis_canvas):
+    model = _model(qgis_canvas, group_by_quad=True)
+    assert model.rowCount() == 2
+    group = model.index(0, 0)
+    assert model.rowCount(group) == 2
+    model.setData(model.index(1, 0, group), Qt.Checked, Qt.CheckStateRole)
+    assert model.selected_quads() == [QUADS[1][0]]
+    assert model.parent(model.index(1, 0, group)) == group
+    assert model.parent(group) == QModelIndex()
+
+
+def test_quads_checked_on_map(qgis_iface):
+    project = QgsProject.instance()
+    previous = project.crs()
+    project.setCrs(crs(EPSG_4326))
+    quads = [
+        [
+            _quad("mosaic1", "1-1", (0, 0, 1, 1)),
+            _quad("mosaic1", "1-2", (1, 0, 2, 1)),
+        ]
+    ]
+    tree = QuadsTreeWidget()
+    try:
+        tree.populate_by_basemap(MOSAICS[:1], quads)
+        tree.toggleCheckedAt(QgsPointXY(0.5, 0.5))
+        assert tree.selected_quads() == [quads[0][0]]
+        tree.toggleCheckedAt(QgsPointXY(0.5, 0.5))
+        assert tree.selected_quads() == []
+        # Only the quads completely inside the box are checked
+        tree.setCheckedInExtent(QgsRectangle(-1, -1, 1.5, 2))
+        assert tree.selected_quads() == [quads[0][0]]
+        # Toggling quads that are not all checked checks them all
+        tree.toggleCheckedAt(QgsPointXY(1, 0.5))
+        assert tree.selected_quads() == quads[0]
+    finally:
+        tree.clear()
+        project.setCrs(previous)
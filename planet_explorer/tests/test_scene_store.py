@@ -0,0 +1,97 @@
+import numpy as np
+
+from planet_explorer.planet_api.p_scene_store import SceneStore
+
+IMAGES = [
+    {
+        "id": "scene1",
+        "properties": {
+            "acquired": "2026-01-02T10:00:00.500000Z",
+            "item_type": "PSScene",
+            "satellite_id": "sat1",
+            "cloud_cover": 0.1,
+        },
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [
+                [[0, 0], [2, 0], [2, 2], [0, 0]],
+                [[0.5, 0.5], [1, 0.5], [1, 1], [0.5, 0.5]],
+            ],
+        },
+        "_links": {"thumbnail": "https://example.com/scene1/thumb"},
+        "_permissions": ["assets.basic_analytic_4b:download"],
+    },
+    {
+        "id": "scene2",
+        "properties": {
+            "acquired": "2026-01-01T10:00:00Z",
+            "item_type": "PSScene",
+            "satellite_id": "sat2",
+        },
+        "geometry": None,
+        "_links": {},
+        "_permissions": [],
+    },
+    {
+        "id": "scene3",
+        "properties": {
+            "acquired": "2026-01-03T10:00:00Z",
+            "item_type": "SkySatCollect",
+            "satellite_id": "sat1",
+            "cloud_cover": 0.5,
+        },
+        "geometry": {
+            "type": "MultiPolygon",
+            "coordinates": [
+                [[[5, 5], [6, 5], [6, 7], [5, 5]]],
+                [[[8, 8], [9, 8], [9, 9], [8, 8]]],
+            ],
+        },
+        "_links": {},
+        "_permissions": [],
+    },
+]
+
+
+def _store():
+    store = SceneStore()
+    assert list(store.add(IMAGES[:2], [True, False])) == [0, 1]
+    assert list(store.add(IMAGES[2:], [False])) == [2]
+    return store
+
+
+def test_images_round_trip():
+    store = _store()
+    assert len(store) == 3
+    for record, image in enumerate(IMAGES):
+        assert store.image(record) == image
+    assert store.record("scene3") == 2
+    assert store.geometry_key(2) == "SkySatCollect/scene3"
+    assert store.satellite_name(2) == "sat1"
+
+
+def test_columns():
+    store = _store()
+    assert str(store.datetime(0)) == "2026-01-02 10:00:00.500000"
+    assert list(np.argsort(store.acquired)) == [1, 0, 2]
+    assert np.isnan(store.cloud_cover[1])
+    assert list(store.downloadable) == [True, False, False]
+    np.testing.assert_array_equal(store.bboxes[0], [0, 0, 2, 2])
+    assert np.isnan(store.bboxes[1]).all()
+    np.testing.assert_array_equal(store.bboxes[2], [5, 5, 9, 9])
+
+
+def test_checked_records():
+    store = _store()
+    store.checked[[0, 2]] = True
+    assert list(store.checked_records()) == [0, 2]
+    store.clear()
+    assert len(store) == 0 and len(store.checked_records()) == 0
+
+
+def test_spatial_index():
+    store = _store()
+    assert list(store.index().containing(1, 1)) == [0]
+    assert list(store.index().intersecting(1, 1, 6, 6)) == [0, 2]
+    store.add(IMAGES[:1], [True])
+    assert list(store.index().containing(1, 1)) == [0, 3]
@@ -0,0 +1,149 @@
+from planet_explorer.planet_api.p_search_cache import (
+    SavedSearchHistory,
+    SearchResultCache,
+    merge_images,
+    published_since_request,
+    request_key,
+    sort_images,
+)
+
+
+def _request(coords_offset=0.0, reverse=False):
+    filters = [
+        {
+            "type": "GeometryFilter",
+            "field_name": "geometry",
+            "config": {
+                "type": "Polygon",
+                "coordinates": [
+                    [
+                        [10.0 + coords_offset, 45.0],
+                        [11.0, 45.0],
+                        [11.0, 46.0],
+                        [10.0 + coords_offset, 45.0],
+                    ]
+                ],
+            },
+        },
+        {"type": "RangeFilter", "field_name": "cloud_cover", "config": {"lte": 0.2}},
+    ]
+    item_types = ["PSScene", "SkySatCollect"]
+    if reverse:
+        filters.reverse()
+        item_types.reverse()
+    return {
+        "item_types": item_types,
+        "filter": {"type": "AndFilter", "config": filters},
+    }
+
+
+def _images(n):
+    return [
+        {
+            "id": f"image{i}",
+            "properties": {
+                "acquired": f"2026-01-{i + 1:02d}",
+                "published": f"2026-02-{i + 1:02d}",
+            },
+        }
+        for i in range(n)
+    ]
+
+
+def test_request_key_is_canonical():
+    assert request_key(_request()) == request_key(_request(reverse=True))
+    assert request_key(_request()) == request_key(_request(coords_offset=1e-9))
+    assert request_key(_request()) != request_key(_request(coords_offset=1e-3))
+
+
+def test_sort_images():
+    images = _images(3)
+    assert sort_images(images, "acquired desc") == images[::-1]
+    assert sort_images(images[::-1], "acquired asc") == images
+
+
+def test_cached_results(tmp_path):
+    cache = SearchResultCache(str(tmp_path))
+    images = _images(5)
+    assert cache.get(_request(), "acquired desc") is None
+    cache.put(_request(), "acquired desc", images[:2], complete=False)
+    assert cache.get(_request(reverse=True), "acquired desc") == (images[:2], False)
+    # Only complete results are sorted locally
+    assert cache.get(_request(), "acquired asc") is None
+    cache.put(_request(), "acquired desc", images[::-1], complete=True)
+    assert cache.get(_request(), "acquired asc") == (images, True)
+    # Results are persisted
+    cache = SearchResultCache(str(tmp_path))
+    assert cache.get(_request(), "acquired desc") == (images[::-1], True)
+
+
+def test_cache_bounds(tmp_path):
+    cache = SearchResultCache(str(tmp_path), max_entries=2, max_images=3)
+    cache.put(_request(), "acquired desc", _images(5), complete=True)
+    assert cache.get(_request(), "acquired desc") == (_images(3), False)
+    cache.put(_request(0.1), "acquired desc", _images(1), complete=True)
+    cache.put(_request(0.2), "acquired desc", _images(1), complete=True)
+    assert cache.get(_request(), "acquired desc") is None
+    expired = SearchResultCache(str(tmp_path), ttl=0)
+    assert expired.get(_request(0.2), "acquired desc") is None
+
+
+def test_saved_search_history(tmp_path):
+    history = SavedSearchHistory(str(tmp_path))
+    images = _images(3)
+    saved_search = dict(_request(), id="search", name="Search")
+    assert history.get("search") is None
+    assert history.last_published(saved_search) is None
+    history.put(saved_search, _request(), images[:2])
+    assert history.get("search", _request()) == (images[:2], "2026-02-02")
+    # Results of the saved search run with edited filters
+    assert history.get("search", _request(0.1)) is None
+    # The index is persisted, and results are read only when needed
+    history = SavedSearchHistory(str(tmp_path))
+    assert history.last_published(saved_search) == "2026-02-02"
+    assert history.get("search", _request()) == (images[:2], "2026-02-02")
+    # The saved search was updated since its results were stored
+    updated_search = dict(saved_search, **_request(0.1))
+    assert history.last_published(updated_search) is None
+    history.remove("search")
+    assert history.last_published(saved_search) is None
+    assert SavedSearchHistory(str(tmp_path)).get("search") is None
+
+    incremental = published_since_request(_request(), "2026-02-02")
+    assert incremental["item_types"] == _request()["item_types"]
+    assert incremental["filter"]["config"] == [
+        _request()["filter"],
+        {
+            "type": "DateRangeFilter",
+            "field_name": "published",
+            "config": {"gt": "2026-02-02"},
+        },
+    ]
+
+    updated = dict(images[1], properties=dict(images[1]["properties"]))
+    merged = merge_images(images[:2], [updated, images[2]])
+    assert [image["id"] for image in merged] == ["image0", "image1", "image2"]
+    assert merged[1] is updated
+
+
+def test_append_pages(tmp_path):
+    cache = SearchResultCache(str(tmp_path), max_images=4)
+    images = _images(5)
+    cache.append(_request(), "acquired asc", images[:2], complete=False)
+    cache.append(_request(), "acquired asc", images[2:4], complete=False)
+    assert cache.get(_request(), "acquired asc") == (images[:4], False)
+    # Pages beyond max_images are not stored
+    cache.append(_request(), "acquired asc", images[4:], complete=True)
+    assert cache.get(_request(), "acquired asc") == (images[:4], False)
+
+
+def test_cached_results_per_account(tmp_path):
+    cache = SearchResultCache(str(tmp_path))
+    images = _images(3)
+    cache.set_account("key1")
+    cache.put(_request(), "acquired desc", images[::-1], complete=True)
+    cache.set_account("key2")
+    assert cache.get(_request(), "acquired desc") is None
+    assert cache.get(_request(), "acquired asc") is None
+    cache.set_account("key1")
+    assert cache.get(_request(), "acquired asc") == (images, True)
@@ -0,0 +1,82 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+from qgis.PyQt.QtCore import Qt
+from qgis.PyQt.QtGui import QImage
+
+from planet_explorer.gui import pe_thumbnails
+from planet_explorer.gui.pe_thumbnails import (
+    COMPOUND_THUMBNAIL_SIZE,
+    CompoundThumbnailTask,
+    ThumbnailDiskCache,
+    compound_thumbnail_key,
+    memoize_compound_thumbnail,
+    memoized_compound_thumbnail,
+)
+
+
+@pytest.fixture
+def compound_memo(monkeypatch):
+    memo = OrderedDict()
+    monkeypatch.setattr(pe_thumbnails, "_compound_thumbnails", memo)
+    return memo
+
+
+def _thumbnail(color):
+    image = QImage(16, 16, QImage.Format_ARGB32_Premultiplied)
+    image.fill(color)
+    return image
+
+
+def test_disk_cache_flush(tmp_path):
+    cache = ThumbnailDiskCache(str(tmp_path))
+    cache.put("thumb1", b"data1", etag='"v1"')
+    cache.flush()
+    assert os.path.exists(cache.index_file)
+
+    cache = ThumbnailDiskCache(str(tmp_path))
+    assert cache.get("thumb1") == b"data1"
+    assert cache.validators("thumb1") == ('"v1"', None)
+
+
+def test_disk_cache_sweeps_unindexed_files(tmp_path):
+    cache = ThumbnailDiskCache(str(tmp_path))
+    cache.put("thumb1", b"data1")
+    cache.flush()
+    # Written after the index was last saved, as if QGIS exited right away
+    cache.put("thumb2", b"data2")
+    orphan = cache._path(cache.entries["thumb2"])
+    os.remove(cache._path(cache.entries["thumb1"]))
+
+    cache = ThumbnailDiskCache(str(tmp_path))
+    assert not os.path.exists(orphan)
+    assert list(cache.entries) == []
+    assert cache.total_size == 0
+
+
+def test_compound_thumbnail_memoized_regardless_of_order(compound_memo):
+    ids = ["item_a", "item_b"]
+    key = compound_thumbnail_key(ids)
+    bboxes = np.array([[0.0, 0.0, 10.0, 10.0], [10.0, 0.0, 20.0, 10.0]])
+    task = CompoundThumbnailTask(
+        {key: (bboxes, [_thumbnail(Qt.red), _thumbnail(Qt.blue)])}
+    )
+    assert task.run()
+    image = task.images[key]
+    assert image.width() == COMPOUND_THUMBNAIL_SIZE
+    memoize_compound_thumbnail(key, image)
+
+    assert compound_thumbnail_key(ids[::-1]) == key
+    assert memoized_compound_thumbnail(compound_thumbnail_key(ids[::-1])) is image
+
+
+def test_compound_thumbnail_not_memoized_for_other_ids(compound_memo):
+    key = compound_thumbnail_key(["item_a", "item_b"])
+    memoize_compound_thumbnail(key, _thumbnail(Qt.red))
+
+    for ids in (["item_a"], ["item_a", "item_b", "item_c"], ["item_a", "item_c"]):
+        other = compound_thumbnail_key(ids)
+        assert other != key
+        assert memoized_compound_thumbnail(other) is None
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from qgis.core import QgsCoordinateTransform, QgsProject, QgsRectangle
+
+from planet_explorer import pe_utils
+from planet_explorer.pe_utils import (
+    EPSG_3857,
+    EPSG_4326,
+    coordinate_transform,
+    crs,
+    transform_bboxes,
+)
+
+BBOXES = [
+    [18.6, -34.1, 19.2, -33.8],
+    [-122.5, 37.7, -122.3, 37.9],
+    [np.nan, np.nan, np.nan, np.nan],
+]
+
+
+def test_coordinate_transform_is_reused():
+    first = coordinate_transform(EPSG_4326, EPSG_3857)
+    cached = pe_utils._transform_cache[(EPSG_4326, EPSG_3857)]
+    second = coordinate_transform(crs(EPSG_4326), EPSG_3857)
+    # The cached transform is reused, and callers get their own copy of it
+    assert pe_utils._transform_cache[(EPSG_4326, EPSG_3857)] is cached
+    assert first is not cached and second is not cached
+    assert second.sourceCrs() == cached.sourceCrs()
+    assert second.destinationCrs() == cached.destinationCrs()
+    assert crs(EPSG_4326) is crs(EPSG_4326)
+
+
+def test_transform_cache_cleared_on_project_crs_change():
+    project = QgsProject.instance()
+    previous = project.crs()
+    coordinate_transform(EPSG_4326, EPSG_3857)
+    assert pe_utils._transform_cache
+    project.setCrs(crs("EPSG:32734"))
+    try:
+        assert pe_utils._transform_cache == {}
+    finally:
+        project.setCrs(previous)
+
+
+@pytest.mark.parametrize("destination", [EPSG_3857, "EPSG:32734"])
+def test_transform_bboxes_matches_transform_bounding_box(destination):
+    transformed = transform_bboxes(BBOXES, EPSG_4326, destination)
+    transform = QgsCoordinateTransform(
+        crs(EPSG_4326), crs(destination), QgsProject.instance()
+    )
+    for bbox, result in zip(BBOXES[:2], transformed):
+        rect = transform.transformBoundingBox(QgsRectangle(*bbox))
+        expected = [rect.xMinimum(), rect.yMinimum(), rect.xMaximum(), rect.yMaximum()]
+        assert result == pytest.approx(expected, rel=1e-3)
+    assert np.isnan(transformed[2]).all()
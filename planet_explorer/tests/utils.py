@@ -122,3 +122,9 @@ def get_recent_release_from_changelog(root_dir: pathlib.Path):
         )
     else:
         return recent_release
+
+
+def wait_for_search(qtbot, daily_images_widget, timeout=60000):
+    """Waits for the search started in the daily images widget to complete."""
+    results_widget = daily_images_widget.searchResultsWidget
+    qtbot.waitUntil(lambda: not results_widget.is_searching(), timeout=timeout)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark for the conversion of GeoJSON footprints to QgsGeometry.
+
+Compares building the geometries straight from their coordinates with the
+previous path, which serialized them to a string for QgsJsonUtils to parse.
+Run it with the Python interpreter of a QGIS installation, from the root of
+the repository:
+
+    python scripts/benchmark_geojson.py
+"""
+import random
+import timeit
+
+from qgis.testing import start_app
+
+start_app()
+
+from planet_explorer.pe_utils import (  # noqa: E402
+    _qgsgeometry_from_json_geom,
+    _qgsgeometry_from_json_geom_string,
+    qgsgeometry_for_image,
+)
+
+NUM_FOOTPRINTS = 1000
+REPEAT = 5
+
+
+def footprint(num_vertices=20):
+    x, y = random.uniform(-180, 170), random.uniform(-80, 70)
+    ring = [[x + random.random(), y + random.random()] for _ in range(num_vertices - 1)]
+    return {"type": "Polygon", "coordinates": [ring + [ring[0]]]}
+
+
+def main():
+    footprints = [footprint() for _ in range(NUM_FOOTPRINTS)]
+    images = [
+        {"id": str(i), "properties": {"item_type": "PSScene"}, "geometry": f}
+        for i, f in enumerate(footprints)
+    ]
+    cases = {
+        "json round-trip": lambda: [
+            _qgsgeometry_from_json_geom_string(f) for f in footprints
+        ],
+        "direct": lambda: [_qgsgeometry_from_json_geom(f) for f in footprints],
+        "memoized by item": lambda: [qgsgeometry_for_image(img) for img in images],
+    }
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=REPEAT))
+        print(f"{name:>20}: {best * 1000:8.1f} ms for {NUM_FOOTPRINTS} footprints")
+
+
+if __name__ == "__main__":
+    main()